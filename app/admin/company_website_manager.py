@@ -157,14 +157,17 @@ class CompanyWebsiteManager:
                 status_text.text("🔍 Discovering pages...")
                 progress_bar.progress(20)
                 
-                # Scrape the website
-                scraped_data = asyncio.run(scrape_company_website(self.website_url))
+                # Scrape the website (incrementally against the stored data unless forced)
+                previous = None if force_refresh else self.website_data
+                scraped_data = asyncio.run(scrape_company_website(self.website_url, previous=previous))
                 
                 # Debug: Show scraping results
                 st.write(f"**Debug Info:**")
                 st.write(f"- Pages scraped: {scraped_data.get('pages_scraped', 0)}")
                 st.write(f"- Total words: {scraped_data.get('total_words', 0)}")
                 st.write(f"- Content categories: {list(scraped_data.get('content', {}).keys())}")
+                if previous:
+                    st.write(f"- Changed pages: {len(scraped_data.get('changed_pages', []))}, changed sections: {scraped_data.get('changed_sections', [])}")
                 
                 status_text.text("💾 Saving data...")
                 progress_bar.progress(80)
@@ -18,6 +18,8 @@ import app.utils as utils
 import re
 from app.ai.prompts import PROMPT_TEMPLATES
 from app.ai.gemini_client import gemini_client
+from app.ai.http_clients import get_http_client
+from app.ai.llm_scheduler import llm_scheduler, estimate_tokens
 
 # Load environment variables
 load_dotenv()
@@ -71,7 +73,8 @@ async def send_raw_ai_prompt(prompt: str, temperature: float = 0.7) -> str:
     try:
         apicall_logger.info(f"Ollama API Request: {OLLAMA_BASE_URL}/api/generate, prompt: {prompt[:200]}, temperature: {temperature}")
         # Use HTTP request to Ollama API
-        async with httpx.AsyncClient() as client:
+        client = get_http_client("ollama")
+        async with llm_scheduler.slot("ollama", estimate_tokens(prompt)):
             response = await client.post(
                 f"{OLLAMA_BASE_URL}/api/generate",
                 json={
@@ -82,12 +85,12 @@ async def send_raw_ai_prompt(prompt: str, temperature: float = 0.7) -> str:
                 },
                 timeout=AI_TIMEOUT # Add a timeout to prevent hanging
             )
-            response.raise_for_status() # Raise an exception for bad status codes
-            apicall_logger.info(f"Ollama API Response: status={response.status_code}, body={response.text[:200]}")
-            data = response.json()
-            logger.info(f"Raw AI response data: {data}") # Log the raw data
-            return data.get("response", "")
-            
+        response.raise_for_status() # Raise an exception for bad status codes
+        apicall_logger.info(f"Ollama API Response: status={response.status_code}, body={response.text[:200]}")
+        data = response.json()
+        logger.info(f"Raw AI response data: {data}") # Log the raw data
+        return data.get("response", "")
+        
     except httpx.RequestError as e:
         apicall_logger.error(f"Ollama API Request Error: {str(e)}")
         logger.error(f"HTTPX Request Error during AI generation: {str(e)}")
@@ -331,48 +334,11 @@ def validate_value_component(response: Dict[str, Any]) -> bool:
         return False
 
 async def create_embedding(text: str) -> List[float]:
-    """Create an embedding for the given text using Ollama."""
-    try:
-        logger.info(f"Creating embedding for text (first 50 chars): {text[:50]}...")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/embeddings",
-                json={
-                    "model": MODEL,
-                    "prompt": text
-                },
-                timeout=AI_TIMEOUT # Use configurable timeout
-            )
-        response.raise_for_status() # Raise an HTTPStatusError for bad responses (4xx or 5xx)
-        data = response.json()
-        
-        # Ensure we get a vector of the correct dimension (1536)
-        vector = data.get("embedding", [])
-        if len(vector) != 1536:
-            logger.warning(f"Unexpected embedding dimension: {len(vector)}. Expected 1536.")
-            # Attempt to pad or truncate if dimension is unexpected but close, or return zero vector
-            if 1000 < len(vector) < 2000:
-                 logger.warning("Attempting to adjust embedding dimension.")
-                 if len(vector) > 1536:
-                     vector = vector[:1536]
-                 else:
-                     vector.extend([0.0] * (1536 - len(vector)))
-                 logger.warning(f"Adjusted vector dimension to {len(vector)}.")
-            else:
-                 logger.error("Embedding dimension significantly different from 1536. Returning zero vector.")
-                 vector = [0.0] * 1536
-        
-        logger.info(f"Successfully created embedding with dimension: {len(vector)}")
-        return vector
-    except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP status error during embedding creation: {e.response.status_code} - {e.response.text}")
-        return [0.0] * 1536
-    except httpx.RequestError as e:
-        logger.error(f"Request error during embedding creation: {str(e)}")
-        return [0.0] * 1536
-    except Exception as e:
-        logger.error(f"Error creating embedding: {type(e).__name__} - {str(e)}")
-        return [0.0] * 1536 
+    """Create a VECTOR_DIM embedding for the given text using Ollama (batched and cached).
+    Raises EmbeddingError if no embedding can be produced."""
+    from app.ai.embedding_service import embedding_service
+    logger.info(f"Creating embedding for text (first 50 chars): {text[:50]}...")
+    return await embedding_service.embed(text)
 
 async def generate_ai_response(task_type: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Generate AI response for the given task type and parameters."""
@@ -6,6 +6,9 @@ from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 import json
 from datetime import datetime
+from app.ai.response_cache import response_cache
+from app.ai.http_clients import get_http_client
+from app.ai.llm_scheduler import llm_scheduler, estimate_tokens
 
 # Load environment variables
 load_dotenv()
@@ -73,9 +76,10 @@ class ChatGPTClient:
     
     async def generate_response(self, prompt: str, temperature: Optional[float] = None, 
                                max_tokens: Optional[int] = None, system_message: Optional[str] = None,
-                               use_web_search: bool = False, pid: int = 0) -> str:
+                               use_web_search: bool = False, pid: int = 0, use_cache: bool = True) -> str:
         """
         Generate response using ChatGPT with deterministic configuration for consistent results.
+        Successful responses are served from / stored in the shared LLM response cache.
         
         Args:
             prompt: The user prompt
@@ -84,6 +88,7 @@ class ChatGPTClient:
             system_message: Optional system message
             use_web_search: Whether to enable web search grounding
             pid: Process ID for logging
+            use_cache: Set to False to bypass the response cache for this call
         """
         start_time = datetime.now()
         
@@ -131,47 +136,65 @@ class ChatGPTClient:
             if tools:
                 payload["tools"] = tools
             
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            cache_key = response_cache.make_key(
+                "chatgpt", self.model, json.dumps(messages, ensure_ascii=False),
+                {k: v for k, v in payload.items() if k not in ("model", "messages")}
+            )
+            if use_cache:
+                cached = response_cache.get(cache_key, provider="chatgpt")
+                if cached is not None:
+                    chatgpt_logger.info(f"[PID {pid}] [generate_response] CACHE_HIT - ResponseLength: {len(cached)} chars")
+                    return cached
+            else:
+                response_cache.record_bypass()
+            
+            client = get_http_client("openai")
+            async with llm_scheduler.slot("openai", estimate_tokens(prompt, max_tokens)) as ticket:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
                     json=payload
                 )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Extract the response text
-                if "choices" in data and data["choices"]:
-                    choice = data["choices"][0]
-                    if "message" in choice and "content" in choice["message"]:
-                        response_text = choice["message"]["content"]
-                        if response_text is None:
-                            chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - Response content is None")
-                            return "ERROR: Response content is None"
-                        end_time = datetime.now()
-                        duration = (end_time - start_time).total_seconds()
-                        
-                        # Extract token usage if available
-                        token_usage = {}
-                        if "usage" in data:
-                            usage = data["usage"]
-                            token_usage = {
-                                "prompt_tokens": usage.get("prompt_tokens", 0),
-                                "completion_tokens": usage.get("completion_tokens", 0),
-                                "total_tokens": usage.get("total_tokens", 0)
-                            }
-                            chatgpt_logger.info(f"[PID {pid}] [generate_response] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars, Tokens: {token_usage.get('total_tokens', 0)} (Prompt: {token_usage.get('prompt_tokens', 0)}, Completion: {token_usage.get('completion_tokens', 0)})")
-                        else:
-                            chatgpt_logger.info(f"[PID {pid}] [generate_response] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars")
-                        
-                        return response_text
+            if response.status_code == 429:
+                llm_scheduler.report_rate_limited("openai", llm_scheduler.parse_retry_after(response.headers))
+            response.raise_for_status()
+            data = response.json()
+            
+            # Extract the response text
+            if "choices" in data and data["choices"]:
+                choice = data["choices"][0]
+                if "message" in choice and "content" in choice["message"]:
+                    response_text = choice["message"]["content"]
+                    if response_text is None:
+                        chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - Response content is None")
+                        return "ERROR: Response content is None"
+                    end_time = datetime.now()
+                    duration = (end_time - start_time).total_seconds()
+                    
+                    # Extract token usage if available
+                    token_usage = {}
+                    if "usage" in data:
+                        usage = data["usage"]
+                        token_usage = {
+                            "prompt_tokens": usage.get("prompt_tokens", 0),
+                            "completion_tokens": usage.get("completion_tokens", 0),
+                            "total_tokens": usage.get("total_tokens", 0)
+                        }
+                        ticket.record_usage(token_usage["total_tokens"])
+                        chatgpt_logger.info(f"[PID {pid}] [generate_response] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars, Tokens: {token_usage.get('total_tokens', 0)} (Prompt: {token_usage.get('prompt_tokens', 0)}, Completion: {token_usage.get('completion_tokens', 0)})")
                     else:
-                        chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - Unexpected response structure: {data}")
-                        return f"ERROR: Unexpected response structure"
-                else:
-                    chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - No choices in response: {data}")
-                    return f"ERROR: No choices in response"
+                        chatgpt_logger.info(f"[PID {pid}] [generate_response] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars")
                     
+                    if use_cache:
+                        response_cache.set(cache_key, response_text, provider="chatgpt", model=self.model)
+                    return response_text
+                else:
+                    chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - Unexpected response structure: {data}")
+                    return f"ERROR: Unexpected response structure"
+            else:
+                chatgpt_logger.error(f"[PID {pid}] [generate_response] ERROR - No choices in response: {data}")
+                return f"ERROR: No choices in response"
+                
         except httpx.HTTPStatusError as e:
             error_detail = f"HTTP {e.response.status_code}: {e.response.text[:500] if e.response.text else 'No response body'}"
             chatgpt_logger.error(f"[PID {pid}] [generate_response] HTTP_ERROR - Status: {e.response.status_code}, Response: {error_detail}")
@@ -237,7 +260,7 @@ def get_chatgpt_client():
             class DummyChatGPTClient:
                 async def generate_response(self, prompt: str, temperature: Optional[float] = None, 
                                            max_tokens: Optional[int] = None, system_message: Optional[str] = None,
-                                           use_web_search: bool = False, pid: int = 0) -> str:
+                                           use_web_search: bool = False, pid: int = 0, use_cache: bool = True) -> str:
                     return f"ERROR: {str(e)}"
                 
                 async def generate_with_web_search(self, prompt: str, temperature: Optional[float] = None, 
@@ -252,7 +275,8 @@ def get_chatgpt_client():
     return _chatgpt_client_instance
 
 async def chatgpt_generate(prompt: str, temperature: Optional[float] = None, 
-                          max_tokens: Optional[int] = None, use_web_search: bool = False, pid: int = 0) -> str:
+                          max_tokens: Optional[int] = None, use_web_search: bool = False, pid: int = 0,
+                          use_cache: bool = True) -> str:
     """Convenience function for generating ChatGPT responses with deterministic configuration."""
     client = get_chatgpt_client()
     return await client.generate_response(
@@ -260,5 +284,6 @@ async def chatgpt_generate(prompt: str, temperature: Optional[float] = None,
         temperature=temperature,
         max_tokens=max_tokens,
         use_web_search=use_web_search,
-        pid=pid
+        pid=pid,
+        use_cache=use_cache
     ) 
\ No newline at end of file
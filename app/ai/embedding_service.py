@@ -0,0 +1,272 @@
+"""
+Embedding Service
+Batched, cached text embeddings from Ollama for persona and website vectors.
+
+Concurrent embed() calls on the same event loop are collected for a few milliseconds and
+sent as one /api/embed request with multiple inputs. Identical texts are embedded once,
+both within a batch and across callers waiting on the same text, and every vector is kept in
+an on-disk cache keyed by a hash of (model, text). All vectors have VECTOR_DIM dimensions;
+a failed or malformed response raises EmbeddingError instead of returning a zero vector.
+"""
+
+import os
+import time
+import array
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.ai.http_clients import get_http_client
+from app.ai.llm_scheduler import llm_scheduler, estimate_tokens
+
+# Import embedding configuration
+try:
+    from app.config import (
+        OLLAMA_BASE_URL, VECTOR_DIM, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_WINDOW,
+        EMBEDDING_TIMEOUT, EMBEDDING_CACHE_ENABLED, EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+    )
+except ImportError:
+    # Fallback values if config import fails
+    OLLAMA_BASE_URL = "http://localhost:11434"
+    VECTOR_DIM = 4096
+    EMBEDDING_MODEL = "mistral"
+    EMBEDDING_BATCH_SIZE = 32
+    EMBEDDING_BATCH_WINDOW = 0.01
+    EMBEDDING_TIMEOUT = 60.0
+    EMBEDDING_CACHE_ENABLED = True
+    EMBEDDING_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'cache', 'embeddings.sqlite3')
+    EMBEDDING_CACHE_MAX_ENTRIES = 50000
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingError(RuntimeError):
+    """Raised when Ollama cannot produce an embedding for a text"""
+
+
+class EmbeddingCache:
+    """On-disk embedding store keyed by content hash, with LRU eviction"""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+                 enabled: bool = EMBEDDING_CACHE_ENABLED):
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite store lazily (caller must hold the lock)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT, vector BLOB, last_access REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given keys (missing keys are left out)."""
+        if not self.enabled or not keys:
+            return {}
+        with self._lock:
+            try:
+                conn = self._connect()
+                placeholders = ",".join("?" * len(keys))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys).fetchall()
+                if rows:
+                    conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", [(time.time(), key) for key, _ in rows])
+                    conn.commit()
+                self._stats["hits"] += len(rows)
+                self._stats["misses"] += len(keys) - len(rows)
+                return {key: array.array("f", blob).tolist() for key, blob in rows}
+            except Exception as e:
+                # A broken cache must never break embedding - treat as misses
+                self._stats["errors"] += 1
+                logger.warning(f"[EmbeddingCache] Lookup failed, treating as miss: {e}")
+                return {}
+
+    def set_many(self, vectors: Dict[str, List[float]], model: str):
+        """Store vectors and evict least-recently-used entries beyond max_entries."""
+        if not self.enabled or not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector, last_access) VALUES (?, ?, ?, ?)",
+                    [(key, model, array.array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+                )
+                self._stats["writes"] += len(vectors)
+                if self.max_entries:
+                    (total,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+                    overflow = total - self.max_entries
+                    if overflow > 0:
+                        conn.execute(
+                            "DELETE FROM embeddings WHERE key IN "
+                            "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                            (overflow,)
+                        )
+                conn.commit()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[EmbeddingCache] Failed to store embeddings: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters"""
+        with self._lock:
+            return dict(self._stats)
+
+
+class _LoopBatch:
+    """Texts waiting to be embedded on one event loop"""
+
+    def __init__(self):
+        self.pending: Dict[str, str] = {}  # key -> text, not yet sent
+        self.futures: Dict[str, asyncio.Future] = {}  # key -> result, until the response arrives
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+class EmbeddingService:
+    """Micro-batching Ollama embedding client with content-hash cache"""
+
+    def __init__(self, model: str = EMBEDDING_MODEL, dimension: int = VECTOR_DIM,
+                 batch_size: int = EMBEDDING_BATCH_SIZE, batch_window: float = EMBEDDING_BATCH_WINDOW,
+                 cache: Optional[EmbeddingCache] = None):
+        self.model = model
+        self.dimension = dimension
+        self.batch_size = max(1, batch_size)
+        self.batch_window = max(0.0, batch_window)
+        self.cache = cache or EmbeddingCache()
+        self._batches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBatch]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = {"texts": 0, "requests": 0, "embedded": 0, "deduplicated": 0, "failures": 0}
+
+    def make_key(self, text: str) -> str:
+        """Content hash of the model and the text"""
+        return hashlib.sha256(f"{self.model}\n{text}".encode("utf-8")).hexdigest()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embedding of one text. Raises EmbeddingError on failure."""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings of several texts, in order. Raises EmbeddingError on failure."""
+        keys = [self.make_key(text) for text in texts]
+        vectors = self.cache.get_many(list(dict.fromkeys(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        with self._lock:
+            self._stats["texts"] += len(texts)
+            self._stats["deduplicated"] += sum(1 for key in keys if key not in vectors) - len(missing)
+        if missing:
+            futures = [self._enqueue(key, text) for key, text in missing.items()]
+            for key, vector in zip(missing, await asyncio.gather(*futures)):
+                vectors[key] = vector
+        return [vectors[key] for key in keys]
+
+    def _batch_for_loop(self, loop: asyncio.AbstractEventLoop) -> _LoopBatch:
+        with self._lock:
+            batch = self._batches.get(loop)
+            if batch is None:
+                batch = _LoopBatch()
+                self._batches[loop] = batch
+            return batch
+
+    def _enqueue(self, key: str, text: str) -> "asyncio.Future[List[float]]":
+        loop = asyncio.get_running_loop()
+        batch = self._batch_for_loop(loop)
+        future = batch.futures.get(key)
+        if future is not None:
+            # Same text already requested by another caller on this loop
+            with self._lock:
+                self._stats["deduplicated"] += 1
+            return future
+        future = loop.create_future()
+        batch.futures[key] = future
+        batch.pending[key] = text
+        if len(batch.pending) >= self.batch_size:
+            self._flush(loop, batch)
+        elif batch.flush_handle is None:
+            batch.flush_handle = loop.call_later(self.batch_window, self._flush, loop, batch)
+        return future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, batch: _LoopBatch):
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+            batch.flush_handle = None
+        items = list(batch.pending.items())
+        batch.pending.clear()
+        for start in range(0, len(items), self.batch_size):
+            loop.create_task(self._send(batch, items[start:start + self.batch_size]))
+
+    async def _send(self, batch: _LoopBatch, items: List[Tuple[str, str]]):
+        texts = [text for _, text in items]
+        try:
+            vectors = await self._request(texts)
+            self.cache.set_many({key: vector for (key, _), vector in zip(items, vectors)}, self.model)
+            for (key, _), vector in zip(items, vectors):
+                future = batch.futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += len(items)
+            error = e if isinstance(e, EmbeddingError) else EmbeddingError(f"Embedding request failed: {type(e).__name__}: {e}")
+            logger.error(f"[embedding_service] Failed to embed {len(items)} texts: {error}")
+            for key, _ in items:
+                future = batch.futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(error)
+
+    async def _request(self, texts: List[str]) -> List[List[float]]:
+        """One /api/embed call for all texts; validates count and dimension"""
+        client = get_http_client("ollama")
+        async with llm_scheduler.slot("ollama", sum(estimate_tokens(text) for text in texts)):
+            response = await client.post(
+                f"{OLLAMA_BASE_URL}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=httpx.Timeout(EMBEDDING_TIMEOUT, connect=10.0)
+            )
+        if response.status_code != 200:
+            raise EmbeddingError(f"Ollama returned HTTP {response.status_code}: {response.text[:200]}")
+        vectors = response.json().get("embeddings") or []
+        if len(vectors) != len(texts):
+            raise EmbeddingError(f"Ollama returned {len(vectors)} embeddings for {len(texts)} texts")
+        for vector in vectors:
+            if len(vector) != self.dimension:
+                raise EmbeddingError(
+                    f"Embedding dimension {len(vector)} from model '{self.model}' does not match VECTOR_DIM={self.dimension}"
+                )
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["embedded"] += len(texts)
+        logger.info(f"[embedding_service] Embedded {len(texts)} texts in one request")
+        return vectors
+
+    def get_stats(self) -> Dict[str, int]:
+        """Request, deduplication and cache counters"""
+        with self._lock:
+            stats: Dict[str, int] = dict(self._stats)
+        stats.update({f"cache_{name}": value for name, value in self.cache.get_stats().items()})
+        return stats
+
+
+# Global instance shared by all embedding callers
+embedding_service = EmbeddingService()
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the global embedding service instance"""
+    return embedding_service
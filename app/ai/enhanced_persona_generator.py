@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from app.ai.gemini_client import gemini_client, get_grounded_company_summary
 from app.ai.chatgpt_client import chatgpt_generate, get_chatgpt_client
 from app.ai.workflow_orchestrator import run_value_alignment_workflow
+from app.ai.pipeline_executor import DAGExecutor, PipelineAbort
 from app.database import fetch_all_value_components, save_persona
 import app.utils as utils
 from app.ai.market_intelligence import market_intelligence_service
@@ -349,13 +350,22 @@ class EnhancedPersonaGenerator:
             from app.ai.demo_enhanced_persona_generator import demo_enhanced_persona_generator
             return await demo_enhanced_persona_generator.generate_demo_persona(website, selected_industry, pid, progress_tracker)
         
-        try:
+        # Ensure industry is a string (not None) for type compatibility
+        industry_str = selected_industry if selected_industry is not None else "unknown"
+        
+        # Initialize validation tracker if not exists (used by steps 3.5, 6.5 and 7.5)
+        if not hasattr(self, '_validation_tracker'):
+            from app.ai.sonar.validation_tracker import ValidationTracker
+            self._validation_tracker = ValidationTracker()
+        
+        # Each step below is a node of the generation pipeline. Nodes declare the values they
+        # read and produce; the DAGExecutor runs independent nodes concurrently.
+        
+        async def relevance_validation():
             # Step 0: Pre-analysis Relevance Validation (Sonar)
             step_0_start = time.time()
             logger.info(f"[PID {pid}] Step 0/8: Pre-analysis Relevance Validation START")
             persona_gen_logger.info(f"[STEP 0/8] START - Pre-analysis Relevance Validation")
-            if progress_tracker:
-                await progress_tracker.start_step(0)
             
             persona_gen_logger.info(f"[STEP 0/8] Sub-step: Calling _step_0_relevance_validation()")
             relevance_result = await self._step_0_relevance_validation(website, pid)
@@ -377,18 +387,18 @@ class EnhancedPersonaGenerator:
             if not is_relevant:
                 logger.warning(f"[PID {pid}] Website not relevant: {website}")
                 persona_gen_logger.warning(f"[STEP 0/8] Website not relevant - creating rejection persona")
-                return self._create_relevance_rejection_persona(website, relevance_result, pid)
+                raise PipelineAbort(self._create_relevance_rejection_persona(website, relevance_result, pid),
+                                    "Website not relevant")
             
+            return {"relevance_result": relevance_result}
+        
+        async def website_analysis():
             # Step 1: Dual-Model Website Analysis with Web Search
             step_1_start = time.time()
             logger.info(f"[PID {pid}] Step 1/8: Dual-Model Website Analysis START")
             persona_gen_logger.info(f"[STEP 1/8] START - Dual-Model Website Analysis")
-            if progress_tracker:
-                await progress_tracker.start_step(1)
             
             # Parallel analysis with both models
-            # Ensure industry is a string (not None) for type compatibility
-            industry_str = selected_industry if selected_industry is not None else "unknown"
             persona_gen_logger.info(f"[STEP 1/8] Sub-step: Starting parallel analysis (Gemini + ChatGPT)")
             persona_gen_logger.info(f"[STEP 1/8] Sub-step: Industry: {industry_str}")
             persona_gen_logger.info(f"[STEP 1/8] Sub-step: Verified Company: {verified_company_name or 'Not provided'}")
@@ -427,6 +437,14 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 1/8] END - Duration: {step_1_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {
+                "gemini_analysis": gemini_analysis,
+                "chatgpt_analysis": chatgpt_analysis,
+                "gemini_company": gemini_company,
+                "chatgpt_company": chatgpt_company
+            }
+        
+        async def company_identity_validation(gemini_analysis, chatgpt_analysis, gemini_company, chatgpt_company):
             # Step 1.25: STRICT Company Identity Validation (HARD STOP)
             step_1_25_start = time.time()
             logger.info(f"[PID {pid}] Step 1.25/8: STRICT Company Identity Validation START")
@@ -469,13 +487,15 @@ class EnhancedPersonaGenerator:
                 persona_gen_logger.error(f"[STEP 1.25/8] Creating rejection persona")
                 
                 # Create rejection persona and STOP
-                return self._create_company_mismatch_rejection_persona(
+                raise PipelineAbort(self._create_company_mismatch_rejection_persona(
                     website, identity_validation, gemini_analysis, chatgpt_analysis, pid
-                )
+                ), "Company identity mismatch")
             
             # Continue only if validation passed
             logger.info(f"[PID {pid}] Step 1.25/8: Company identity validation PASSED - All models analyzing same company")
-            
+            return {"identity_validation": identity_validation}
+        
+        async def sonar_website_validation_step(gemini_analysis, chatgpt_analysis):
             # Step 1.5: Sonar Website Analysis Validation
             step_1_5_start = time.time()
             logger.info(f"[PID {pid}] Step 1.5/8: Sonar Website Analysis Validation START")
@@ -505,7 +525,12 @@ class EnhancedPersonaGenerator:
             validated_website_analysis = sonar_integration_utils.merge_validated_website_analysis(
                 gemini_analysis, chatgpt_analysis, sonar_website_validation, pid
             )
-            
+            return {
+                "sonar_website_validation": sonar_website_validation,
+                "validated_website_analysis": validated_website_analysis
+            }
+        
+        async def customer_focus_validation(gemini_analysis, chatgpt_analysis):
             # Step 1.5: Customer Focus Validation (Sonar)
             step_1_5_customer_start = time.time()
             logger.info(f"[PID {pid}] Step 1.5/8: Customer Focus Validation START")
@@ -533,12 +558,13 @@ class EnhancedPersonaGenerator:
                 logger.warning(f"[PID {pid}] Customer focus validation failed: {misinterpretation}")
                 persona_gen_logger.warning(f"[STEP 1.5/8] Customer focus validation failed - continuing with caution")
             
+            return {"focus_result": focus_result}
+        
+        async def cross_model_synthesis(gemini_analysis, chatgpt_analysis):
             # Step 2: Cross-Model Validation and Synthesis
             step_2_start = time.time()
             logger.info(f"[PID {pid}] Step 2/8: Cross-Model Validation START")
             persona_gen_logger.info(f"[STEP 2/8] START - Cross-Model Validation and Synthesis")
-            if progress_tracker:
-                await progress_tracker.start_step(2)
             
             persona_gen_logger.info(f"[STEP 2/8] Sub-step: Calling _cross_validate_and_synthesize()")
             # Step 2: Enhanced Cross-Model Validation with Sonar
@@ -560,6 +586,9 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 2/8] END - Duration: {step_2_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"validated_analysis": validated_analysis}
+        
+        async def sonar_cross_validation(gemini_analysis, chatgpt_analysis, validated_analysis):
             # Step 2.5: Sonar Cross-Model Validation
             step_2_5_start = time.time()
             logger.info(f"[PID {pid}] Step 2.5/8: Sonar Cross-Model Validation START")
@@ -591,19 +620,18 @@ class EnhancedPersonaGenerator:
             else:
                 logger.warning(f"[PID {pid}] Models disagree - using synthesis with caution")
             
+            return {"cross_validation_result": cross_validation_result}
+        
+        async def market_intelligence(validated_analysis):
             # Step 3: Enhanced Market Intelligence with Dual Models
             step_3_start = time.time()
             logger.info(f"[PID {pid}] Step 3/8: Enhanced Market Intelligence START")
             persona_gen_logger.info(f"[STEP 3/8] START - Enhanced Market Intelligence")
-            if progress_tracker:
-                await progress_tracker.start_step(3)
             
-            # Ensure industry is a string (not None) for type compatibility
-            industry_str = selected_industry if selected_industry is not None else "unknown"
             persona_gen_logger.info(f"[STEP 3/8] Sub-step: Calling _generate_enhanced_market_intelligence()")
             persona_gen_logger.info(f"[STEP 3/8] Sub-step: Industry: {industry_str}")
             
-            enhanced_market_intelligence = await self._generate_enhanced_market_intelligence(
+            raw_market_intelligence = await self._generate_enhanced_market_intelligence(
                 website, validated_analysis, industry_str, pid
             )
             step_3_duration = time.time() - step_3_start
@@ -611,9 +639,9 @@ class EnhancedPersonaGenerator:
             
             # Count market intelligence data points
             mi_data_points = 0
-            if isinstance(enhanced_market_intelligence, dict):
-                if "market_intelligence" in enhanced_market_intelligence:
-                    mi = enhanced_market_intelligence.get("market_intelligence", {})
+            if isinstance(raw_market_intelligence, dict):
+                if "market_intelligence" in raw_market_intelligence:
+                    mi = raw_market_intelligence.get("market_intelligence", {})
                     if isinstance(mi, dict):
                         mi_data_points = len(mi)
             
@@ -623,16 +651,14 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 3/8] END - Duration: {step_3_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"raw_market_intelligence": raw_market_intelligence}
+        
+        async def market_intelligence_validation(raw_market_intelligence):
             # Step 3.5: Sonar Market Intelligence Validation (Deferred if empty)
             step_3_5_start = time.time()
             logger.info(f"[PID {pid}] Step 3.5/8: Sonar Market Intelligence Validation START")
             persona_gen_logger.info(f"[STEP 3.5/8] START - Sonar Market Intelligence Validation")
             
-            # Initialize validation tracker if not exists
-            if not hasattr(self, '_validation_tracker'):
-                from app.ai.sonar.validation_tracker import ValidationTracker
-                self._validation_tracker = ValidationTracker()
-            
             # Check if market intelligence is empty - defer if so
             def _is_empty_data(data):
                 """More robust empty data detection for market intelligence"""
@@ -672,15 +698,15 @@ class EnhancedPersonaGenerator:
                 return False
             
             persona_gen_logger.info(f"[STEP 3.5/8] Sub-step: Checking if data is empty")
-            is_empty = _is_empty_data(enhanced_market_intelligence)
+            is_empty = _is_empty_data(raw_market_intelligence)
             persona_gen_logger.info(f"[STEP 3.5/8]   → Data Available: {not is_empty}")
             
-            if enhanced_market_intelligence and not is_empty:
+            if raw_market_intelligence and not is_empty:
                 # Data is available - run validation immediately
                 persona_gen_logger.info(f"[STEP 3.5/8] Sub-step: Running validation immediately")
                 persona_gen_logger.info(f"[STEP 3.5/8]   → See: logs/sonar_model.log for API call details")
                 sonar_market_validation = await enhanced_sonar_validator.validate_market_intelligence(
-                    enhanced_market_intelligence, website, selected_industry or "unknown", pid
+                    raw_market_intelligence, website, selected_industry or "unknown", pid
                 )
                 step_3_5_duration = time.time() - step_3_5_start
                 step_timings["step_3.5"] = step_3_5_duration
@@ -721,20 +747,23 @@ class EnhancedPersonaGenerator:
             
             # Merge validated market intelligence
             enhanced_market_intelligence = sonar_integration_utils.merge_validated_market_intelligence(
-                enhanced_market_intelligence, sonar_market_validation, pid
+                raw_market_intelligence, sonar_market_validation, pid
             )
-            
+            return {
+                "enhanced_market_intelligence": enhanced_market_intelligence,
+                "sonar_market_validation": sonar_market_validation
+            }
+        
+        async def value_alignment(validated_analysis):
             # Step 4: Dual-Model Value Alignment
             step_4_start = time.time()
             logger.info(f"[PID {pid}] Step 4/8: Dual-Model Value Alignment START")
             persona_gen_logger.info(f"[STEP 4/8] START - Dual-Model Value Alignment")
-            if progress_tracker:
-                await progress_tracker.start_step(4)
             
             persona_gen_logger.info(f"[STEP 4/8] Sub-step: Calling _generate_enhanced_value_alignment()")
             persona_gen_logger.info(f"[STEP 4/8]   → See: logs/value_alignment.log for workflow details")
             
-            enhanced_value_alignment = await self._generate_enhanced_value_alignment(
+            raw_value_alignment = await self._generate_enhanced_value_alignment(
                 validated_analysis, pid
             )
             step_4_duration = time.time() - step_4_start
@@ -742,9 +771,9 @@ class EnhancedPersonaGenerator:
             
             # Count alignment matches
             alignment_matches = 0
-            if isinstance(enhanced_value_alignment, dict):
-                if "alignment_matrix" in enhanced_value_alignment:
-                    matrix = enhanced_value_alignment.get("alignment_matrix", [])
+            if isinstance(raw_value_alignment, dict):
+                if "alignment_matrix" in raw_value_alignment:
+                    matrix = raw_value_alignment.get("alignment_matrix", [])
                     if isinstance(matrix, list):
                         alignment_matches = len([m for m in matrix if m.get("match_score", 0) > 0])
             
@@ -753,6 +782,9 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 4/8] END - Duration: {step_4_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"raw_value_alignment": raw_value_alignment}
+        
+        async def value_alignment_validation(raw_value_alignment):
             # Step 4.5: Sonar Value Alignment Validation
             step_4_5_start = time.time()
             logger.info(f"[PID {pid}] Step 4.5/8: Sonar Value Alignment Validation START")
@@ -761,7 +793,7 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 4.5/8]   → See: logs/sonar_model.log for API call details")
             
             sonar_value_validation = await enhanced_sonar_validator.validate_value_alignment(
-                enhanced_value_alignment, website, pid
+                raw_value_alignment, website, pid
             )
             step_4_5_duration = time.time() - step_4_5_start
             step_timings["step_4.5"] = step_4_5_duration
@@ -777,20 +809,23 @@ class EnhancedPersonaGenerator:
             
             # Merge validated value alignment
             enhanced_value_alignment = sonar_integration_utils.merge_validated_value_alignment(
-                enhanced_value_alignment, sonar_value_validation, pid
+                raw_value_alignment, sonar_value_validation, pid
             )
-            
+            return {
+                "enhanced_value_alignment": enhanced_value_alignment,
+                "sonar_value_validation": sonar_value_validation
+            }
+        
+        async def creative_persona_elements(validated_analysis, enhanced_market_intelligence):
             # Step 5: Creative Persona Elements (ChatGPT)
             step_5_start = time.time()
             logger.info(f"[PID {pid}] Step 5/8: Creative Persona Elements START")
             persona_gen_logger.info(f"[STEP 5/8] START - Creative Persona Elements")
-            if progress_tracker:
-                await progress_tracker.start_step(5)
             
             persona_gen_logger.info(f"[STEP 5/8] Sub-step: Calling _generate_creative_persona_elements()")
             persona_gen_logger.info(f"[STEP 5/8]   → See: logs/chatgpt_model.log for API call details")
             
-            creative_elements = await self._generate_creative_persona_elements(
+            raw_creative_elements = await self._generate_creative_persona_elements(
                 validated_analysis, enhanced_market_intelligence, pid
             )
             step_5_duration = time.time() - step_5_start
@@ -798,10 +833,10 @@ class EnhancedPersonaGenerator:
             api_call_summary["chatgpt"].append({"step": "5", "duration": step_5_duration})
             
             # Count creative elements
-            pain_points_count = len(creative_elements.get("pain_points", [])) if isinstance(creative_elements, dict) else 0
-            goals_count = len(creative_elements.get("goals", [])) if isinstance(creative_elements, dict) else 0
-            value_drivers_count = len(creative_elements.get("value_drivers", [])) if isinstance(creative_elements, dict) else 0
-            objections_count = len(creative_elements.get("objections", [])) if isinstance(creative_elements, dict) else 0
+            pain_points_count = len(raw_creative_elements.get("pain_points", [])) if isinstance(raw_creative_elements, dict) else 0
+            goals_count = len(raw_creative_elements.get("goals", [])) if isinstance(raw_creative_elements, dict) else 0
+            value_drivers_count = len(raw_creative_elements.get("value_drivers", [])) if isinstance(raw_creative_elements, dict) else 0
+            objections_count = len(raw_creative_elements.get("objections", [])) if isinstance(raw_creative_elements, dict) else 0
             
             persona_gen_logger.info(f"[STEP 5/8] Result: Creative elements generated")
             persona_gen_logger.info(f"[STEP 5/8]   → Pain Points: {pain_points_count} identified")
@@ -811,6 +846,9 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 5/8] END - Duration: {step_5_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"raw_creative_elements": raw_creative_elements}
+        
+        async def creative_elements_validation(raw_creative_elements):
             # Step 5.5: Sonar Creative Elements Validation
             step_5_5_start = time.time()
             logger.info(f"[PID {pid}] Step 5.5/8: Sonar Creative Elements Validation START")
@@ -819,7 +857,7 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 5.5/8]   → See: logs/sonar_model.log for API call details")
             
             sonar_creative_validation = await enhanced_sonar_validator.validate_creative_elements(
-                creative_elements, website, pid
+                raw_creative_elements, website, pid
             )
             step_5_5_duration = time.time() - step_5_5_start
             step_timings["step_5.5"] = step_5_5_duration
@@ -835,20 +873,24 @@ class EnhancedPersonaGenerator:
             
             # Merge validated creative elements
             creative_elements = sonar_integration_utils.merge_validated_creative_elements(
-                creative_elements, sonar_creative_validation, pid
+                raw_creative_elements, sonar_creative_validation, pid
             )
-            
+            return {
+                "creative_elements": creative_elements,
+                "sonar_creative_validation": sonar_creative_validation
+            }
+        
+        async def final_persona_synthesis(validated_analysis, enhanced_market_intelligence,
+                                          enhanced_value_alignment, creative_elements):
             # Step 6: Final Persona Synthesis (Gemini)
             step_6_start = time.time()
             logger.info(f"[PID {pid}] Step 6/8: Final Persona Synthesis START")
             persona_gen_logger.info(f"[STEP 6/8] START - Final Persona Synthesis")
-            if progress_tracker:
-                await progress_tracker.start_step(6)
             
             persona_gen_logger.info(f"[STEP 6/8] Sub-step: Calling _synthesize_final_persona()")
             persona_gen_logger.info(f"[STEP 6/8]   → See: logs/gemini_model.log for API call details")
             
-            final_persona = await self._synthesize_final_persona(
+            synthesized_persona = await self._synthesize_final_persona(
                 validated_analysis, enhanced_market_intelligence, 
                 enhanced_value_alignment, creative_elements, pid
             )
@@ -857,20 +899,20 @@ class EnhancedPersonaGenerator:
             api_call_summary["gemini"].append({"step": "6", "duration": step_6_duration})
             
             # Check if synthesis failed
-            synthesis_failed = isinstance(final_persona, dict) and "error" in final_persona
+            synthesis_failed = isinstance(synthesized_persona, dict) and "error" in synthesized_persona
             if synthesis_failed:
-                logger.error(f"[PID {pid}] Final persona synthesis failed: {final_persona['error']}")
+                logger.error(f"[PID {pid}] Final persona synthesis failed: {synthesized_persona['error']}")
                 persona_gen_logger.error(f"[STEP 6/8] Synthesis failed - creating fallback persona")
                 # Create a fallback persona structure
-                final_persona = self._create_fallback_persona(validated_analysis, enhanced_market_intelligence, 
-                                                           enhanced_value_alignment, creative_elements)
+                synthesized_persona = self._create_fallback_persona(validated_analysis, enhanced_market_intelligence, 
+                                                                    enhanced_value_alignment, creative_elements)
             
             # Extract persona fields for logging
-            company_name = final_persona.get("company", {}).get("name", "Unknown") if isinstance(final_persona, dict) else "Unknown"
-            products_count = len(final_persona.get("product_range", [])) if isinstance(final_persona, dict) else 0
-            services_count = len(final_persona.get("services", [])) if isinstance(final_persona, dict) else 0
-            pain_points_count = len(final_persona.get("pain_points", [])) if isinstance(final_persona, dict) else 0
-            goals_count = len(final_persona.get("goals", [])) if isinstance(final_persona, dict) else 0
+            company_name = synthesized_persona.get("company", {}).get("name", "Unknown") if isinstance(synthesized_persona, dict) else "Unknown"
+            products_count = len(synthesized_persona.get("product_range", [])) if isinstance(synthesized_persona, dict) else 0
+            services_count = len(synthesized_persona.get("services", [])) if isinstance(synthesized_persona, dict) else 0
+            pain_points_count = len(synthesized_persona.get("pain_points", [])) if isinstance(synthesized_persona, dict) else 0
+            goals_count = len(synthesized_persona.get("goals", [])) if isinstance(synthesized_persona, dict) else 0
             
             persona_gen_logger.info(f"[STEP 6/8] Result: Synthesis complete")
             persona_gen_logger.info(f"[STEP 6/8]   → Company Name: {company_name}")
@@ -881,22 +923,20 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 6/8] END - Duration: {step_6_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"synthesized_persona": synthesized_persona, "company_name": company_name}
+        
+        async def final_synthesis_validation(synthesized_persona):
             # Step 6.5: Sonar Final Synthesis Validation (Structure-Only, Content Deferred)
             step_6_5_start = time.time()
             logger.info(f"[PID {pid}] Step 6.5/8: Sonar Final Synthesis Validation START")
             persona_gen_logger.info(f"[STEP 6.5/8] START - Sonar Final Synthesis Validation")
             
-            # Initialize validation tracker if not exists
-            if not hasattr(self, '_validation_tracker'):
-                from app.ai.sonar.validation_tracker import ValidationTracker
-                self._validation_tracker = ValidationTracker()
-            
             persona_gen_logger.info(f"[STEP 6.5/8] Sub-step: Running structure-only validation (immediate)")
             persona_gen_logger.info(f"[STEP 6.5/8]   → See: logs/sonar_model.log for API call details")
             
             # Run structure-only validation (quick check)
             sonar_synthesis_validation = await enhanced_sonar_validator.validate_final_synthesis_structure(
-                final_persona, website, pid
+                synthesized_persona, website, pid
             )
             step_6_5_duration = time.time() - step_6_5_start
             step_timings["step_6.5"] = step_6_5_duration
@@ -923,15 +963,19 @@ class EnhancedPersonaGenerator:
             
             # Merge validated final persona
             final_persona = sonar_integration_utils.merge_validated_final_persona(
-                final_persona, sonar_synthesis_validation, pid
+                synthesized_persona, sonar_synthesis_validation, pid
             )
-            
+            return {
+                "final_persona": final_persona,
+                "sonar_synthesis_validation": sonar_synthesis_validation
+            }
+        
+        async def quality_assurance(final_persona, validated_analysis, creative_elements,
+                                    enhanced_value_alignment, enhanced_market_intelligence):
             # Step 7: Quality Assurance and Enhancement
             step_7_start = time.time()
             logger.info(f"[PID {pid}] Step 7/8: Quality Assurance START")
             persona_gen_logger.info(f"[STEP 7/8] START - Quality Assurance and Enhancement")
-            if progress_tracker:
-                await progress_tracker.start_step(7)
             
             persona_gen_logger.info(f"[STEP 7/8] Sub-step: Calling _quality_assurance_and_enhancement()")
             # Step 7: Enhanced Quality Assurance with Sonar
@@ -945,19 +989,23 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 7/8] END - Duration: {step_7_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"enhanced_persona": enhanced_persona}
+        
+        async def deferred_validations(enhanced_persona):
             # Step 7.5: Run Deferred Validations (NEW - Improvement 1)
             step_7_5_start = time.time()
             logger.info(f"[PID {pid}] Step 7.5/8: Running Deferred Validations START")
             persona_gen_logger.info(f"[STEP 7.5/8] START - Running Deferred Validations")
             
-            deferred_count = self._validation_tracker.get_deferred_count() if hasattr(self, '_validation_tracker') else 0
+            # Validation results replaced by their deferred (full content) counterparts
+            deferred_updates = {}
+            deferred_count = self._validation_tracker.get_deferred_count()
             persona_gen_logger.info(f"[STEP 7.5/8] Sub-step: Checking for deferred validations")
             persona_gen_logger.info(f"[STEP 7.5/8]   → Deferred Count: {deferred_count}")
             
-            if hasattr(self, '_validation_tracker') and deferred_count > 0:
+            if deferred_count > 0:
                 persona_gen_logger.info(f"[STEP 7.5/8] Sub-step: Running {deferred_count} deferred validation(s)")
                 persona_gen_logger.info(f"[STEP 7.5/8]   → See: logs/sonar_model.log for API call details")
-                
                 deferred_results = await self._validation_tracker.run_deferred_validations(enhanced_persona, pid)
                 step_7_5_duration = time.time() - step_7_5_start
                 step_timings["step_7.5"] = step_7_5_duration
@@ -972,11 +1020,11 @@ class EnhancedPersonaGenerator:
                     result = deferred_result["result"]
                     
                     if validation_type == "market_intelligence":
-                        sonar_market_validation = result
+                        deferred_updates["sonar_market_validation"] = result
                         logger.info(f"[PID {pid}] Deferred market intelligence validation completed")
                     elif validation_type == "final_synthesis_content":
                         # Update synthesis validation with full content validation
-                        sonar_synthesis_validation = result
+                        deferred_updates["sonar_synthesis_validation"] = result
                         logger.info(f"[PID {pid}] Deferred final synthesis content validation completed")
                     # Add other validation types as needed
                 
@@ -994,6 +1042,9 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 7.5/8] END - Duration: {step_7_5_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"deferred_updates": deferred_updates}
+        
+        async def final_quality_check(enhanced_persona):
             # Step 8: Final Sonar Quality Check
             step_8_start = time.time()
             logger.info(f"[PID {pid}] Step 8/8: Final Sonar Quality Check START")
@@ -1019,6 +1070,119 @@ class EnhancedPersonaGenerator:
             persona_gen_logger.info(f"[STEP 8/8] END - Duration: {step_8_duration:.2f}s")
             persona_gen_logger.info("-" * 80)
             
+            return {"final_quality_result": final_quality_result}
+        
+        # Generation steps may start on the unvalidated output of the previous step while its
+        # Sonar validation runs. They are re-run if the validation fails or returns corrections;
+        # otherwise the result is kept and the validation's scores and findings are attached to it
+        provisional_validation = {"validation_passed": True, "overall_confidence": 5, "provisional": True}
+        
+        def speculate_on(raw_key, merge, validation_key, validation_type):
+            def reconcile(result, context):
+                findings = sonar_integration_utils.validation_findings(context[validation_key], validation_type)
+                for value in result.values():
+                    if isinstance(value, dict):
+                        value.setdefault("sonar_input_validations", {})[validation_type] = findings
+                return result
+            
+            return {
+                "from": raw_key,
+                "provisional": lambda raw: merge(raw, provisional_validation, pid),
+                "confirm": lambda context: sonar_integration_utils.is_non_blocking_validation(
+                    context[validation_key], validation_type),
+                "reconcile": reconcile,
+            }
+        
+        market_speculation = speculate_on("raw_market_intelligence", sonar_integration_utils.merge_validated_market_intelligence,
+                                          "sonar_market_validation", "market_intelligence")
+        value_speculation = speculate_on("raw_value_alignment", sonar_integration_utils.merge_validated_value_alignment,
+                                         "sonar_value_validation", "value_alignment")
+        creative_speculation = speculate_on("raw_creative_elements", sonar_integration_utils.merge_validated_creative_elements,
+                                            "sonar_creative_validation", "creative_elements")
+        
+        analyses = ["gemini_analysis", "chatgpt_analysis"]
+        pipeline = [
+            {"name": "relevance_validation", "func": relevance_validation,
+             "outputs": ["relevance_result"], "providers": ["sonar"], "progress_step": 0},
+            {"name": "website_analysis", "func": website_analysis, "after": ["relevance_validation"],
+             "outputs": analyses + ["gemini_company", "chatgpt_company"],
+             "providers": ["gemini", "chatgpt"], "progress_step": 1},
+            {"name": "company_identity_validation", "func": company_identity_validation,
+             "inputs": analyses + ["gemini_company", "chatgpt_company"],
+             "outputs": ["identity_validation"], "providers": ["sonar"]},
+            # Everything below only runs once the identity hard stop has passed
+            {"name": "cross_model_synthesis", "func": cross_model_synthesis, "inputs": analyses,
+             "after": ["company_identity_validation"], "outputs": ["validated_analysis"],
+             "providers": ["gemini"], "progress_step": 2},
+            {"name": "sonar_website_validation", "func": sonar_website_validation_step, "inputs": analyses,
+             "after": ["company_identity_validation"],
+             "outputs": ["sonar_website_validation", "validated_website_analysis"], "providers": ["sonar"]},
+            {"name": "customer_focus_validation", "func": customer_focus_validation, "inputs": analyses,
+             "after": ["company_identity_validation"], "outputs": ["focus_result"], "providers": ["sonar"]},
+            {"name": "market_intelligence", "func": market_intelligence, "inputs": ["validated_analysis"],
+             "outputs": ["raw_market_intelligence"], "providers": ["gemini", "chatgpt"], "progress_step": 3},
+            {"name": "value_alignment", "func": value_alignment, "inputs": ["validated_analysis"],
+             "outputs": ["raw_value_alignment"], "providers": ["chatgpt"], "progress_step": 4},
+            {"name": "sonar_cross_validation", "func": sonar_cross_validation,
+             "inputs": analyses + ["validated_analysis"], "outputs": ["cross_validation_result"],
+             "providers": ["sonar"]},
+            {"name": "market_intelligence_validation", "func": market_intelligence_validation,
+             "inputs": ["raw_market_intelligence"],
+             "outputs": ["enhanced_market_intelligence", "sonar_market_validation"], "providers": ["sonar"]},
+            {"name": "value_alignment_validation", "func": value_alignment_validation,
+             "inputs": ["raw_value_alignment"],
+             "outputs": ["enhanced_value_alignment", "sonar_value_validation"], "providers": ["sonar"]},
+            {"name": "creative_persona_elements", "func": creative_persona_elements,
+             "inputs": ["validated_analysis", "enhanced_market_intelligence"],
+             "outputs": ["raw_creative_elements"], "providers": ["chatgpt"], "progress_step": 5,
+             "speculate": {"enhanced_market_intelligence": market_speculation}},
+            {"name": "creative_elements_validation", "func": creative_elements_validation,
+             "inputs": ["raw_creative_elements"],
+             "outputs": ["creative_elements", "sonar_creative_validation"], "providers": ["sonar"]},
+            {"name": "final_persona_synthesis", "func": final_persona_synthesis,
+             "inputs": ["validated_analysis", "enhanced_market_intelligence", "enhanced_value_alignment", "creative_elements"],
+             "outputs": ["synthesized_persona", "company_name"], "providers": ["gemini"], "progress_step": 6,
+             "speculate": {"enhanced_market_intelligence": market_speculation,
+                           "enhanced_value_alignment": value_speculation,
+                           "creative_elements": creative_speculation}},
+            {"name": "final_synthesis_validation", "func": final_synthesis_validation,
+             "inputs": ["synthesized_persona"],
+             "outputs": ["final_persona", "sonar_synthesis_validation"], "providers": ["sonar"]},
+            {"name": "quality_assurance", "func": quality_assurance,
+             "inputs": ["final_persona", "validated_analysis", "creative_elements",
+                        "enhanced_value_alignment", "enhanced_market_intelligence"],
+             "outputs": ["enhanced_persona"], "progress_step": 7},
+            # Deferred validations must see every mark_for_deferred_validation() call (steps 3.5 and 6.5)
+            {"name": "deferred_validations", "func": deferred_validations, "inputs": ["enhanced_persona"],
+             "after": ["market_intelligence_validation", "final_synthesis_validation"],
+             "outputs": ["deferred_updates"], "providers": ["sonar"]},
+            {"name": "final_quality_check", "func": final_quality_check, "inputs": ["enhanced_persona"],
+             "after": ["deferred_validations"], "outputs": ["final_quality_result"], "providers": ["sonar"]},
+        ]
+        
+        try:
+            executor = DAGExecutor(pipeline, progress_tracker=progress_tracker, pipeline_logger=persona_gen_logger)
+            try:
+                context = await executor.run()
+            except PipelineAbort as abort:
+                logger.info(f"[PID {pid}] [Enhanced Persona Generator] Pipeline stopped: {abort.reason}")
+                return abort.result
+            
+            enhanced_persona = context["enhanced_persona"]
+            relevance_result = context["relevance_result"]
+            focus_result = context["focus_result"]
+            sonar_website_validation = context["sonar_website_validation"]
+            cross_validation_result = context["cross_validation_result"]
+            sonar_value_validation = context["sonar_value_validation"]
+            sonar_creative_validation = context["sonar_creative_validation"]
+            final_quality_result = context["final_quality_result"]
+            company_name = context["company_name"]
+            # Market and synthesis validations may have been updated by deferred validations
+            sonar_market_validation = context["deferred_updates"].get(
+                "sonar_market_validation", context["sonar_market_validation"])
+            sonar_synthesis_validation = context["deferred_updates"].get(
+                "sonar_synthesis_validation", context["sonar_synthesis_validation"])
+            
             # Add quality check results to persona
             enhanced_persona["sonar_quality_checks"] = {
                 "step_0_relevance": relevance_result,
@@ -1053,6 +1217,10 @@ class EnhancedPersonaGenerator:
                 "sonar_validations_total": sonar_summary["total_validations"]
             })
             
+            # Add pipeline timing (critical path of the step dependency graph)
+            pipeline_timing = executor.get_timing_report()
+            enhanced_persona["enhanced_metadata"]["pipeline_timing"] = pipeline_timing
+            
             total_time = time.time() - start_time
             logger.info(f"--- [PID {pid}] [Enhanced Persona Generator] REQUEST END. Total time: {total_time:.2f}s ---")
             
@@ -1100,6 +1268,8 @@ class EnhancedPersonaGenerator:
                 percentage = (duration / total_time * 100) if total_time > 0 else 0
                 persona_gen_logger.info(f"  Step {step_name}: {duration:.2f}s ({percentage:.1f}%)")
             persona_gen_logger.info("")
+            executor.log_timing_report(pipeline_timing)
+            persona_gen_logger.info("")
             persona_gen_logger.info("API Call Summary:")
             persona_gen_logger.info(f"  Sonar: {sonar_call_count} calls (Total: {sonar_total_duration:.2f}s)")
             persona_gen_logger.info(f"  Gemini: {gemini_call_count} calls (Total: {gemini_total_duration:.2f}s)")
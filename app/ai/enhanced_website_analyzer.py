@@ -6,14 +6,24 @@ Provides deep, targeted analysis of customer websites for persona generation.
 import asyncio
 import json
 import logging
+import time
 from typing import Dict, List, Optional, Any
 from app.ai.rate_limited_gemini import rate_limited_gemini
 from app.ai.gemini_client import (
-    get_grounded_company_summary, 
-    get_grounded_company_summary_with_explicit_search,
+    get_grounded_company_summary_async,
+    get_grounded_company_summary_with_explicit_search_async,
     gemini_client_with_grounding
 )
 
+# Import analysis concurrency configuration
+try:
+    from app.config import WEBSITE_ANALYSIS_CONCURRENT, WEBSITE_ANALYSIS_MAX_CONCURRENCY, WEBSITE_ANALYSIS_PASS_TIMEOUT
+except ImportError:
+    # Fallback values if config import fails
+    WEBSITE_ANALYSIS_CONCURRENT = True
+    WEBSITE_ANALYSIS_MAX_CONCURRENCY = 3
+    WEBSITE_ANALYSIS_PASS_TIMEOUT = 180.0
+
 logger = logging.getLogger(__name__)
 
 class EnhancedWebsiteAnalyzer:
@@ -23,42 +33,78 @@ class EnhancedWebsiteAnalyzer:
         self.analysis_cache = {}
     
     async def analyze_website_deep(self, website_url: str, target_industry: Optional[str] = None, 
-                                   verified_company_name: Optional[str] = None, pid: int = 0) -> Dict[str, Any]:
+                                   verified_company_name: Optional[str] = None, pid: int = 0,
+                                   concurrent: Optional[bool] = None) -> Dict[str, Any]:
         """
         Perform deep analysis of a customer website with targeted focus points.
         Returns comprehensive analysis for persona generation.
         
+        The customer insights, competitive positioning and pain point passes only depend on
+        the business analysis, so in concurrent mode they run in parallel (capped by
+        WEBSITE_ANALYSIS_MAX_CONCURRENCY). Every pass has a timeout; a failed or timed out
+        pass contributes an empty result instead of failing the whole analysis. Passes built
+        on the business analysis are skipped when it failed or came back empty.
+        
         Args:
             website_url: Target website URL
             target_industry: Industry classification (optional)
             verified_company_name: User-verified company name (optional, used as source of truth)
+            pid: Process ID for logging
+            concurrent: Run independent passes in parallel (defaults to WEBSITE_ANALYSIS_CONCURRENT)
         """
         
         logger.info(f"[EnhancedWebsiteAnalyzer] Starting deep analysis of: {website_url}")
         if verified_company_name:
             logger.info(f"[EnhancedWebsiteAnalyzer] Using verified company: {verified_company_name}")
         
+        if concurrent is None:
+            concurrent = WEBSITE_ANALYSIS_CONCURRENT
+        semaphore = asyncio.Semaphore(WEBSITE_ANALYSIS_MAX_CONCURRENCY if concurrent else 1)
+        pass_status: Dict[str, Dict[str, Any]] = {}
+        
         try:
             # Step 1: Get comprehensive website content with grounding
             website_content = await self._get_comprehensive_website_content(website_url, verified_company_name)
             
             # Step 2: Analyze specific business aspects
-            business_analysis = await self._analyze_business_aspects(website_url, website_content, target_industry, verified_company_name, pid=pid)
-            
-            # Step 3: Extract customer-specific insights
-            customer_insights = await self._extract_customer_insights(website_url, website_content, business_analysis, verified_company_name, pid=pid)
-            
-            # Step 4: Analyze competitive positioning
-            competitive_analysis = await self._analyze_competitive_positioning(website_url, website_content, business_analysis, verified_company_name, pid=pid)
+            business_analysis = await self._run_analysis_pass(
+                "business_analysis", semaphore, pass_status, pid,
+                self._analyze_business_aspects(website_url, website_content, target_industry, verified_company_name, pid=pid)
+            )
             
-            # Step 5: Identify specific pain points and opportunities
-            pain_points_analysis = await self._identify_pain_points_and_opportunities(website_url, website_content, business_analysis, verified_company_name, pid=pid)
+            # Steps 3-5: Customer insights, competitive positioning, pain points and opportunities
+            # (independent of each other, all based on the business analysis)
+            customer_insights, competitive_analysis, pain_points_analysis = await asyncio.gather(
+                self._run_analysis_pass(
+                    "customer_insights", semaphore, pass_status, pid,
+                    self._extract_customer_insights(website_url, website_content, business_analysis, verified_company_name, pid=pid),
+                    requires=["business_analysis"]
+                ),
+                self._run_analysis_pass(
+                    "competitive_analysis", semaphore, pass_status, pid,
+                    self._analyze_competitive_positioning(website_url, website_content, business_analysis, verified_company_name, pid=pid),
+                    requires=["business_analysis"]
+                ),
+                self._run_analysis_pass(
+                    "pain_points_analysis", semaphore, pass_status, pid,
+                    self._identify_pain_points_and_opportunities(website_url, website_content, business_analysis, verified_company_name, pid=pid),
+                    requires=["business_analysis"]
+                )
+            )
             
             # Step 6: Generate targeted persona insights
-            persona_insights = await self._generate_targeted_persona_insights(
-                website_url, website_content, business_analysis, customer_insights, competitive_analysis, pain_points_analysis, verified_company_name, pid=pid
+            persona_insights = await self._run_analysis_pass(
+                "persona_insights", semaphore, pass_status, pid,
+                self._generate_targeted_persona_insights(
+                    website_url, website_content, business_analysis, customer_insights, competitive_analysis, pain_points_analysis, verified_company_name, pid=pid
+                ),
+                requires=["business_analysis"]
             )
             
+            failed_passes = [name for name, status in pass_status.items() if status["status"] != "success"]
+            if failed_passes:
+                logger.warning(f"[PID {pid}] [EnhancedWebsiteAnalyzer] Degraded analysis - failed passes: {', '.join(failed_passes)}")
+            
             # Combine all analyses
             comprehensive_analysis = {
                 "website_url": website_url,
@@ -70,6 +116,8 @@ class EnhancedWebsiteAnalyzer:
                 "competitive_analysis": competitive_analysis,
                 "pain_points_analysis": pain_points_analysis,
                 "persona_insights": persona_insights,
+                "analysis_passes": pass_status,
+                "degraded_passes": failed_passes,
                 "analysis_timestamp": asyncio.get_event_loop().time()
             }
             
@@ -80,6 +128,36 @@ class EnhancedWebsiteAnalyzer:
             logger.error(f"[EnhancedWebsiteAnalyzer] Error in deep analysis: {e}")
             return {"error": f"Analysis failed: {str(e)}"}
     
+    async def _run_analysis_pass(self, name: str, semaphore: asyncio.Semaphore, pass_status: Dict[str, Dict[str, Any]],
+                                 pid: int, coro, requires: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run a single analysis pass under the concurrency cap and per-pass timeout.
+        Errors and timeouts are recorded in pass_status and degrade to an empty result.
+        The pass is skipped (without calling the model) if a required pass did not succeed.
+        """
+        failed_requirements = [req for req in requires or [] if pass_status.get(req, {}).get("status") != "success"]
+        if failed_requirements:
+            coro.close()
+            logger.warning(f"[PID {pid}] [EnhancedWebsiteAnalyzer] Skipping pass '{name}': required pass "
+                           f"{', '.join(failed_requirements)} did not succeed")
+            pass_status[name] = {"status": "skipped", "duration": 0.0, "missing": failed_requirements}
+            return {}
+        async with semaphore:
+            start_time = time.time()
+            try:
+                result = await asyncio.wait_for(coro, timeout=WEBSITE_ANALYSIS_PASS_TIMEOUT)
+                status = "success" if result else "empty"
+            except asyncio.TimeoutError:
+                logger.error(f"[PID {pid}] [EnhancedWebsiteAnalyzer] Pass '{name}' timed out after {WEBSITE_ANALYSIS_PASS_TIMEOUT:.0f}s")
+                result, status = {}, "timeout"
+            except Exception as e:
+                logger.error(f"[PID {pid}] [EnhancedWebsiteAnalyzer] Pass '{name}' failed: {e}")
+                result, status = {}, "error"
+            duration = time.time() - start_time
+            logger.info(f"[PID {pid}] [EnhancedWebsiteAnalyzer] Pass '{name}' finished ({status}) in {duration:.2f}s")
+            pass_status[name] = {"status": status, "duration": round(duration, 2)}
+            return result if isinstance(result, dict) else {}
+    
     def _build_verified_company_context(self, website_url: str, verified_company_name: Optional[str] = None) -> str:
         """Build verified company context for prompts"""
         if not verified_company_name:
@@ -112,7 +190,7 @@ YOU MUST NOT:
         """Get comprehensive website content with multiple approaches"""
         
         # Try grounded analysis first
-        grounded_content = get_grounded_company_summary(website_url)
+        grounded_content = await get_grounded_company_summary_async(website_url)
         if grounded_content and not grounded_content.startswith("ERROR"):
             # Validate that the grounded content is about the correct company
             validation_result = await self._validate_company_focus(website_url, grounded_content)
@@ -125,7 +203,7 @@ YOU MUST NOT:
         # If initial grounding failed or validation failed, try explicit search version
         if grounded_content.startswith("ERROR"):
             logger.warning(f"[_get_comprehensive_website_content] Initial grounding failed: {grounded_content[:100]}. Trying explicit search.")
-            explicit_search_content = get_grounded_company_summary_with_explicit_search(website_url)
+            explicit_search_content = await get_grounded_company_summary_with_explicit_search_async(website_url)
             if explicit_search_content and not explicit_search_content.startswith("ERROR"):
                 validation_result = await self._validate_company_focus(website_url, explicit_search_content)
                 if validation_result.get("is_correct_company", False):
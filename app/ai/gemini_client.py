@@ -4,6 +4,9 @@ import asyncio
 import logging
 from typing import Optional
 from dotenv import load_dotenv
+from app.ai.response_cache import response_cache
+from app.ai.http_clients import get_http_client
+from app.ai.llm_scheduler import llm_scheduler, estimate_tokens
 
 # Load environment variables
 load_dotenv()
@@ -80,10 +83,11 @@ except ImportError:
         "Google Search grounding features require: pip install google-genai"
     )
 
-async def gemini_client(prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None, model: Optional[str] = None, pid: int = 0) -> str:
+async def gemini_client(prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None, model: Optional[str] = None, pid: int = 0, use_cache: bool = True) -> str:
     """
     Gemini client with deterministic configuration for consistent results.
     Includes retry logic for 503 (overloaded) errors with exponential backoff.
+    Successful responses are served from / stored in the shared LLM response cache.
     
     Args:
         prompt: The input prompt
@@ -91,6 +95,7 @@ async def gemini_client(prompt: str, temperature: Optional[float] = None, max_to
         max_tokens: Override max tokens (uses config default if None)
         model: Override model (uses config default if None)
         pid: Process ID for logging (optional)
+        use_cache: Set to False to bypass the response cache for this call
     """
     if not GEMINI_API_KEY:
         gemini_logger.error(f"[PID {pid}] [gemini_client] GEMINI_API_KEY environment variable not set.")
@@ -126,64 +131,79 @@ async def gemini_client(prompt: str, temperature: Optional[float] = None, max_to
         "generationConfig": generation_config
     }
     
+    cache_key = response_cache.make_key("gemini", model_to_use, prompt, generation_config)
+    if use_cache:
+        cached = response_cache.get(cache_key, provider="gemini")
+        if cached is not None:
+            gemini_logger.info(f"[PID {pid}] [gemini_client] CACHE_HIT - ResponseLength: {len(cached)} chars")
+            return cached
+    else:
+        response_cache.record_bypass()
+    
     max_retries = 3
     base_delay = 2  # Start with 2 seconds
     
     for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            client = get_http_client("gemini")
+            async with llm_scheduler.slot("gemini", estimate_tokens(prompt, max_tokens)) as ticket:
                 response = await client.post(api_url, headers=headers, params=params, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                # Defensive: check for expected structure
-                if (
-                    "candidates" in data and
-                    data["candidates"] and
-                    "content" in data["candidates"][0] and
-                    "parts" in data["candidates"][0]["content"] and
-                    data["candidates"][0]["content"]["parts"] and
-                    "text" in data["candidates"][0]["content"]["parts"][0]
-                ):
+            if response.status_code == 429:
+                llm_scheduler.report_rate_limited("gemini", llm_scheduler.parse_retry_after(response.headers))
+            response.raise_for_status()
+            data = response.json()
+            # Defensive: check for expected structure
+            if (
+                "candidates" in data and
+                data["candidates"] and
+                "content" in data["candidates"][0] and
+                "parts" in data["candidates"][0]["content"] and
+                data["candidates"][0]["content"]["parts"] and
+                "text" in data["candidates"][0]["content"]["parts"][0]
+            ):
+                text = data["candidates"][0]["content"]["parts"][0]["text"]
+                finish_reason = data["candidates"][0].get("finishReason", "UNKNOWN")
+                if finish_reason == "MAX_TOKENS":
+                    gemini_logger.warning(f"[PID {pid}] [gemini_client] Gemini response truncated (MAX_TOKENS). Returning partial content.")
+                
+                # Extract token usage if available
+                token_usage = {}
+                if "usageMetadata" in data:
+                    usage = data["usageMetadata"]
+                    token_usage = {
+                        "prompt_tokens": usage.get("promptTokenCount", 0),
+                        "completion_tokens": usage.get("candidatesTokenCount", 0),
+                        "total_tokens": usage.get("totalTokenCount", 0)
+                    }
+                    ticket.record_usage(token_usage["total_tokens"])
+                    gemini_logger.info(f"[PID {pid}] [gemini_client] SUCCESS - ResponseLength: {len(text)} chars, FinishReason: {finish_reason}, Tokens: {token_usage.get('total_tokens', 0)} (Prompt: {token_usage.get('prompt_tokens', 0)}, Completion: {token_usage.get('completion_tokens', 0)})")
+                else:
+                    gemini_logger.info(f"[PID {pid}] [gemini_client] SUCCESS - ResponseLength: {len(text)} chars, FinishReason: {finish_reason}")
+                if use_cache:
+                    response_cache.set(cache_key, text, provider="gemini", model=model_to_use)
+                return text
+            else:
+                finish_reason = (
+                    data["candidates"][0].get("finishReason", "UNKNOWN")
+                    if "candidates" in data and data["candidates"] else "NO_CANDIDATES"
+                )
+                gemini_logger.error(f"[PID {pid}] [gemini_client] Unexpected API response (finishReason={finish_reason}): {data}")
+                # Try to return any partial text if available
+                try:
                     text = data["candidates"][0]["content"]["parts"][0]["text"]
-                    finish_reason = data["candidates"][0].get("finishReason", "UNKNOWN")
-                    if finish_reason == "MAX_TOKENS":
-                        gemini_logger.warning(f"[PID {pid}] [gemini_client] Gemini response truncated (MAX_TOKENS). Returning partial content.")
-                    
-                    # Extract token usage if available
-                    token_usage = {}
-                    if "usageMetadata" in data:
-                        usage = data["usageMetadata"]
-                        token_usage = {
-                            "prompt_tokens": usage.get("promptTokenCount", 0),
-                            "completion_tokens": usage.get("candidatesTokenCount", 0),
-                            "total_tokens": usage.get("totalTokenCount", 0)
-                        }
-                        gemini_logger.info(f"[PID {pid}] [gemini_client] SUCCESS - ResponseLength: {len(text)} chars, FinishReason: {finish_reason}, Tokens: {token_usage.get('total_tokens', 0)} (Prompt: {token_usage.get('prompt_tokens', 0)}, Completion: {token_usage.get('completion_tokens', 0)})")
-                    else:
-                        gemini_logger.info(f"[PID {pid}] [gemini_client] SUCCESS - ResponseLength: {len(text)} chars, FinishReason: {finish_reason}")
+                    gemini_logger.warning(f"[PID {pid}] [gemini_client] Returning partial text from unexpected response structure.")
                     return text
-                else:
-                    finish_reason = (
-                        data["candidates"][0].get("finishReason", "UNKNOWN")
-                        if "candidates" in data and data["candidates"] else "NO_CANDIDATES"
-                    )
-                    gemini_logger.error(f"[PID {pid}] [gemini_client] Unexpected API response (finishReason={finish_reason}): {data}")
-                    # Try to return any partial text if available
-                    try:
-                        text = data["candidates"][0]["content"]["parts"][0]["text"]
-                        gemini_logger.warning(f"[PID {pid}] [gemini_client] Returning partial text from unexpected response structure.")
-                        return text
-                    except Exception:
-                        return f"ERROR: Unexpected API response (finishReason={finish_reason}): {data}"
+                except Exception:
+                    return f"ERROR: Unexpected API response (finishReason={finish_reason}): {data}"
         except httpx.HTTPStatusError as e:
             error_str = str(e)
             # Check if it's a 503 overloaded error
-            is_overloaded = e.response.status_code == 503 or "503" in error_str or "overloaded" in error_str.lower() or "UNAVAILABLE" in error_str or "Service Unavailable" in error_str
+            is_overloaded = e.response.status_code in (429, 503) or "503" in error_str or "overloaded" in error_str.lower() or "UNAVAILABLE" in error_str or "Service Unavailable" in error_str
             
             if is_overloaded and attempt < max_retries - 1:
                 # Exponential backoff: 2s, 4s, 8s
                 delay = base_delay * (2 ** attempt)
-                gemini_logger.warning(f"[PID {pid}] [gemini_client] Model overloaded (503), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
+                gemini_logger.warning(f"[PID {pid}] [gemini_client] Model overloaded or rate limited ({e.response.status_code}), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
                 await asyncio.sleep(delay)
                 continue
             else:
@@ -209,24 +229,75 @@ async def gemini_client(prompt: str, temperature: Optional[float] = None, max_to
     # Should not reach here, but just in case
     return "ERROR: Max retries exceeded"
 
-def get_grounded_company_summary(website_url: str, model: str = "gemini-2.5-flash", pid: int = 0) -> str:
-    """
-    Uses Gemini with Google Search grounding to fetch and summarize up-to-date company information from the web.
-    Returns a concise, factual summary for the given website URL.
-    Includes retry logic for 503 (overloaded) errors with exponential backoff.
-    
-    Args:
-        website_url: The website URL to analyze
-        model: Gemini model to use
-        pid: Process ID for logging (optional)
-    """
-    if not _GENAI_AVAILABLE:
-        gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary] google-generativeai SDK is not installed.")
-        return "ERROR: google-generativeai SDK is not installed."
+def _build_grounded_config(temperature: Optional[float] = None, max_tokens: Optional[int] = None):
+    """Build a deterministic GenerateContentConfig with Google Search grounding enabled."""
+    grounding_tool = types.Tool(google_search=types.GoogleSearch())
+    config = types.GenerateContentConfig(
+        tools=[grounding_tool],
+        temperature=temperature if temperature is not None else GEMINI_TEMPERATURE,
+        top_p=GEMINI_TOP_P,
+        top_k=GEMINI_TOP_K,
+        max_output_tokens=max_tokens if max_tokens is not None else GEMINI_MAX_TOKENS
+    )
     
-    # Type guard: ensure genai and types are not None
-    if genai is None or types is None:
-        gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary] google-generativeai SDK is not installed.")
+    # Add seed if supported
+    if GEMINI_SEED is not None:
+        config.seed = GEMINI_SEED
+    return config
+
+
+def _grounded_summary_prompt(website_url: str) -> str:
+    return (
+        f"Summarize the business, products, and value proposition of the company that owns and operates the website at {website_url}. "
+        "Focus ONLY on the company that controls this specific domain. "
+        "Do not analyze any other companies mentioned in search results. "
+        "Use up-to-date information from the web. Be concise and factual. "
+        "Start by clearly identifying the company name and confirming it owns this website."
+    )
+
+
+def _explicit_search_prompt(website_url: str) -> str:
+    return (
+        f"Use Google Search to find comprehensive information about the company at {website_url}. "
+        "Search for:\n"
+        "- Company name and business information\n"
+        "- Products and services\n"
+        "- Recent news and announcements\n"
+        "- Industry information\n"
+        "- Company profiles on business directories\n"
+        "- Press releases and official communications\n"
+        "\n"
+        "**CRITICAL INSTRUCTIONS:**\n"
+        "- Do NOT attempt to access the website directly\n"
+        "- Use ONLY Google Search results from multiple sources\n"
+        "- Search for information even if the website might be temporarily unavailable\n"
+        "- Find information from news articles, Wikipedia, company profiles, and other indexed sources\n"
+        f"- Focus ONLY on the company that owns and operates this specific domain: {website_url}\n"
+        "- Do not analyze any other companies mentioned in search results\n"
+        "\n"
+        "Provide a comprehensive, structured analysis covering:\n"
+        "1. Company overview (name, history, size, location)\n"
+        "2. Products and services portfolio\n"
+        "3. Target customers and industries served\n"
+        "4. Value propositions and competitive advantages\n"
+        "5. Market positioning and brand messaging\n"
+        "6. Business model and revenue streams\n"
+        "7. Recent developments and news\n"
+        "\n"
+        "Be specific and detailed. Include direct quotes and citations from search results where possible. "
+        "Start by clearly identifying the company name and confirming it owns this website."
+    )
+
+
+def _is_overloaded_error(error_str: str) -> bool:
+    """Check if an SDK error is a 503 (model overloaded) error"""
+    return "503" in error_str or "overloaded" in error_str.lower() or "UNAVAILABLE" in error_str
+
+
+def _grounded_generate(prompt: str, website_url: str, model: str, pid: int, label: str) -> str:
+    """Blocking grounded generation with exponential backoff on 503 errors (sync callers only)."""
+    if not _GENAI_AVAILABLE or genai is None or types is None:
+        gemini_logger.error(f"[PID {pid}] [{label}] google-generativeai SDK is not installed.")
         return "ERROR: google-generativeai SDK is not installed."
     
     import time
@@ -237,161 +308,135 @@ def get_grounded_company_summary(website_url: str, model: str = "gemini-2.5-flas
     for attempt in range(max_retries):
         try:
             client = genai.Client()
-            grounding_tool = types.Tool(google_search=types.GoogleSearch())
-            
-            # Use deterministic configuration
-            config = types.GenerateContentConfig(
-                tools=[grounding_tool],
-                temperature=GEMINI_TEMPERATURE,
-                top_p=GEMINI_TOP_P,
-                top_k=GEMINI_TOP_K,
-                max_output_tokens=GEMINI_MAX_TOKENS
-            )
-            
-            # Add seed if supported
-            if GEMINI_SEED is not None:
-                config.seed = GEMINI_SEED
-            
-            prompt = (
-                f"Summarize the business, products, and value proposition of the company that owns and operates the website at {website_url}. "
-                "Focus ONLY on the company that controls this specific domain. "
-                "Do not analyze any other companies mentioned in search results. "
-                "Use up-to-date information from the web. Be concise and factual. "
-                "Start by clearly identifying the company name and confirming it owns this website."
-            )
-            gemini_logger.info(f"[PID {pid}] [get_grounded_company_summary] START - Website: {website_url}, Model: {model}")
-            response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=config,
-            )
-            gemini_logger.info(f"[PID {pid}] [get_grounded_company_summary] SUCCESS - ResponseLength: {len(response.text) if response.text else 0} chars")
+            gemini_logger.info(f"[PID {pid}] [{label}] START - Website: {website_url}, Model: {model}")
+            with llm_scheduler.slot_sync("gemini", estimate_tokens(prompt, GEMINI_MAX_TOKENS)):
+                response = client.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=_build_grounded_config(),
+                )
+            gemini_logger.info(f"[PID {pid}] [{label}] SUCCESS - ResponseLength: {len(response.text) if response.text else 0} chars")
             return response.text
             
         except Exception as e:
             error_str = str(e)
-            # Check if it's a 503 overloaded error
-            is_overloaded = "503" in error_str or "overloaded" in error_str.lower() or "UNAVAILABLE" in error_str
-            
-            if is_overloaded and attempt < max_retries - 1:
+            if _is_overloaded_error(error_str) and attempt < max_retries - 1:
                 # Exponential backoff: 2s, 4s, 8s
                 delay = base_delay * (2 ** attempt)
-                gemini_logger.warning(f"[PID {pid}] [get_grounded_company_summary] Model overloaded (503), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
+                gemini_logger.warning(f"[PID {pid}] [{label}] Model overloaded (503), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
                 time.sleep(delay)
                 continue
             else:
                 # Final attempt failed or non-retryable error
-                gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary] ERROR - {e}")
+                gemini_logger.error(f"[PID {pid}] [{label}] ERROR - {e}")
                 return f"ERROR: {e}"
     
     # Should not reach here, but just in case
     return "ERROR: Max retries exceeded"
 
 
-def get_grounded_company_summary_with_explicit_search(website_url: str, model: str = "gemini-2.5-flash", pid: int = 0) -> str:
-    """
-    Uses Gemini with Google Search grounding and explicit search instructions.
-    This version explicitly instructs Gemini to use web search instead of direct website access.
-    Returns a comprehensive company analysis for the given website URL.
-    Includes retry logic for 503 (overloaded) errors with exponential backoff.
-    
-    Args:
-        website_url: The website URL to analyze
-        model: Gemini model to use
-        pid: Process ID for logging (optional)
-    """
-    if not _GENAI_AVAILABLE:
-        gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] google-generativeai SDK is not installed.")
+async def _grounded_generate_async(prompt: str, website_url: str, model: str, pid: int, label: str) -> str:
+    """Non-blocking grounded generation using the SDK's async client and asyncio.sleep backoff."""
+    if not _GENAI_AVAILABLE or genai is None or types is None:
+        gemini_logger.error(f"[PID {pid}] [{label}] google-generativeai SDK is not installed.")
         return "ERROR: google-generativeai SDK is not installed."
     
-    # Type guard: ensure genai and types are not None
-    if genai is None or types is None:
-        gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] google-generativeai SDK is not installed.")
-        return "ERROR: google-generativeai SDK is not installed."
-    
-    import time
-    
     max_retries = 3
     base_delay = 2  # Start with 2 seconds
     
     for attempt in range(max_retries):
         try:
+            # Inside the try: a missing API key must surface as an "ERROR:" result, like the sync helper
             client = genai.Client()
-            grounding_tool = types.Tool(google_search=types.GoogleSearch())
-            
-            # Use deterministic configuration
-            config = types.GenerateContentConfig(
-                tools=[grounding_tool],
-                temperature=GEMINI_TEMPERATURE,
-                top_p=GEMINI_TOP_P,
-                top_k=GEMINI_TOP_K,
-                max_output_tokens=GEMINI_MAX_TOKENS
-            )
-            
-            # Add seed if supported
-            if GEMINI_SEED is not None:
-                config.seed = GEMINI_SEED
-            
-            prompt = (
-                f"Use Google Search to find comprehensive information about the company at {website_url}. "
-                "Search for:\n"
-                "- Company name and business information\n"
-                "- Products and services\n"
-                "- Recent news and announcements\n"
-                "- Industry information\n"
-                "- Company profiles on business directories\n"
-                "- Press releases and official communications\n"
-                "\n"
-                "**CRITICAL INSTRUCTIONS:**\n"
-                "- Do NOT attempt to access the website directly\n"
-            "- Use ONLY Google Search results from multiple sources\n"
-            "- Search for information even if the website might be temporarily unavailable\n"
-            "- Find information from news articles, Wikipedia, company profiles, and other indexed sources\n"
-            f"- Focus ONLY on the company that owns and operates this specific domain: {website_url}\n"
-            "- Do not analyze any other companies mentioned in search results\n"
-            "\n"
-            "Provide a comprehensive, structured analysis covering:\n"
-            "1. Company overview (name, history, size, location)\n"
-            "2. Products and services portfolio\n"
-            "3. Target customers and industries served\n"
-            "4. Value propositions and competitive advantages\n"
-            "5. Market positioning and brand messaging\n"
-            "6. Business model and revenue streams\n"
-            "7. Recent developments and news\n"
-            "\n"
-            "Be specific and detailed. Include direct quotes and citations from search results where possible. "
-            "Start by clearly identifying the company name and confirming it owns this website."
-        )
-        
-            gemini_logger.info(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] START - Website: {website_url}, Model: {model}")
-            response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=config,
-            )
-            gemini_logger.info(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] SUCCESS - ResponseLength: {len(response.text) if response.text else 0} chars")
+            gemini_logger.info(f"[PID {pid}] [{label}] START - Website: {website_url}, Model: {model}")
+            async with llm_scheduler.slot("gemini", estimate_tokens(prompt, GEMINI_MAX_TOKENS)):
+                response = await client.aio.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=_build_grounded_config(),
+                )
+            gemini_logger.info(f"[PID {pid}] [{label}] SUCCESS - ResponseLength: {len(response.text) if response.text else 0} chars")
             return response.text
             
         except Exception as e:
             error_str = str(e)
-            # Check if it's a 503 overloaded error
-            is_overloaded = "503" in error_str or "overloaded" in error_str.lower() or "UNAVAILABLE" in error_str
-            
-            if is_overloaded and attempt < max_retries - 1:
+            if _is_overloaded_error(error_str) and attempt < max_retries - 1:
                 # Exponential backoff: 2s, 4s, 8s
                 delay = base_delay * (2 ** attempt)
-                gemini_logger.warning(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] Model overloaded (503), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
-                time.sleep(delay)
+                gemini_logger.warning(f"[PID {pid}] [{label}] Model overloaded (503), retrying in {delay}s (attempt {attempt + 1}/{max_retries}): {error_str[:100]}")
+                await asyncio.sleep(delay)
                 continue
             else:
                 # Final attempt failed or non-retryable error
-                gemini_logger.error(f"[PID {pid}] [get_grounded_company_summary_with_explicit_search] ERROR - {e}")
+                gemini_logger.error(f"[PID {pid}] [{label}] ERROR - {e}")
                 return f"ERROR: {e}"
     
     # Should not reach here, but just in case
     return "ERROR: Max retries exceeded"
 
 
+def get_grounded_company_summary(website_url: str, model: str = "gemini-2.5-flash", pid: int = 0) -> str:
+    """
+    Uses Gemini with Google Search grounding to fetch and summarize up-to-date company information from the web.
+    Returns a concise, factual summary for the given website URL.
+    Includes retry logic for 503 (overloaded) errors with exponential backoff.
+    
+    This call blocks; use get_grounded_company_summary_async from async code.
+    
+    Args:
+        website_url: The website URL to analyze
+        model: Gemini model to use
+        pid: Process ID for logging (optional)
+    """
+    return _grounded_generate(_grounded_summary_prompt(website_url), website_url, model, pid,
+                              "get_grounded_company_summary")
+
+
+async def get_grounded_company_summary_async(website_url: str, model: str = "gemini-2.5-flash", pid: int = 0) -> str:
+    """
+    Async version of get_grounded_company_summary that does not block the event loop.
+    
+    Args:
+        website_url: The website URL to analyze
+        model: Gemini model to use
+        pid: Process ID for logging (optional)
+    """
+    return await _grounded_generate_async(_grounded_summary_prompt(website_url), website_url, model, pid,
+                                          "get_grounded_company_summary_async")
+
+
+def get_grounded_company_summary_with_explicit_search(website_url: str, model: str = "gemini-2.5-flash", pid: int = 0) -> str:
+    """
+    Uses Gemini with Google Search grounding and explicit search instructions.
+    This version explicitly instructs Gemini to use web search instead of direct website access.
+    Returns a comprehensive company analysis for the given website URL.
+    Includes retry logic for 503 (overloaded) errors with exponential backoff.
+    
+    This call blocks; use get_grounded_company_summary_with_explicit_search_async from async code.
+    
+    Args:
+        website_url: The website URL to analyze
+        model: Gemini model to use
+        pid: Process ID for logging (optional)
+    """
+    return _grounded_generate(_explicit_search_prompt(website_url), website_url, model, pid,
+                              "get_grounded_company_summary_with_explicit_search")
+
+
+async def get_grounded_company_summary_with_explicit_search_async(website_url: str, model: str = "gemini-2.5-flash",
+                                                                  pid: int = 0) -> str:
+    """
+    Async version of get_grounded_company_summary_with_explicit_search that does not block the event loop.
+    
+    Args:
+        website_url: The website URL to analyze
+        model: Gemini model to use
+        pid: Process ID for logging (optional)
+    """
+    return await _grounded_generate_async(_explicit_search_prompt(website_url), website_url, model, pid,
+                                          "get_grounded_company_summary_with_explicit_search_async")
+
+
 async def gemini_client_with_grounding(prompt: str, temperature: Optional[float] = None, 
                                       max_tokens: Optional[int] = None, model: Optional[str] = None, pid: int = 0) -> str:
     """
@@ -420,7 +465,6 @@ async def gemini_client_with_grounding(prompt: str, temperature: Optional[float]
     
     try:
         client = genai.Client()
-        grounding_tool = types.Tool(google_search=types.GoogleSearch())
         
         # Use deterministic configuration
         temperature = temperature if temperature is not None else GEMINI_TEMPERATURE
@@ -429,23 +473,13 @@ async def gemini_client_with_grounding(prompt: str, temperature: Optional[float]
         
         gemini_logger.info(f"[PID {pid}] [gemini_client_with_grounding] START - Model: {model_to_use}, Temp: {temperature}, MaxTokens: {max_tokens}, Grounding: Enabled")
         
-        config = types.GenerateContentConfig(
-            tools=[grounding_tool],  # Explicitly enable Google Search
-            temperature=temperature,
-            top_p=GEMINI_TOP_P,
-            top_k=GEMINI_TOP_K,
-            max_output_tokens=max_tokens
-        )
-        
-        # Add seed if supported
-        if GEMINI_SEED is not None:
-            config.seed = GEMINI_SEED
-        
-        response = client.models.generate_content(
-            model=model_to_use,
-            contents=prompt,
-            config=config,
-        )
+        # Explicitly enable Google Search; use the SDK's async client so the event loop is not blocked
+        async with llm_scheduler.slot("gemini", estimate_tokens(prompt, max_tokens)):
+            response = await client.aio.models.generate_content(
+                model=model_to_use,
+                contents=prompt,
+                config=_build_grounded_config(temperature, max_tokens),
+            )
         gemini_logger.info(f"[PID {pid}] [gemini_client_with_grounding] SUCCESS - ResponseLength: {len(response.text) if response.text else 0} chars")
         return response.text
     except Exception as e:
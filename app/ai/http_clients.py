@@ -0,0 +1,133 @@
+"""
+Shared HTTP Clients
+Per-event-loop registry of long-lived httpx.AsyncClient instances for all AI providers.
+Keeps connections alive across calls and retries so each request does not pay
+a fresh DNS lookup and TLS handshake.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+import importlib.util
+from typing import Dict, Any
+
+import httpx
+
+# Import connection pool configuration
+try:
+    from app.config import (
+        HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        HTTP_KEEPALIVE_EXPIRY, HTTP2_ENABLED
+    )
+except ImportError:
+    # Fallback values if config import fails
+    HTTP_MAX_CONNECTIONS = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+    HTTP_KEEPALIVE_EXPIRY = 30.0
+    HTTP2_ENABLED = True
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install "httpx[http2]")
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Per-provider client settings. Timeouts match the previous per-call clients;
+# individual requests may still override them.
+PROVIDER_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "gemini": {"http2": True, "timeout": httpx.Timeout(60.0, connect=10.0)},
+    "openai": {"http2": True, "timeout": httpx.Timeout(120.0, connect=10.0)},
+    "sonar": {"http2": True, "timeout": httpx.Timeout(30.0, connect=10.0), "follow_redirects": True},
+    # Ollama only speaks HTTP/1.1
+    "ollama": {"http2": False, "timeout": httpx.Timeout(120.0, connect=10.0)},
+}
+
+# loop -> {provider -> client}; entries disappear with their event loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _build_client(provider: str) -> httpx.AsyncClient:
+    settings = PROVIDER_SETTINGS.get(provider, {})
+    http2 = bool(settings.get("http2")) and HTTP2_ENABLED and _H2_AVAILABLE
+    logger.info(f"[http_clients] Creating pooled client for '{provider}' (http2={http2})")
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.get("timeout", httpx.Timeout(60.0, connect=10.0)),
+        follow_redirects=settings.get("follow_redirects", False),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """
+    Get the pooled client for a provider on the running event loop.
+
+    Clients are bound to the loop that created them, so every loop
+    (e.g. each asyncio.run() in a background thread) gets its own set.
+
+    Args:
+        provider: One of "gemini", "openai", "sonar" or "ollama"
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        # Drop clients whose loop has already finished; they can no longer be used
+        for stale_loop in [l for l in list(_clients.keys()) if l.is_closed()]:
+            _clients.pop(stale_loop, None)
+
+        loop_clients = _clients.get(loop)
+        if loop_clients is None:
+            loop_clients = {}
+            _clients[loop] = loop_clients
+
+        client = loop_clients.get(provider)
+        if client is None or client.is_closed:
+            client = _build_client(provider)
+            loop_clients[provider] = client
+        return client
+
+
+async def close_http_clients():
+    """Close all pooled clients that belong to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_clients = _clients.pop(loop, {})
+    for provider, client in loop_clients.items():
+        try:
+            await client.aclose()
+            logger.info(f"[http_clients] Closed pooled client for '{provider}'")
+        except Exception as e:
+            logger.warning(f"[http_clients] Error closing client for '{provider}': {e}")
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Get the number of live clients per event loop (for diagnostics)."""
+    with _lock:
+        return {
+            "loops": len(_clients),
+            "clients": sum(len(c) for c in _clients.values()),
+            "http2_available": _H2_AVAILABLE,
+            "max_connections": HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        }
+
+
+@atexit.register
+def _close_remaining_clients():
+    """Best-effort shutdown for clients whose loop is idle but still open."""
+    with _lock:
+        remaining = list(_clients.items())
+        _clients.clear()
+    for loop, loop_clients in remaining:
+        if loop.is_closed() or loop.is_running():
+            continue
+        for client in loop_clients.values():
+            try:
+                loop.run_until_complete(client.aclose())
+            except Exception:
+                pass
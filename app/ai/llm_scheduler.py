@@ -0,0 +1,450 @@
+"""
+LLM Admission Scheduler
+Process-wide rate limiting for every LLM provider call (Gemini, OpenAI, Perplexity Sonar, Ollama).
+
+Each provider has a requests-per-minute and a tokens-per-minute token bucket plus a cap on
+in-flight requests. Waiting calls are admitted by priority class (interactive UI calls before
+background persona tasks, with aging so background work is never starved) and round-robin
+across users inside a class, so one user's batch cannot monopolise the quota.
+
+The scheduler is shared by all threads and event loops of the process (background persona
+generation runs its own event loop per thread), so its state is guarded by a threading lock
+and waiters are woken through their own loop.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable
+
+# Import scheduler configuration
+try:
+    from app.config import LLM_SCHEDULER_ENABLED, LLM_RATE_LIMITS, LLM_SCHEDULER_STARVATION_SECONDS
+except ImportError:
+    # Fallback values if config import fails
+    LLM_SCHEDULER_ENABLED = True
+    LLM_RATE_LIMITS = {
+        "gemini": {"rpm": 10, "tpm": 1000000, "max_concurrency": 3},
+        "openai": {"rpm": 500, "tpm": 200000, "max_concurrency": 8},
+        "sonar": {"rpm": 50, "tpm": 0, "max_concurrency": 4},
+        "ollama": {"rpm": 0, "tpm": 0, "max_concurrency": 2},
+    }
+    LLM_SCHEDULER_STARVATION_SECONDS = 30.0
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower value is admitted first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# Request context: set once per UI action / background task, read by every provider call below it
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_request_priority", default=PRIORITY_INTERACTIVE)
+_request_user: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_request_user", default=None)
+
+
+@contextlib.contextmanager
+def llm_request_context(priority: Optional[int] = None, user_id: Optional[str] = None):
+    """
+    Tag all LLM calls made inside this block (including tasks it spawns) with a
+    priority class and the user they are made for.
+
+    Example:
+        with llm_request_context(PRIORITY_BACKGROUND, user_id):
+            await generate_persona(...)
+    """
+    priority_token = _request_priority.set(priority) if priority is not None else None
+    user_token = _request_user.set(str(user_id)) if user_id is not None else None
+    try:
+        yield
+    finally:
+        if user_token is not None:
+            _request_user.reset(user_token)
+        if priority_token is not None:
+            _request_priority.reset(priority_token)
+
+
+def set_llm_request_context(priority: Optional[int] = None, user_id: Optional[str] = None):
+    """
+    Tag the rest of the current task (e.g. a background job running in its own
+    asyncio.run()) with a priority class and user, without a with-block.
+    """
+    if priority is not None:
+        _request_priority.set(priority)
+    if user_id is not None:
+        _request_user.set(str(user_id))
+
+
+def estimate_tokens(prompt: str, max_tokens: Optional[int] = None) -> int:
+    """Rough token estimate for admission (about 4 characters per token plus the output budget)."""
+    return max(1, len(prompt or "") // 4) + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously; capacity <= 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        if self.unlimited:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def clamp(self, amount: float) -> float:
+        """Requests larger than the bucket are charged a full bucket so they can still run."""
+        return amount if self.unlimited else min(amount, self.capacity)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        missing = self.clamp(amount) - self.tokens
+        return 0.0 if missing <= 0 else missing / self.refill_rate
+
+    def consume(self, amount: float, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            self.tokens -= self.clamp(amount)
+
+    def adjust(self, delta: float, now: float):
+        """Refund (positive) or charge (negative) tokens after the real usage is known."""
+        if not self.unlimited:
+            self._refill(now)
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class _Waiter:
+    __slots__ = ("provider", "tokens", "priority", "user", "enqueued", "granted", "wake")
+
+    def __init__(self, provider: str, tokens: int, priority: int, user: str, wake: Callable[[], None]):
+        self.provider = provider
+        self.tokens = tokens
+        self.priority = priority
+        self.user = user
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.wake = wake
+
+
+class _ProviderState:
+    def __init__(self, name: str, limits: Dict[str, Any]):
+        self.name = name
+        self.rpm = TokenBucket(limits.get("rpm", 0))
+        self.tpm = TokenBucket(limits.get("tpm", 0))
+        self.max_concurrency = int(limits.get("max_concurrency", 0)) or None
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        # priority -> user -> deque of waiters; users are served round-robin
+        self.queues: Dict[int, Dict[str, deque]] = {}
+        self.user_order: Dict[int, deque] = {}
+        self.stats = {"admitted": 0, "rate_limited_429": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        queues = self.queues.values() if priority is None else [self.queues.get(priority, {})]
+        return sum(len(q) for per_user in queues for q in per_user.values())
+
+
+class Ticket:
+    """Admission ticket; report the real token usage with record_usage() when known."""
+
+    def __init__(self, scheduler: "LLMScheduler", provider: str, tokens: int):
+        self._scheduler = scheduler
+        self.provider = provider
+        self.tokens = tokens
+
+    def record_usage(self, total_tokens: int):
+        if total_tokens:
+            self._scheduler._adjust_tokens(self.provider, self.tokens - total_tokens)
+            self.tokens = total_tokens
+
+
+class LLMScheduler:
+    """Admission scheduler enforcing per-provider RPM/TPM buckets and concurrency caps."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None, enabled: bool = True,
+                 starvation_seconds: float = 30.0):
+        self.enabled = enabled
+        self.starvation_seconds = starvation_seconds
+        self._lock = threading.Lock()
+        self._providers = {name: _ProviderState(name, provider_limits)
+                           for name, provider_limits in (limits or {}).items()}
+
+    def _state(self, provider: str) -> Optional[_ProviderState]:
+        return self._providers.get(provider)
+
+    # --- admission -----------------------------------------------------------------------
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> int:
+        # Aging: long-waiting background calls compete as interactive so they are never starved
+        if waiter.priority > PRIORITY_INTERACTIVE and now - waiter.enqueued >= self.starvation_seconds:
+            return PRIORITY_INTERACTIVE
+        return waiter.priority
+
+    def _next_waiter(self, state: _ProviderState, now: float) -> Optional[_Waiter]:
+        """Pick the head waiter of the best priority class, rotating across users."""
+        best, best_key = None, None
+        for priority, user_order in state.user_order.items():
+            for user in user_order:
+                waiter = state.queues[priority][user][0]
+                key = (self._effective_priority(waiter, now), waiter.enqueued)
+                if best_key is None or key < best_key:
+                    best, best_key = waiter, key
+                break  # only the first user in each class' rotation is eligible
+        return best
+
+    def _remove(self, state: _ProviderState, waiter: _Waiter):
+        per_user = state.queues.get(waiter.priority, {})
+        queue = per_user.get(waiter.user)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        order = state.user_order[waiter.priority]
+        if queue:
+            # Served user goes to the back of the rotation
+            if order and order[0] == waiter.user:
+                order.rotate(-1)
+        else:
+            del per_user[waiter.user]
+            order.remove(waiter.user)
+            if not order:
+                del state.user_order[waiter.priority]
+                del state.queues[waiter.priority]
+
+    def _dispatch(self, state: _ProviderState) -> float:
+        """
+        Admit as many waiters as limits allow (caller holds the lock).
+
+        Returns:
+            Seconds until the next waiter could be admitted by bucket refill, or 0 if the
+            queue is empty / blocked only by the concurrency cap.
+        """
+        while True:
+            now = time.monotonic()
+            waiter = self._next_waiter(state, now)
+            if waiter is None:
+                return 0.0
+            if state.max_concurrency and state.in_flight >= state.max_concurrency:
+                return 0.0
+            delay = max(state.cooldown_until - now,
+                        state.rpm.wait_time(1, now),
+                        state.tpm.wait_time(waiter.tokens, now))
+            if delay > 0:
+                return delay
+            state.rpm.consume(1, now)
+            state.tpm.consume(waiter.tokens, now)
+            state.in_flight += 1
+            self._remove(state, waiter)
+            waiter.granted = True
+            wait = now - waiter.enqueued
+            state.stats["admitted"] += 1
+            state.stats["total_wait"] += wait
+            state.stats["max_wait"] = max(state.stats["max_wait"], wait)
+            waiter.wake()
+
+    def _enqueue(self, state: _ProviderState, waiter: _Waiter):
+        per_user = state.queues.setdefault(waiter.priority, {})
+        if waiter.user not in per_user:
+            per_user[waiter.user] = deque()
+            state.user_order.setdefault(waiter.priority, deque()).append(waiter.user)
+        per_user[waiter.user].append(waiter)
+
+    def _release(self, provider: str):
+        state = self._state(provider)
+        if state is None:
+            return
+        with self._lock:
+            state.in_flight = max(0, state.in_flight - 1)
+            self._dispatch(state)
+
+    def _adjust_tokens(self, provider: str, delta: float):
+        state = self._state(provider)
+        if state is None:
+            return
+        with self._lock:
+            state.tpm.adjust(delta, time.monotonic())
+            self._dispatch(state)
+
+    def _make_waiter(self, provider: str, tokens: int, priority: Optional[int], user_id: Optional[str],
+                     wake: Callable[[], None]) -> _Waiter:
+        priority = _request_priority.get() if priority is None else priority
+        user = str(user_id) if user_id is not None else (_request_user.get() or "anonymous")
+        return _Waiter(provider, tokens, priority, user, wake)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, provider: str, tokens: int = 1, priority: Optional[int] = None,
+                   user_id: Optional[str] = None):
+        """
+        Wait for admission to call `provider`, then hold a concurrency slot for the block.
+
+        Args:
+            provider: "gemini", "openai", "sonar" or "ollama"
+            tokens: Estimated tokens for the call (see estimate_tokens)
+            priority: PRIORITY_INTERACTIVE / PRIORITY_BACKGROUND (defaults to the request context)
+            user_id: User the call is made for (defaults to the request context)
+        """
+        state = self._state(provider)
+        if not self.enabled or state is None:
+            yield Ticket(self, provider, 0)
+            return
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(event.set)
+
+        waiter = self._make_waiter(provider, tokens, priority, user_id, wake)
+        with self._lock:
+            self._enqueue(state, waiter)
+            delay = self._dispatch(state)
+        try:
+            while not waiter.granted:
+                try:
+                    # Sleep until woken by a release, or until the buckets have refilled
+                    await asyncio.wait_for(event.wait(), timeout=delay if delay > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+                with self._lock:
+                    if waiter.granted:
+                        break
+                    delay = self._dispatch(state)
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    state.in_flight = max(0, state.in_flight - 1)
+                else:
+                    self._remove(state, waiter)
+                self._dispatch(state)
+            raise
+
+        ticket = Ticket(self, provider, waiter.tokens)
+        try:
+            yield ticket
+        finally:
+            self._release(provider)
+
+    @contextlib.contextmanager
+    def slot_sync(self, provider: str, tokens: int = 1, priority: Optional[int] = None,
+                  user_id: Optional[str] = None):
+        """Blocking variant of slot() for synchronous callers."""
+        state = self._state(provider)
+        if not self.enabled or state is None:
+            yield Ticket(self, provider, 0)
+            return
+
+        event = threading.Event()
+        waiter = self._make_waiter(provider, tokens, priority, user_id, event.set)
+        with self._lock:
+            self._enqueue(state, waiter)
+            delay = self._dispatch(state)
+        try:
+            while not waiter.granted:
+                event.wait(timeout=delay if delay > 0 else None)
+                event.clear()
+                with self._lock:
+                    if waiter.granted:
+                        break
+                    delay = self._dispatch(state)
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    state.in_flight = max(0, state.in_flight - 1)
+                else:
+                    self._remove(state, waiter)
+                self._dispatch(state)
+            raise
+
+        ticket = Ticket(self, provider, waiter.tokens)
+        try:
+            yield ticket
+        finally:
+            self._release(provider)
+
+    # --- feedback from providers -----------------------------------------------------------
+
+    def report_rate_limited(self, provider: str, retry_after: Optional[float] = None):
+        """
+        Called when a provider answered 429: pause admissions for `retry_after` seconds
+        (default 10s) and empty the request bucket, so queued calls do not pile on.
+        """
+        state = self._state(provider)
+        if state is None:
+            return
+        pause = retry_after if retry_after and retry_after > 0 else 10.0
+        with self._lock:
+            now = time.monotonic()
+            state.cooldown_until = max(state.cooldown_until, now + pause)
+            state.rpm.drain(now)
+            state.stats["rate_limited_429"] += 1
+        logger.warning(f"[LLMScheduler] {provider} returned 429 - pausing admissions for {pause:.1f}s")
+
+    @staticmethod
+    def parse_retry_after(headers) -> Optional[float]:
+        """Read a Retry-After header (seconds) from an HTTP response, if present."""
+        try:
+            value = headers.get("retry-after") if headers is not None else None
+            return float(value) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    # --- metrics ---------------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls, bucket levels and wait times per provider."""
+        metrics = {}
+        with self._lock:
+            now = time.monotonic()
+            for name, state in self._providers.items():
+                state.rpm._refill(now)
+                state.tpm._refill(now)
+                admitted = state.stats["admitted"]
+                metrics[name] = {
+                    "queue_depth": state.queue_depth(),
+                    "queue_depth_by_priority": {
+                        PRIORITY_NAMES.get(p, str(p)): state.queue_depth(p) for p in PRIORITY_NAMES
+                    },
+                    "waiting_users": len({user for per_user in state.queues.values() for user in per_user}),
+                    "in_flight": state.in_flight,
+                    "max_concurrency": state.max_concurrency,
+                    "rpm_available": None if state.rpm.unlimited else round(state.rpm.tokens, 1),
+                    "tpm_available": None if state.tpm.unlimited else round(state.tpm.tokens),
+                    "cooldown_remaining": round(max(0.0, state.cooldown_until - now), 1),
+                    "admitted": admitted,
+                    "rate_limited_429": state.stats["rate_limited_429"],
+                    "avg_wait": round(state.stats["total_wait"] / admitted, 3) if admitted else 0.0,
+                    "max_wait": round(state.stats["max_wait"], 3),
+                }
+        return metrics
+
+
+# Global instance shared by all provider clients
+llm_scheduler = LLMScheduler(LLM_RATE_LIMITS, enabled=LLM_SCHEDULER_ENABLED,
+                             starvation_seconds=LLM_SCHEDULER_STARVATION_SECONDS)
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the global LLM admission scheduler"""
+    return llm_scheduler
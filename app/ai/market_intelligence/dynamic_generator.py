@@ -5,6 +5,7 @@ Generates industry frameworks dynamically based on company profile.
 
 import os
 import sys
+import copy
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -22,6 +23,7 @@ class DynamicIndustryFrameworkGenerator:
     def __init__(self):
         self.company_profile = self._load_company_profile()
         self.framework_cache = {}
+        self.customized_cache = {}  # industry -> (customizations version, customized framework)
         self.last_profile_check = None
     
     def _load_company_profile(self) -> Dict[str, Any]:
@@ -82,14 +84,21 @@ class DynamicIndustryFrameworkGenerator:
             self.framework_cache[normalized_name] = framework_data
             cached_framework = framework_data
         
-        # Always apply customizations (even if from cache) to ensure latest customizations are applied
+        # Customizations are re-applied only when their version stamp has changed
         try:
-            from app.database_framework_customizations import apply_customizations_to_framework
-            customized_framework = apply_customizations_to_framework(cached_framework, normalized_name)
-            return customized_framework
+            from app.database_framework_customizations import (
+                apply_customizations_to_framework, get_customizations_version
+            )
+            version = get_customizations_version()
+            cached_customized = self.customized_cache.get(normalized_name)
+            if cached_customized is None or cached_customized[0] != version:
+                cached_customized = (version, apply_customizations_to_framework(cached_framework, normalized_name))
+                self.customized_cache[normalized_name] = cached_customized
+            # Callers may modify the framework (e.g. attach validation results)
+            return copy.deepcopy(cached_customized[1])
         except Exception as e:
             logger.warning(f"Could not load framework customizations: {e}")
-            return cached_framework
+            return copy.deepcopy(cached_framework)
     
     def get_company_frameworks(self) -> Dict[str, Dict[str, Any]]:
         """Get frameworks for all company industries"""
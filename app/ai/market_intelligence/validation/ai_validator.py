@@ -11,7 +11,7 @@ import json
 import re
 import asyncio
 from typing import Dict, List, Any
-from app.ai.chatgpt_client import chatgpt_generate
+from .relevance_scorer import generate_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +41,7 @@ class AIFrameworkValidator:
             # Use appropriate token limit for comprehensive validation
             # ChatGPT has 4000 max, use up to 3500 for validation to ensure complete responses
             max_tokens_for_validation = min(CHATGPT_MAX_TOKENS, 3500)
-            response = await chatgpt_generate(
+            response = await generate_with_backoff(
                 prompt,
                 temperature=0.2,  # Low temperature for consistent validation
                 max_tokens=max_tokens_for_validation
@@ -8,7 +8,7 @@ and reliability compared to Gemini.
 
 import logging
 from typing import Dict, List, Any
-from app.ai.chatgpt_client import chatgpt_generate
+from .relevance_scorer import generate_with_backoff
 import json
 import re
 
@@ -239,7 +239,7 @@ Focus on industry-specific elements, not generic ones.
             from app.config import CHATGPT_MAX_TOKENS
             # Use appropriate token limit for benchmark generation
             max_tokens_for_benchmark = min(CHATGPT_MAX_TOKENS, 3000)
-            response = await chatgpt_generate(prompt, temperature=0.3, max_tokens=max_tokens_for_benchmark)
+            response = await generate_with_backoff(prompt, temperature=0.3, max_tokens=max_tokens_for_benchmark)
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 return json.loads(json_match.group(0))
@@ -38,77 +38,35 @@ class FrameworkValidator:
             "overall_quality": 0.0
         }
         
-        # 1. Relevance Scoring (with rate limiting)
-        try:
-            relevance_results = {}
-            properties_to_score = [
-                "key_metrics", "trend_areas", "competitive_factors",
-                "value_drivers", "pain_points", "technology_focus",
-                "sustainability_initiatives"
-            ]
-            
-            for idx, prop_name in enumerate(properties_to_score):
-                prop_items = framework_data.get(prop_name, [])
-                if prop_items:
-                    # Add delay between properties to avoid rate limiting
-                    if idx > 0:
-                        await asyncio.sleep(2.0)  # 2 second delay between properties to avoid 429 errors
-                    
-                    try:
-                        score_result = await self.relevance_scorer.score_property_relevance(
-                            prop_name, prop_items, industry_name
-                        )
-                        relevance_results[prop_name] = score_result
-                    except Exception as e:
-                        logger.warning(f"Error scoring property '{prop_name}': {e}")
-                        # Continue with other properties even if one fails
-                        relevance_results[prop_name] = {
-                            "property_score": 0,
-                            "error": str(e)
-                        }
-            
-            validation_results["relevance"] = relevance_results
-            
-        except Exception as e:
-            logger.error(f"Error in relevance scoring: {e}")
-            validation_results["relevance"] = {"error": str(e)}
-        
-        # Add delay before next validation step
-        await asyncio.sleep(2.0)  # Longer delay to avoid rate limiting
-        
-        # 2. Completeness Checks
-        try:
-            completeness_result = await self.completeness_validator.validate_completeness(
-                framework_data, industry_name
-            )
-            validation_results["completeness"] = completeness_result
-        except Exception as e:
-            logger.error(f"Error in completeness validation: {e}")
-            validation_results["completeness"] = {"error": str(e)}
-        
-        # Add delay before next validation step
-        await asyncio.sleep(2.0)  # Longer delay to avoid rate limiting
-        
-        # 3. Consistency Validation (no API calls, fast)
-        try:
-            consistency_result = self.consistency_validator.validate_consistency(framework_data)
-            validation_results["consistency"] = consistency_result
-        except Exception as e:
-            logger.error(f"Error in consistency validation: {e}")
-            validation_results["consistency"] = {"error": str(e)}
-        
-        # Add delay before AI validation
-        await asyncio.sleep(3.0)  # Longer delay before final validation step
-        
-        # 4. AI Validation Layer
-        try:
-            ai_result = await self.ai_validator.validate_framework(
-                framework_data, self.company_profile, industry_name
-            )
-            validation_results["ai_validation"] = ai_result
-        except Exception as e:
-            logger.error(f"Error in AI validation: {e}")
-            validation_results["ai_validation"] = {"error": str(e)}
+        # The AI stages are independent and run concurrently; provider rate limits are enforced
+        # by the LLM scheduler, which only backs off after an actual 429
+        properties_to_score = [
+            "key_metrics", "trend_areas", "competitive_factors",
+            "value_drivers", "pain_points", "technology_focus",
+            "sustainability_initiatives"
+        ]
+        relevance, completeness, consistency, ai_validation = await asyncio.gather(
+            # 1. Relevance Scoring (all properties at once)
+            self.relevance_scorer.score_properties(
+                {prop_name: framework_data.get(prop_name, []) for prop_name in properties_to_score},
+                industry_name
+            ),
+            # 2. Completeness Checks
+            self.completeness_validator.validate_completeness(framework_data, industry_name),
+            # 3. Consistency Validation (no API calls, runs in a worker thread alongside the AI stages)
+            asyncio.to_thread(self.consistency_validator.validate_consistency, framework_data),
+            # 4. AI Validation Layer
+            self.ai_validator.validate_framework(framework_data, self.company_profile, industry_name),
+            return_exceptions=True
+        )
+        
+        for key, result in (("relevance", relevance), ("completeness", completeness),
+                            ("consistency", consistency), ("ai_validation", ai_validation)):
+            if isinstance(result, BaseException):
+                logger.error(f"Error in {key} validation: {result}")
+                validation_results[key] = {"error": str(result)}
+            else:
+                validation_results[key] = result
         
         # Calculate overall quality score
         validation_results["overall_quality"] = self._calculate_overall_quality(validation_results)
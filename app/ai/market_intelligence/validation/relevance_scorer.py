@@ -12,6 +12,21 @@ from app.ai.chatgpt_client import chatgpt_generate
 
 logger = logging.getLogger(__name__)
 
+# Attempts after a 429; the LLM scheduler holds the retry until the provider's cool-down has passed
+RATE_LIMIT_RETRIES = 2
+
+
+async def generate_with_backoff(prompt: str, temperature: float, max_tokens: int,
+                                retries: int = RATE_LIMIT_RETRIES) -> str:
+    """chatgpt_generate() that retries only when the provider answered 429 (rate limited)."""
+    response = await chatgpt_generate(prompt, temperature=temperature, max_tokens=max_tokens)
+    for attempt in range(retries):
+        if not (isinstance(response, str) and response.startswith("ERROR: HTTP 429")):
+            break
+        logger.info(f"Rate limited by provider, retrying ({attempt + 1}/{retries})")
+        response = await chatgpt_generate(prompt, temperature=temperature, max_tokens=max_tokens)
+    return response
+
 class FrameworkRelevanceScorer:
     """Scores framework properties for relevance to company profile"""
     
@@ -53,31 +68,23 @@ class FrameworkRelevanceScorer:
         company_context = self._build_company_context()
         
         # Batch score items to reduce API calls and token usage
-        # Score 5-8 items at a time depending on item length
+        # Score up to 8 items per call; batches run concurrently (pacing is left to the LLM scheduler)
         batch_size = 8 if len(property_items) > 8 else len(property_items)
-        item_scores = {}
+        batches = [property_items[start:start + batch_size] for start in range(0, len(property_items), batch_size)]
+        batch_results = await asyncio.gather(
+            *(self._score_items_batch(batch, property_name, industry_name, company_context) for batch in batches),
+            return_exceptions=True
+        )
         
-        for batch_start in range(0, len(property_items), batch_size):
-            batch_items = property_items[batch_start:batch_start + batch_size]
-            
-            try:
-                # Add delay between batches to avoid rate limiting
-                if batch_start > 0:
-                    await asyncio.sleep(2.0)  # 2 second delay between batches to avoid 429 errors
-                
-                # Score batch of items together
-                batch_scores = await self._score_items_batch(
-                    batch_items, property_name, industry_name, company_context
-                )
-                item_scores.update(batch_scores)
-                
-            except Exception as e:
-                logger.warning(f"Error scoring batch starting at {batch_start}: {e}")
+        item_scores = {}
+        for batch_items, batch_scores in zip(batches, batch_results):
+            if isinstance(batch_scores, BaseException):
+                logger.warning(f"Error scoring batch starting with '{batch_items[0]}': {batch_scores}")
                 # Fallback to rule-based scoring for this batch
                 for item in batch_items:
                     item_scores[item] = self._rule_based_score(item, property_name)
-                # Add delay even on error
-                await asyncio.sleep(0.5)
+            else:
+                item_scores.update(batch_scores)
         
         # Calculate overall property score (weighted average)
         property_score = sum(item_scores.values()) / len(item_scores) if item_scores else 0
@@ -95,6 +102,27 @@ class FrameworkRelevanceScorer:
             "scored_items": len(item_scores)
         }
     
+    async def score_properties(self, properties: Dict[str, List[str]], industry_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Score several framework properties concurrently
+        
+        Returns: Dict mapping property name -> score_property_relevance() result
+        (or {"property_score": 0, "error": ...} if scoring the property failed)
+        """
+        names = [name for name, items in properties.items() if items]
+        results = await asyncio.gather(
+            *(self.score_property_relevance(name, properties[name], industry_name) for name in names),
+            return_exceptions=True
+        )
+        scored = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Error scoring property '{name}': {result}")
+                scored[name] = {"property_score": 0, "error": str(result)}
+            else:
+                scored[name] = result
+        return scored
+    
     async def _score_items_batch(self, items: List[str], property_name: str, 
                                   industry_name: str, company_context: str) -> Dict[str, float]:
         """
@@ -138,7 +166,7 @@ Return JSON only, no explanation."""
             estimated_tokens = 200 + (len(items) * 100)
             max_tokens_for_batch = min(CHATGPT_MAX_TOKENS, max(2000, estimated_tokens))
             
-            response = await chatgpt_generate(
+            response = await generate_with_backoff(
                 prompt, 
                 temperature=0.2,
                 max_tokens=max_tokens_for_batch
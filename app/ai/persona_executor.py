@@ -0,0 +1,209 @@
+"""
+Persona Job Executor
+Bounded worker pool for background persona generation.
+
+A fixed number of worker threads each run one long-lived event loop, so pooled HTTP
+clients (app/ai/http_clients.py) are reused across jobs and the process-wide LLM scheduler
+sees a bounded number of concurrent generations. Jobs wait in per-user queues that are
+served round-robin, so one user submitting several jobs cannot hold back everyone else.
+Queued jobs can be cancelled before they start; running jobs are cancelled through their
+event loop (the job coroutine sees asyncio.CancelledError).
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+from collections import deque, OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+# Import executor configuration
+try:
+    from app.config import PERSONA_EXECUTOR_WORKERS, PERSONA_EXECUTOR_MAX_QUEUED
+except ImportError:
+    # Fallback values if config import fails
+    PERSONA_EXECUTOR_WORKERS = 4
+    PERSONA_EXECUTOR_MAX_QUEUED = 50
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+class _Job:
+    """A submitted job and, once running, the loop and task executing it"""
+
+    def __init__(self, job_id: str, user_id: str, factory: JobFactory):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.factory = factory
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+
+class PersonaJobExecutor:
+    """Fixed pool of event-loop workers fed by per-user round-robin queues"""
+
+    def __init__(self, max_workers: int = PERSONA_EXECUTOR_WORKERS, max_queued: int = PERSONA_EXECUTOR_MAX_QUEUED):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()  # user -> queued jobs, in round-robin order
+        self._queued = 0
+        self._running: Dict[str, _Job] = {}
+        self._workers: list = []
+        self._shutdown = False
+
+    def submit(self, job_id: str, user_id: str, factory: JobFactory) -> bool:
+        """
+        Queue a job. `factory` is called on a worker loop and must return the coroutine to run.
+
+        Returns:
+            False if the executor is shut down or the queue is full (backpressure), True otherwise
+        """
+        with self._cond:
+            if self._shutdown:
+                logger.warning(f"[persona_executor] Rejected job {job_id}: executor is shut down")
+                return False
+            idle_workers = self.max_workers - len(self._running)
+            if self._queued >= self.max_queued + idle_workers:
+                logger.warning(f"[persona_executor] Rejected job {job_id}: {self._queued} jobs already queued")
+                return False
+            self._queues.setdefault(user_id, deque()).append(_Job(job_id, user_id, factory))
+            self._queued += 1
+            self._start_workers()
+            self._cond.notify()
+        logger.info(f"[persona_executor] Queued job {job_id} for user {user_id}")
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if the job is unknown or already finished."""
+        with self._cond:
+            for user_id, queue in self._queues.items():
+                for job in queue:
+                    if job.job_id == job_id:
+                        queue.remove(job)
+                        self._queued -= 1
+                        if not queue:
+                            del self._queues[user_id]
+                        logger.info(f"[persona_executor] Cancelled queued job {job_id}")
+                        return True
+            job = self._running.get(job_id)
+            if job is None:
+                return False
+            job.cancelled = True
+            if job.loop is not None and job.task is not None:
+                job.loop.call_soon_threadsafe(job.task.cancel)
+        logger.info(f"[persona_executor] Cancelling running job {job_id}")
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = 30.0, cancel_running: bool = False):
+        """Stop accepting jobs and drop queued ones; running jobs finish (or are cancelled)."""
+        with self._cond:
+            self._shutdown = True
+            dropped = self._queued
+            self._queues.clear()
+            self._queued = 0
+            running = list(self._running)
+            self._cond.notify_all()
+        if dropped:
+            logger.warning(f"[persona_executor] Shutdown dropped {dropped} queued jobs")
+        if cancel_running:
+            for job_id in running:
+                self.cancel(job_id)
+        if wait:
+            for worker in self._workers:
+                worker.join(timeout)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue and worker state for monitoring"""
+        with self._cond:
+            return {
+                "workers": len(self._workers),
+                "max_workers": self.max_workers,
+                "running": len(self._running),
+                "queued": self._queued,
+                "queued_users": len(self._queues),
+            }
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """0 if the job is running, its 1-based position in the queue if waiting, None if unknown"""
+        with self._cond:
+            if job_id in self._running:
+                return 0
+            position = 0
+            for job in self._round_robin_order():
+                position += 1
+                if job.job_id == job_id:
+                    return position
+            return None
+
+    def _round_robin_order(self):
+        """Queued jobs in the order workers will take them"""
+        queues = [list(queue) for queue in self._queues.values()]
+        for depth in range(max((len(q) for q in queues), default=0)):
+            for queue in queues:
+                if depth < len(queue):
+                    yield queue[depth]
+
+    def _start_workers(self):
+        # Called with the condition held; workers are started lazily, up to max_workers
+        busy = len(self._running) + self._queued
+        while len(self._workers) < min(self.max_workers, busy):
+            worker = threading.Thread(target=self._worker, name=f"persona-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Optional[_Job]:
+        with self._cond:
+            while not self._queued and not self._shutdown:
+                self._cond.wait()
+            if self._shutdown:
+                return None
+            # Take the head of the first user's queue, then move that user to the back
+            user_id, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+            self._running[job.job_id] = job
+            return job
+
+    def _worker(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                try:
+                    job.loop = loop
+                    job.task = loop.create_task(job.factory())
+                    if job.cancelled:
+                        job.task.cancel()
+                    loop.run_until_complete(job.task)
+                    logger.info(f"[persona_executor] Job {job.job_id} finished")
+                except asyncio.CancelledError:
+                    logger.info(f"[persona_executor] Job {job.job_id} was cancelled")
+                except Exception as e:
+                    logger.error(f"[persona_executor] Job {job.job_id} failed: {e}", exc_info=True)
+                finally:
+                    with self._cond:
+                        self._running.pop(job.job_id, None)
+        finally:
+            try:
+                from app.ai.http_clients import close_http_clients
+                loop.run_until_complete(close_http_clients())
+            except Exception as e:
+                logger.warning(f"[persona_executor] Error closing HTTP clients of {threading.current_thread().name}: {e}")
+            finally:
+                loop.close()
+
+
+# Global instance for easy access
+persona_executor = PersonaJobExecutor()
+atexit.register(persona_executor.shutdown, wait=False)
@@ -392,6 +392,10 @@ async def run_persona_generation_background(task_id: str, website: str, user_id:
     """
     from app.database import update_background_task, get_background_task
     from app.utils.spinner.persona_generation_spinner import PersonaGenerationProgress
+    from app.ai.llm_scheduler import set_llm_request_context, PRIORITY_BACKGROUND
+    
+    # All LLM calls of this task yield to interactive calls and share quota fairly with other users
+    set_llm_request_context(PRIORITY_BACKGROUND, user_id)
     
     try:
         ai_logger.info(f"[Background Task {task_id}] Starting persona generation for {website}")
@@ -556,9 +560,14 @@ async def run_persona_generation_background(task_id: str, website: str, user_id:
                 ai_logger.warning(f"[Background Task {task_id}] Error updating failure status: {e}")
             ai_logger.error(f"[Background Task {task_id}] Persona generation failed: {error_msg}")
             
+    except asyncio.CancelledError:
+        # Cancelled through the persona executor ("Clear Tasks")
+        ai_logger.info(f"[Background Task {task_id}] Cancelled")
+        await update_background_task(task_id, status="cancelled")
+        raise
     except Exception as e:
         ai_logger.error(f"[Background Task {task_id}] Exception during background persona generation: {e}", exc_info=True)
         await update_background_task(task_id,
             status="failed",
             error_message=f"Exception: {str(e)}"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,355 @@
+"""
+Pipeline DAG Executor
+Runs a workflow defined as a dependency graph: every node declares the context keys
+it reads ("inputs") and writes ("outputs"), and nodes whose dependencies are satisfied
+run concurrently under global and per-provider concurrency limits.
+
+Nodes may also start speculatively, before a slow producer of one of their inputs (typically
+a validation) has finished, using a provisional value derived from that producer's own input.
+The speculative result is kept if the producer's verdict confirms it (optionally reconciled
+with the real value), otherwise the node is rolled back (cancelled or discarded) and re-run
+with the real value.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional
+
+# Import pipeline concurrency configuration
+try:
+    from app.config import (
+        PERSONA_PIPELINE_MAX_CONCURRENCY, PERSONA_PIPELINE_PROVIDER_LIMITS, PERSONA_PIPELINE_SPECULATION
+    )
+except ImportError:
+    # Fallback values if config import fails
+    PERSONA_PIPELINE_MAX_CONCURRENCY = 4
+    PERSONA_PIPELINE_PROVIDER_LIMITS = {"sonar": 2, "gemini": 2, "chatgpt": 2}
+    PERSONA_PIPELINE_SPECULATION = True
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineAbort(Exception):
+    """Raised by a node to stop the whole pipeline early with a final result (hard stop)."""
+
+    def __init__(self, result: Any, reason: str = ""):
+        super().__init__(reason or "Pipeline aborted")
+        self.result = result
+        self.reason = reason
+
+
+class DAGExecutor:
+    """
+    Executes a pipeline defined as a list of node dictionaries:
+
+        {
+            "name": "market_intelligence",         # unique node name
+            "func": coroutine_function,            # called with the declared inputs as kwargs
+            "inputs": ["validated_analysis"],      # context keys this node reads
+            "outputs": ["market_intelligence"],    # keys of the dict the node returns
+            "after": ["identity_gate"],            # optional ordering-only dependencies
+            "providers": ["gemini", "chatgpt"],    # optional, for per-provider limits
+            "progress_step": 3,                    # optional progress_tracker step index
+            "speculate": {                         # optional, inputs that may be guessed
+                "validated_intelligence": {
+                    "from": "raw_intelligence",    # available before the real value
+                    "provisional": func,           # raw value -> provisional input value
+                    "confirm": func,               # context -> True if the real value keeps the result
+                    "reconcile": func              # optional: (result, context) -> kept result
+                }
+            }
+        }
+
+    Dependencies are derived from inputs/outputs, so the definition order does not matter
+    except as a tie-breaker when several nodes become ready at once.
+    """
+
+    def __init__(self, nodes: List[Dict[str, Any]], max_concurrency: Optional[int] = None,
+                 provider_limits: Optional[Dict[str, int]] = None, progress_tracker=None,
+                 pipeline_logger: Optional[logging.Logger] = None, speculation: Optional[bool] = None):
+        self.nodes = {node["name"]: node for node in nodes}
+        self.order = [node["name"] for node in nodes]
+        self.progress_tracker = progress_tracker
+        self.log = pipeline_logger or logger
+        self.max_concurrency = max_concurrency or PERSONA_PIPELINE_MAX_CONCURRENCY
+        limits = provider_limits if provider_limits is not None else PERSONA_PIPELINE_PROVIDER_LIMITS
+        self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._provider_semaphores = {name: asyncio.Semaphore(limit) for name, limit in limits.items() if limit}
+        self._last_progress_step = -1
+        self._progress_lock = asyncio.Lock()
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._run_start = 0.0
+        self._run_end = 0.0
+        self.speculation = PERSONA_PIPELINE_SPECULATION if speculation is None else speculation
+        self.speculation_stats = {"started": 0, "confirmed": 0, "rolled_back": 0}
+
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Pipeline node names must be unique")
+        self.producers: Dict[str, str] = {}
+        for name in self.order:
+            for key in self.nodes[name].get("outputs", []):
+                if key in self.producers:
+                    raise ValueError(f"Context key '{key}' is produced by both '{self.producers[key]}' and '{name}'")
+                self.producers[key] = name
+        self.dependencies = {name: self._node_dependencies(name) for name in self.order}
+        self._check_acyclic()
+        for name in self.order:
+            for key, spec in self.nodes[name].get("speculate", {}).items():
+                if key not in self.nodes[name].get("inputs", []) or spec.get("from") not in self.producers:
+                    raise ValueError(f"Node '{name}' speculates on '{key}' without a produced 'from' key")
+
+    def _node_dependencies(self, name: str) -> List[str]:
+        node = self.nodes[name]
+        deps = [self.producers[key] for key in node.get("inputs", []) if key in self.producers]
+        for dep in node.get("after", []):
+            if dep not in self.nodes:
+                raise ValueError(f"Node '{name}' depends on unknown node '{dep}'")
+            deps.append(dep)
+        return list(dict.fromkeys(deps))
+
+    def _check_acyclic(self):
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle at node '{name}'")
+            visiting.add(name)
+            for dep in self.dependencies[name]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.order:
+            visit(name)
+
+    async def _report_progress(self, step: Optional[int]):
+        """Forward step starts to the progress tracker, never moving backwards."""
+        if step is None or not self.progress_tracker:
+            return
+        async with self._progress_lock:
+            if step <= self._last_progress_step:
+                return
+            self._last_progress_step = step
+        await self.progress_tracker.start_step(step)
+
+    async def _run_node(self, name: str, context: Dict[str, Any],
+                        overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        node = self.nodes[name]
+        semaphores = [self._provider_semaphores[p] for p in sorted(node.get("providers", [])) if p in self._provider_semaphores]
+        async with self._global_semaphore:
+            # Acquire provider slots in a fixed (sorted) order to avoid deadlocks
+            for semaphore in semaphores:
+                await semaphore.acquire()
+            try:
+                await self._report_progress(node.get("progress_step"))
+                kwargs = {key: context[key] for key in node.get("inputs", []) if key not in (overrides or {})}
+                kwargs.update(overrides or {})
+                started = time.time()
+                # A rolled-back speculative run must not overwrite the timing of the re-run
+                timing = self.timings[name] = {"start": started - self._run_start}
+                if overrides:
+                    timing["speculative"] = 1.0
+                try:
+                    result = await node["func"](**kwargs)
+                finally:
+                    finished = time.time()
+                    timing["end"] = finished - self._run_start
+                    timing["duration"] = finished - started
+            finally:
+                for semaphore in reversed(semaphores):
+                    semaphore.release()
+
+        result = result or {}
+        missing = [key for key in node.get("outputs", []) if key not in result]
+        if missing:
+            raise ValueError(f"Pipeline node '{name}' did not produce declared outputs: {missing}")
+        return result
+
+    def _speculation_ready(self, name: str, context: Dict[str, Any], done: set) -> Optional[List[str]]:
+        """Producers the node can run ahead of, or None if it cannot start speculatively yet."""
+        speculate = self.nodes[name].get("speculate") if self.speculation else None
+        if not speculate:
+            return None
+        awaited = {self.producers[key] for key in speculate if key in self.producers}
+        awaited -= done
+        if not awaited:
+            return None
+        if any(dep not in done for dep in self.dependencies[name] if dep not in awaited):
+            return None
+        if any(spec["from"] not in context for spec in speculate.values()):
+            return None
+        return sorted(awaited)
+
+    def _start_speculation(self, name: str, context: Dict[str, Any], awaited: List[str]) -> asyncio.Task:
+        speculate = self.nodes[name]["speculate"]
+        overrides = {key: spec["provisional"](context[spec["from"]])
+                     for key, spec in speculate.items() if self.producers.get(key) in awaited}
+        self.speculation_stats["started"] += 1
+        self.log.info(f"[Pipeline] Starting '{name}' speculatively ahead of {', '.join(awaited)}")
+        return asyncio.ensure_future(self._run_node(name, context, overrides))
+
+    def _reconcile(self, name: str, producers: set, result: Dict[str, Any],
+                   context: Dict[str, Any]) -> Dict[str, Any]:
+        """Bring a confirmed speculative result in line with the real values it was guessed for."""
+        for key, spec in self.nodes[name]["speculate"].items():
+            if "reconcile" in spec and self.producers.get(key) in producers:
+                result = spec["reconcile"](result, context)
+        return result
+
+    def _confirms(self, name: str, producer: str, context: Dict[str, Any]) -> bool:
+        """Whether the producer's real outputs keep the speculative run of `name`."""
+        for key, spec in self.nodes[name]["speculate"].items():
+            if self.producers.get(key) == producer:
+                try:
+                    if not spec["confirm"](context):
+                        return False
+                except Exception as e:
+                    logger.warning(f"[Pipeline] Could not confirm speculation of '{name}' on '{key}': {e}")
+                    return False
+        return True
+
+    async def run(self, initial_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute all nodes respecting their dependencies.
+
+        Args:
+            initial_context: Keys available before any node runs
+
+        Returns:
+            The context dictionary with the outputs of every node.
+
+        Raises:
+            PipelineAbort: if a node requested a hard stop (remaining nodes are cancelled)
+        """
+        context: Dict[str, Any] = dict(initial_context or {})
+        self._run_start = time.time()
+        done: set = set()
+        running: Dict[asyncio.Task, str] = {}
+        pending = list(self.order)
+        speculating: Dict[str, set] = {}  # node -> producers whose verdict is still outstanding
+        spec_tasks: Dict[str, asyncio.Task] = {}
+        parked: Dict[str, asyncio.Task] = {}  # finished speculative runs awaiting confirmation
+        speculated_on: Dict[str, set] = {}  # node -> producers its speculative run was started ahead of
+        confirmed: Dict[str, set] = {}  # speculative runs kept by every verdict, reconciled on completion
+
+        def complete(name: str, task: asyncio.Task):
+            result = task.result()  # re-raises node exceptions / PipelineAbort
+            if name in confirmed:
+                result = self._reconcile(name, confirmed.pop(name), result, context)
+            context.update(result)
+            done.add(name)
+            for spec_name, awaited in list(speculating.items()):
+                if spec_name not in speculating or name not in awaited:
+                    continue
+                if not self._confirms(spec_name, name, context):
+                    # Blocking verdict: throw the speculative run away and run again on the real value
+                    del speculating[spec_name]
+                    spec_task = spec_tasks.pop(spec_name)
+                    speculated_on.pop(spec_name, None)
+                    parked.pop(spec_name, None)
+                    running.pop(spec_task, None)
+                    if spec_task.done() and not spec_task.cancelled():
+                        spec_task.exception()  # a failed speculative run is irrelevant now
+                    spec_task.cancel()
+                    pending.insert(0, spec_name)
+                    self.speculation_stats["rolled_back"] += 1
+                    self.log.info(f"[Pipeline] Rolled back speculative '{spec_name}' after verdict of '{name}'")
+                    continue
+                awaited.discard(name)
+                if not awaited:
+                    del speculating[spec_name]
+                    spec_tasks.pop(spec_name)
+                    confirmed[spec_name] = speculated_on.pop(spec_name)
+                    self.speculation_stats["confirmed"] += 1
+                    self.log.info(f"[Pipeline] Speculative '{spec_name}' confirmed by '{name}'")
+                    if spec_name in parked:
+                        complete(spec_name, parked.pop(spec_name))
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    if all(dep in done for dep in self.dependencies[name]):
+                        pending.remove(name)
+                        running[asyncio.ensure_future(self._run_node(name, context))] = name
+                        continue
+                    awaited = self._speculation_ready(name, context, done)
+                    if awaited:
+                        pending.remove(name)
+                        task = self._start_speculation(name, context, awaited)
+                        speculating[name] = set(awaited)
+                        speculated_on[name] = set(awaited)
+                        spec_tasks[name] = task
+                        running[task] = name
+
+                if not running:
+                    raise RuntimeError(f"Pipeline stalled with unresolved nodes: {pending}")
+
+                finished, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task, None)
+                    if name is None:
+                        continue  # rolled back by a verdict in this same batch
+                    if name in speculating:
+                        parked[name] = task
+                    else:
+                        complete(name, task)
+        finally:
+            leftovers = list(running) + list(parked.values())
+            for task in leftovers:
+                task.cancel()
+            if leftovers:
+                await asyncio.gather(*leftovers, return_exceptions=True)
+            self._run_end = time.time()
+
+        return context
+
+    def get_timing_report(self) -> Dict[str, Any]:
+        """
+        Build a timing report including the critical path (the chain of dependencies
+        that determined the end-to-end latency).
+        """
+        wall_time = max(self._run_end - self._run_start, 0.0)
+        completed = {name: t for name, t in self.timings.items() if "end" in t}
+        serial_time = sum(t["duration"] for t in completed.values())
+
+        critical_path = []
+        current = max(completed, key=lambda n: completed[n]["end"]) if completed else None
+        while current:
+            timing = completed[current]
+            critical_path.append({
+                "node": current,
+                "start": round(timing["start"], 3),
+                "end": round(timing["end"], 3),
+                "duration": round(timing["duration"], 3),
+            })
+            finished_deps = [dep for dep in self.dependencies[current] if dep in completed]
+            current = max(finished_deps, key=lambda n: completed[n]["end"]) if finished_deps else None
+        critical_path.reverse()
+
+        return {
+            "wall_time": round(wall_time, 3),
+            "serial_time": round(serial_time, 3),
+            "parallel_speedup": round(serial_time / wall_time, 2) if wall_time > 0 else 1.0,
+            "critical_path": critical_path,
+            "critical_path_time": round(sum(step["duration"] for step in critical_path), 3),
+            "speculation": dict(self.speculation_stats),
+            "nodes": {
+                name: {key: round(value, 3) for key, value in timing.items()}
+                for name, timing in completed.items()
+            },
+        }
+
+    def log_timing_report(self, report: Optional[Dict[str, Any]] = None):
+        """Write the timing report to the pipeline logger."""
+        report = report or self.get_timing_report()
+        self.log.info("Pipeline Timing Report:")
+        self.log.info(f"  Wall Time: {report['wall_time']:.2f}s, Serial Time: {report['serial_time']:.2f}s, Speedup: {report['parallel_speedup']:.2f}x")
+        speculation = report.get("speculation", {})
+        if speculation.get("started"):
+            self.log.info(f"  Speculative Steps: {speculation['started']} started, {speculation['confirmed']} confirmed, {speculation['rolled_back']} rolled back")
+        self.log.info(f"  Critical Path ({report['critical_path_time']:.2f}s):")
+        for step in report["critical_path"]:
+            self.log.info(f"    {step['node']}: {step['duration']:.2f}s (t={step['start']:.2f}s → {step['end']:.2f}s)")
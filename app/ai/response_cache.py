@@ -0,0 +1,204 @@
+"""
+LLM Response Cache
+Persistent, content-addressed cache for Gemini, ChatGPT and Sonar responses.
+Since all providers run with deterministic settings (temperature 0.0, seed 42),
+identical requests can be served from disk instead of paying for another round trip.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+# Import cache configuration
+try:
+    from app.config import (
+        LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+    )
+except ImportError:
+    # Fallback values if config import fails
+    LLM_CACHE_ENABLED = True
+    LLM_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'cache', 'llm_responses.sqlite3')
+    LLM_CACHE_TTL = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES = 5000
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """On-disk LLM response cache with TTL expiry, LRU eviction and hit/miss counters"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, enabled: bool = LLM_CACHE_ENABLED):
+        """
+        Initialize the response cache
+
+        Args:
+            path: SQLite file used to persist cached responses
+            ttl: Seconds after which an entry is considered stale
+            max_entries: Maximum number of entries kept before LRU eviction
+            enabled: Global switch; when False every lookup is a miss and nothing is stored
+        """
+        self.path = os.path.abspath(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "bypassed": 0, "errors": 0}
+        self._provider_stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, config: Optional[Dict[str, Any]] = None) -> str:
+        """Build a content hash from everything that determines the response."""
+        material = json.dumps(
+            {"provider": provider, "model": model, "prompt": prompt, "config": config or {}},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite store lazily (caller must hold the lock)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT, "
+                "created_at REAL, last_access REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _count(self, provider: str, counter: str):
+        self._stats[counter] += 1
+        provider_stats = self._provider_stats.setdefault(provider, {"hits": 0, "misses": 0, "writes": 0})
+        if counter in provider_stats:
+            provider_stats[counter] += 1
+
+    def get(self, key: str, provider: str = "unknown") -> Optional[str]:
+        """Return the cached response for key, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._count(provider, "misses")
+                    return None
+                response, created_at = row
+                if self.ttl and now - created_at > self.ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    self._count(provider, "misses")
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+                self._count(provider, "hits")
+                return response
+            except Exception as e:
+                # A broken cache must never break an AI call - treat as a miss
+                self._stats["errors"] += 1
+                logger.warning(f"[LLMResponseCache] Lookup failed, treating as miss: {e}")
+                return None
+
+    def set(self, key: str, response: str, provider: str = "unknown", model: str = ""):
+        """Store a successful response and evict least-recently-used entries beyond max_entries."""
+        if not self.enabled or not isinstance(response, str) or response.startswith("ERROR"):
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, model, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, now, now)
+                )
+                self._count(provider, "writes")
+                if self.max_entries:
+                    (total,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                    overflow = total - self.max_entries
+                    if overflow > 0:
+                        conn.execute(
+                            "DELETE FROM responses WHERE key IN "
+                            "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                            (overflow,)
+                        )
+                        self._stats["evictions"] += overflow
+                conn.commit()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[LLMResponseCache] Failed to store response: {e}")
+
+    def record_bypass(self):
+        """Count a call that explicitly skipped the cache."""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def purge_expired(self) -> int:
+        """Delete all entries older than the TTL. Returns number of deleted entries."""
+        if not self.ttl:
+            return 0
+        with self._lock:
+            try:
+                conn = self._connect()
+                cursor = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+                conn.commit()
+                return cursor.rowcount
+            except Exception as e:
+                logger.warning(f"[LLMResponseCache] Failed to purge expired entries: {e}")
+                return 0
+
+    def clear(self, provider: Optional[str] = None):
+        """Remove all cached responses (optionally only for one provider)."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                if provider:
+                    conn.execute("DELETE FROM responses WHERE provider = ?", (provider,))
+                else:
+                    conn.execute("DELETE FROM responses")
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"[LLMResponseCache] Failed to clear cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["providers"] = {name: dict(counters) for name, counters in self._provider_stats.items()}
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["enabled"] = self.enabled
+            stats["max_entries"] = self.max_entries
+            stats["ttl"] = self.ttl
+            try:
+                (stats["entries"],) = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()
+            except Exception:
+                stats["entries"] = None
+            return stats
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global instance shared by all provider clients
+response_cache = LLMResponseCache()
+
+def get_response_cache() -> LLMResponseCache:
+    """Get the global LLM response cache instance"""
+    return response_cache
@@ -8,11 +8,14 @@ from .company_profile_validator import CompanyProfileValidator
 from .relevance_validator import RelevanceValidator
 from .domain_validator import DomainValidator
 from .quality_gates import QualityGates
+from .validation_cache import ValidationCache, validation_cache
 
 __all__ = [
     'SonarClient',
     'CompanyProfileValidator', 
     'RelevanceValidator',
     'DomainValidator',
-    'QualityGates'
+    'QualityGates',
+    'ValidationCache',
+    'validation_cache'
 ] 
\ No newline at end of file
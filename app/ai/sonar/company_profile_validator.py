@@ -6,6 +6,7 @@ Integrates with our company profile to validate relevance of target websites.
 import logging
 from typing import Dict, List, Any, Optional
 from .sonar_client import sonar_client
+from .validation_cache import validation_cache, profile_version
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +64,12 @@ class CompanyProfileValidator:
             logger.error(f"[CompanyProfileValidator] Error loading company profile: {e}")
             return {}
     
+    def get_profile_version(self, refresh: bool = False) -> str:
+        """Version of the loaded company profile; cached validations of another version are stale"""
+        if refresh:
+            self._refresh_profile()
+        return profile_version(self.company_profile)
+    
     def _validate_profile_completeness(self) -> bool:
         """Validate that company profile has minimum required fields for validation"""
         required_fields = ["company_name", "core_business", "target_customers", "industries_served"]
@@ -112,6 +119,12 @@ class CompanyProfileValidator:
                 "recommended_action": "skip"
             }
         
+        version = self.get_profile_version()
+        cached = validation_cache.get("profile_relevance", website_url, version, website_content)
+        if cached is not None:
+            logger.info(f"[PID {pid}] [CompanyProfileValidator] Using cached relevance for: {website_url}")
+            return cached
+        
         try:
             # Extract target domain for search filtering
             target_domain = self._extract_domain_from_url(website_url)
@@ -135,6 +148,7 @@ class CompanyProfileValidator:
             # Add domain filtering metadata
             validation_result["target_domain"] = target_domain
             validation_result["search_filtered"] = True
+            validation_cache.set("profile_relevance", website_url, validation_result, version, website_content)
             
             logger.info(f"[PID {pid}] [CompanyProfileValidator] Relevance validation complete: {validation_result.get('is_relevant', False)}")
             return validation_result
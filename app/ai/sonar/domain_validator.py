@@ -6,6 +6,7 @@ Validates domain ownership and prevents website↔company misinterpretations.
 import logging
 from typing import Dict, List, Any, Optional
 from .sonar_client import sonar_client
+from .validation_cache import validation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +30,17 @@ class DomainValidator:
         """
         logger.info(f"[PID {pid}] [DomainValidator] Validating domain ownership for: {website_url}")
         
+        # Who owns a domain does not depend on our company profile
+        cached = validation_cache.get("domain_ownership", website_url, website_content=website_content)
+        if cached is not None:
+            logger.info(f"[PID {pid}] [DomainValidator] Using cached domain owner: {cached.get('actual_company_name', 'Unknown')}")
+            return cached
+        
         try:
             prompt = self._build_domain_ownership_prompt(website_url, website_content)
             response = await sonar_client.generate_response(prompt, pid=pid)
             result = self._parse_domain_response(response, pid)
+            validation_cache.set("domain_ownership", website_url, result, website_content=website_content)
             
             logger.info(f"[PID {pid}] [DomainValidator] Domain validation complete - Owner: {result.get('actual_company_name', 'Unknown')}")
             return result
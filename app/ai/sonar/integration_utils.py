@@ -8,6 +8,20 @@ from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Correction field of each validation type; corrections change the validated data itself
+CORRECTIONS_FIELDS = {
+    "market_intelligence": "market_corrections",
+    "value_alignment": "value_corrections",
+    "creative_elements": "creative_corrections",
+}
+
+# Additive fields each merge_validated_* copies into its result, by validation type
+FINDINGS_FIELDS = {
+    "market_intelligence": ["verified_market_data", "additional_market_insights", "validation_notes"],
+    "value_alignment": ["verified_value_insights", "additional_opportunities", "validation_notes"],
+    "creative_elements": ["validated_elements", "enhanced_insights", "validation_notes"],
+}
+
 class SonarIntegrationUtils:
     """Utilities for integrating Sonar validation with existing analyses"""
     
@@ -188,6 +202,30 @@ class SonarIntegrationUtils:
         
         return enhanced_persona
     
+    @staticmethod
+    def is_non_blocking_validation(sonar_validation: Dict, validation_type: str) -> bool:
+        """
+        Check whether a validation leaves the data it validated unchanged: it passed without
+        error and has no corrections. Scores, notes and additional insights are not blocking.
+        """
+        if not isinstance(sonar_validation, dict) or "error" in sonar_validation:
+            return False
+        if not sonar_validation.get("validation_passed", True):
+            return False
+        return not sonar_validation.get(CORRECTIONS_FIELDS[validation_type])
+    
+    @staticmethod
+    def validation_findings(sonar_validation: Dict, validation_type: str) -> Dict[str, Any]:
+        """Scores and additive findings of a validation (what the merge adds besides corrections)."""
+        findings = {
+            "overall_confidence": sonar_validation.get("overall_confidence", 5),
+            "validation_passed": sonar_validation.get("validation_passed", True),
+        }
+        for field in FINDINGS_FIELDS[validation_type]:
+            if sonar_validation.get(field):
+                findings[field] = sonar_validation[field]
+        return findings
+    
     @staticmethod
     def _apply_sonar_corrections(enhanced_analysis: Dict, sonar_validation: Dict, pid: int) -> Dict[str, Any]:
         """Apply Sonar corrections to website analysis"""
@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional
 from .sonar_client import sonar_client
 from .relevance_validator import RelevanceValidator
 from .domain_validator import DomainValidator
+from .validation_cache import validation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,13 @@ class QualityGates:
         logger.info(f"[PID {pid}] [QualityGates] Step 0: Relevance validation for: {website_url}")
         
         try:
+            # Reload the profile so results validated against an older profile are not reused
+            version = self.relevance_validator.company_validator.get_profile_version(refresh=True)
+            cached = validation_cache.get("relevance", website_url, version, website_content)
+            if cached is not None:
+                logger.info(f"[PID {pid}] [QualityGates] Step 0 served from cache - Action: {cached.get('recommended_action', 'unknown')}")
+                return cached
+            
             # Check if Sonar is available
             if not await sonar_client.is_available():
                 logger.warning(f"[PID {pid}] [QualityGates] Sonar not available, skipping relevance validation")
@@ -52,6 +60,10 @@ class QualityGates:
             # Add quality gate metadata
             relevance_result["quality_gate"] = "step_0_relevance"
             relevance_result["sonar_available"] = True
+            # Results degraded by a failed industry or product check are not reused
+            sub_checks = (relevance_result.get("industry_alignment"), relevance_result.get("product_relevance"))
+            if not any(isinstance(check, dict) and check.get("error") for check in sub_checks):
+                validation_cache.set("relevance", website_url, relevance_result, version, website_content)
             
             logger.info(f"[PID {pid}] [QualityGates] Step 0 complete - Action: {relevance_result.get('recommended_action', 'unknown')}")
             return relevance_result
@@ -11,6 +11,9 @@ import httpx
 import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from app.ai.response_cache import response_cache
+from app.ai.http_clients import get_http_client
+from app.ai.llm_scheduler import llm_scheduler, estimate_tokens
 
 # Import deterministic configuration
 try:
@@ -78,9 +81,11 @@ class SonarClient:
     
     async def generate_response(self, prompt: str, temperature: Optional[float] = None, 
                                max_tokens: Optional[int] = None, pid: int = 0,
-                               search_domain_filter: Optional[List[str]] = None) -> str:
+                               search_domain_filter: Optional[List[str]] = None,
+                               use_cache: bool = True) -> str:
         """
         Generate response using Sonar with deterministic configuration.
+        Successful responses are served from / stored in the shared LLM response cache.
         
         Args:
             prompt: The input prompt
@@ -88,6 +93,7 @@ class SonarClient:
             max_tokens: Override max tokens (uses config default if None)
             pid: Process ID for logging
             search_domain_filter: List of domains to filter search results (Perplexity API)
+            use_cache: Set to False to bypass the response cache for this call
             
         Returns:
             Sonar response text or error message
@@ -124,6 +130,18 @@ class SonarClient:
                 payload["search_domain_filter"] = search_domain_filter
                 sonar_logger.info(f"[PID {pid}] [SonarClient] Domain filter enabled: {search_domain_filter}")
             
+            cache_key = response_cache.make_key(
+                "sonar", self.model, json.dumps(messages, ensure_ascii=False),
+                {k: v for k, v in payload.items() if k not in ("model", "messages")}
+            )
+            if use_cache:
+                cached = response_cache.get(cache_key, provider="sonar")
+                if cached is not None:
+                    sonar_logger.info(f"[PID {pid}] [SonarClient] CACHE_HIT - ResponseLength: {len(cached)} chars")
+                    return cached
+            else:
+                response_cache.record_bypass()
+            
             sonar_logger.info(f"[PID {pid}] [SonarClient] Using Perplexity API" + (" (domain filtering enabled)" if search_domain_filter else ""))
             
             # Make direct HTTP call to Perplexity API
@@ -142,16 +160,16 @@ class SonarClient:
             sonar_logger.debug(f"[PID {pid}] [SonarClient] Request headers: Authorization=Bearer {api_key_preview}, Content-Type=application/json")
             sonar_logger.debug(f"[PID {pid}] [SonarClient] Request payload keys: {list(payload.keys())}")
             
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=httpx.Timeout(30.0, connect=10.0)
-            ) as client:
+            client = get_http_client("sonar")
+            async with llm_scheduler.slot("sonar", estimate_tokens(prompt, max_tokens)) as ticket:
                 response = await client.post(
                     self.base_url,
                     headers=headers,
                     json=payload,
                     timeout=httpx.Timeout(30.0, connect=10.0)
                 )
+            if response.status_code == 429:
+                llm_scheduler.report_rate_limited("sonar", llm_scheduler.parse_retry_after(response.headers))
             
             # Check if the request was successful
             response.raise_for_status()
@@ -178,6 +196,7 @@ class SonarClient:
                         "completion_tokens": usage.get("completion_tokens", 0),
                         "total_tokens": usage.get("total_tokens", 0)
                     }
+                    ticket.record_usage(token_usage["total_tokens"])
                     sonar_logger.info(f"[PID {pid}] [SonarClient] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars, Tokens: {token_usage.get('total_tokens', 0)} (Prompt: {token_usage.get('prompt_tokens', 0)}, Completion: {token_usage.get('completion_tokens', 0)})")
                 else:
                     sonar_logger.info(f"[PID {pid}] [SonarClient] SUCCESS - Duration: {duration:.2f}s, ResponseLength: {len(response_text)} chars")
@@ -186,6 +205,8 @@ class SonarClient:
                 if "citations" in response_data:
                     sonar_logger.info(f"[PID {pid}] [SonarClient] Citations found: {len(response_data['citations'])}")
                 
+                if use_cache:
+                    response_cache.set(cache_key, response_text, provider="sonar", model=self.model)
                 return response_text
             else:
                 sonar_logger.error(f"[PID {pid}] [SonarClient] ERROR - No choices in response")
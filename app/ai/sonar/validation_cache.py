@@ -0,0 +1,189 @@
+"""
+Sonar Validation Cache
+Per-domain store of Sonar validation results (relevance, domain ownership) shared across
+requests and users.
+
+Validation of a prospect's website is a slow, billed web search whose answer rarely changes,
+so results are kept on disk for SONAR_VALIDATION_CACHE_TTL seconds. Results that depend on our
+company profile record the profile version they were computed against and are discarded as soon
+as the profile changes. Failed validations are never stored.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+# Import cache configuration
+try:
+    from app.config import (
+        SONAR_VALIDATION_CACHE_ENABLED, SONAR_VALIDATION_CACHE_PATH, SONAR_VALIDATION_CACHE_TTL
+    )
+except ImportError:
+    # Fallback values if config import fails
+    SONAR_VALIDATION_CACHE_ENABLED = True
+    SONAR_VALIDATION_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'cache', 'sonar_validations.sqlite3')
+    SONAR_VALIDATION_CACHE_TTL = 7 * 24 * 3600
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_domain(website_url: str) -> str:
+    """Lowercase host without 'www.', so all URLs of a website share one cache entry."""
+    url = website_url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    domain = urlparse(url).netloc.lower().split(":")[0]
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def profile_version(profile: Dict[str, Any]) -> str:
+    """Short content hash of the company profile fields that validation prompts are built from."""
+    fields = {
+        name: profile.get(name)
+        for name in ("company_name", "core_business", "target_customers", "industries_served", "products")
+    }
+    material = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class ValidationCache:
+    """On-disk, TTL-bound store of Sonar validation results keyed by (kind, domain, content)"""
+
+    def __init__(self, path: str = SONAR_VALIDATION_CACHE_PATH, ttl: int = SONAR_VALIDATION_CACHE_TTL,
+                 enabled: bool = SONAR_VALIDATION_CACHE_ENABLED):
+        self.path = os.path.abspath(path)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale_profile": 0, "writes": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(kind: str, domain: str, website_content: Optional[str] = None) -> str:
+        """Results computed from supplied website content are kept apart from URL-only ones."""
+        content_hash = hashlib.sha256(website_content.encode("utf-8")).hexdigest() if website_content else ""
+        return hashlib.sha256(f"{kind}\n{domain}\n{content_hash}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite store lazily (caller must hold the lock)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS validations ("
+                "key TEXT PRIMARY KEY, kind TEXT, domain TEXT, profile_version TEXT, "
+                "result TEXT, created_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_validations_domain ON validations(domain)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, kind: str, website_url: str, profile_version: Optional[str] = None,
+            website_content: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Cached result for the website, or None on miss.
+
+        Args:
+            kind: Validation type, e.g. "relevance" or "domain_ownership"
+            website_url: Any URL of the website
+            profile_version: Current company profile version; entries computed against
+                another version are discarded. None for profile-independent validations.
+            website_content: Content the validation was given, if any
+        """
+        if not self.enabled:
+            return None
+        domain = normalize_domain(website_url)
+        key = self.make_key(kind, domain, website_content)
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT result, profile_version, created_at FROM validations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                result, stored_version, created_at = row
+                expired = self.ttl and now - created_at > self.ttl
+                stale = profile_version is not None and stored_version != profile_version
+                if expired or stale:
+                    conn.execute("DELETE FROM validations WHERE key = ?", (key,))
+                    conn.commit()
+                    self._stats["stale_profile" if stale else "misses"] += 1
+                    return None
+                self._stats["hits"] += 1
+            except Exception as e:
+                # A broken cache must never break validation - treat as a miss
+                self._stats["errors"] += 1
+                logger.warning(f"[ValidationCache] Lookup failed, treating as miss: {e}")
+                return None
+
+        cached = json.loads(result)
+        cached["cached"] = True
+        cached["cached_at"] = created_at
+        logger.info(f"[ValidationCache] {kind} hit for {domain} (age {int(now - created_at)}s)")
+        return cached
+
+    def set(self, kind: str, website_url: str, result: Dict[str, Any], profile_version: Optional[str] = None,
+            website_content: Optional[str] = None):
+        """Store a successful validation result (results with an 'error' are skipped)."""
+        if not self.enabled or not isinstance(result, dict) or result.get("error"):
+            return
+        domain = normalize_domain(website_url)
+        stored = {name: value for name, value in result.items() if name not in ("cached", "cached_at")}
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO validations (key, kind, domain, profile_version, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.make_key(kind, domain, website_content), kind, domain, profile_version,
+                     json.dumps(stored, ensure_ascii=False, default=str), time.time())
+                )
+                conn.commit()
+                self._stats["writes"] += 1
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"[ValidationCache] Failed to store {kind} result for {domain}: {e}")
+
+    def invalidate(self, website_url: Optional[str] = None) -> int:
+        """Drop the results of one website (or all). Returns the number of removed entries."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                if website_url:
+                    cursor = conn.execute("DELETE FROM validations WHERE domain = ?", (normalize_domain(website_url),))
+                else:
+                    cursor = conn.execute("DELETE FROM validations")
+                conn.commit()
+                return cursor.rowcount
+            except Exception as e:
+                logger.warning(f"[ValidationCache] Failed to invalidate results: {e}")
+                return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"] + stats["stale_profile"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["enabled"] = self.enabled
+            stats["ttl"] = self.ttl
+            return stats
+
+
+# Global instance shared by all Sonar validators
+validation_cache = ValidationCache()
+
+def get_validation_cache() -> ValidationCache:
+    """Get the global Sonar validation cache instance"""
+    return validation_cache
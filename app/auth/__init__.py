@@ -5,5 +5,6 @@ Provides user management and session handling for the application.
 
 from .user_management import UserManager
 from .session_manager import SessionManager
+from .user_directory import UserDirectory, get_user_directory
 
-__all__ = ["UserManager", "SessionManager"] 
\ No newline at end of file
+__all__ = ["UserManager", "SessionManager", "UserDirectory", "get_user_directory"] 
\ No newline at end of file
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, VectorParams, Distance
+from app.database import PAYLOAD_ONLY_VECTOR, PAYLOAD_ONLY_VECTOR_SIZE, is_collection_verified, mark_collection_verified
 import json
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,9 @@ class ActivityTracker:
         self._ensure_collections()
     
     def _ensure_collections(self):
-        """Ensure activity tracking collections exist."""
+        """Ensure activity tracking collections exist (checked against Qdrant once per process)."""
+        if is_collection_verified(self.activities_collection) and is_collection_verified(self.sessions_collection):
+            return
         try:
             # Check if activities collection exists
             collections = self.client.get_collections()
@@ -32,16 +35,19 @@ class ActivityTracker:
             if self.activities_collection not in collection_names:
                 self.client.create_collection(
                     collection_name=self.activities_collection,
-                    vectors_config=VectorParams(size=128, distance=Distance.COSINE)
+                    vectors_config=VectorParams(size=PAYLOAD_ONLY_VECTOR_SIZE, distance=Distance.COSINE)
                 )
                 logger.info(f"Created collection: {self.activities_collection}")
             
             if self.sessions_collection not in collection_names:
                 self.client.create_collection(
                     collection_name=self.sessions_collection,
-                    vectors_config=VectorParams(size=128, distance=Distance.COSINE)
+                    vectors_config=VectorParams(size=PAYLOAD_ONLY_VECTOR_SIZE, distance=Distance.COSINE)
                 )
                 logger.info(f"Created collection: {self.sessions_collection}")
+            
+            mark_collection_verified(self.activities_collection)
+            mark_collection_verified(self.sessions_collection)
                 
         except Exception as e:
             logger.error(f"Error ensuring activity collections: {e}")
@@ -61,7 +67,7 @@ class ActivityTracker:
                 collection_name=self.activities_collection,
                 points=[PointStruct(
                     id=int(time.time() * 1000) % (2**63),  # Unique timestamp-based ID
-                    vector=[0.0] * 128,  # Dummy vector
+                    vector=PAYLOAD_ONLY_VECTOR,  # Payload-only collection
                     payload=activity_data
                 )]
             )
@@ -91,7 +97,7 @@ class ActivityTracker:
                 collection_name=self.sessions_collection,
                 points=[PointStruct(
                     id=hash(session_id) % (2**63),
-                    vector=[0.0] * 128,
+                    vector=PAYLOAD_ONLY_VECTOR,
                     payload=session_data
                 )]
             )
@@ -127,7 +133,7 @@ class ActivityTracker:
                         collection_name=self.sessions_collection,
                         points=[PointStruct(
                             id=hash(session_id) % (2**63),
-                            vector=[0.0] * 128,
+                            vector=PAYLOAD_ONLY_VECTOR,
                             payload=session_data
                         )]
                     )
@@ -166,7 +172,7 @@ class ActivityTracker:
                         collection_name=self.sessions_collection,
                         points=[PointStruct(
                             id=hash(session_id) % (2**63),
-                            vector=[0.0] * 128,
+                            vector=PAYLOAD_ONLY_VECTOR,
                             payload=session_data
                         )]
                     )
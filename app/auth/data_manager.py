@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
+from app.database import (
+    placeholder_vector, is_collection_verified, mark_collection_verified, invalidate_value_components_cache
+)
 import hashlib
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,9 @@ class DataManager:
         self._ensure_backup_dir()
     
     def _ensure_archive_collection(self):
-        """Ensure archive collection exists."""
+        """Ensure archive collection exists (checked against Qdrant once per process)."""
+        if is_collection_verified(self.archive_collection):
+            return
         try:
             collections = self.client.get_collections()
             collection_names = [col.name for col in collections.collections]
@@ -38,6 +43,8 @@ class DataManager:
                     vectors_config=VectorParams(size=128, distance=Distance.COSINE)
                 )
                 logger.info(f"Created archive collection: {self.archive_collection}")
+            
+            mark_collection_verified(self.archive_collection)
                 
         except Exception as e:
             logger.error(f"Error ensuring archive collection: {e}")
@@ -86,6 +93,8 @@ class DataManager:
                             collection_name=collection_name,
                             points_selector=point_ids  # type: ignore[arg-type]
                         )
+                        if collection_name == "value_components":
+                            invalidate_value_components_cache()
                         cleanup_stats[collection_name.replace("value_waterfall_", "")]["deleted"] = len(point_ids)
                         cleanup_stats["total_space_saved_mb"] += len(point_ids) * 0.1  # Rough estimate
                         
@@ -144,7 +153,7 @@ class DataManager:
                         
                         updated_points.append(PointStruct(
                             id=point.id,
-                            vector=[0.0] * 128,  # Dummy vector
+                            vector=placeholder_vector(collection_name, default_size=128),  # Dummy vector
                             payload=payload
                         ))
                     
@@ -153,6 +162,9 @@ class DataManager:
                             collection_name=collection_name,
                             points=updated_points
                         )
+                        if collection_name == "value_components":
+                            invalidate_value_components_cache(source_user_id)
+                            invalidate_value_components_cache(target_user_id)
                         migration_stats["migrated_items"] += len(updated_points)
                         migration_stats["collections_processed"].append(collection_name)
                         
@@ -266,7 +278,7 @@ class DataManager:
                     for item in data_items:
                         points.append(PointStruct(
                             id=hash(str(item)) % (2**63),  # Generate new ID
-                            vector=[0.0] * 128,
+                            vector=placeholder_vector(collection_name, default_size=128),
                             payload=item
                         ))
                     
@@ -275,6 +287,8 @@ class DataManager:
                             collection_name=collection_name,
                             points=points
                         )
+                        if collection_name == "value_components":
+                            invalidate_value_components_cache()
                         restore_stats["items_restored"] += len(points)
                         restore_stats["collections_restored"] += 1
                         
@@ -348,7 +362,7 @@ class DataManager:
                                 
                                 archive_points.append(PointStruct(
                                     id=hash(f"{user_id}_{collection_name}_{point.id}") % (2**63),
-                                    vector=[0.0] * 128,
+                                    vector=placeholder_vector(self.archive_collection, default_size=128),
                                     payload=payload
                                 ))
                             
@@ -365,6 +379,8 @@ class DataManager:
                                     collection_name=collection_name,
                                     points_selector=point_ids  # type: ignore[arg-type]
                                 )
+                                if collection_name == "value_components":
+                                    invalidate_value_components_cache(user_id)
                                 
                                 logger.info(f"Archived {len(archive_points)} items for user {user_id} from {collection_name}")
                             
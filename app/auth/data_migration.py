@@ -7,6 +7,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.models import Filter, FieldCondition, MatchValue, PointStruct
+from app.database import placeholder_vector, invalidate_value_components_cache
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +67,7 @@ class DataMigration:
                 payload["user_id"] = self.default_user_id
                 
                 # Handle vector field - some points might not have vectors
-                vector: List[float] = [0.0] * 128  # Default vector
+                vector: List[float] = placeholder_vector(collection_name, default_size=128)  # Default vector
                 if hasattr(point, 'vector') and point.vector is not None:
                     if isinstance(point.vector, list) and len(point.vector) > 0:
                         # Ensure it's a flat list of floats
@@ -89,6 +90,8 @@ class DataMigration:
                     collection_name=collection_name,
                     points=points_to_update
                 )
+                if collection_name == "value_components":
+                    invalidate_value_components_cache()
                 logger.info(f"Updated {migrated_count} points in {collection_name}")
             
             return migrated_count
@@ -172,7 +175,7 @@ class DataMigration:
                         del payload["user_id"]
                         
                         # Handle vector field
-                        vector: List[float] = [0.0] * 128  # Default vector
+                        vector: List[float] = placeholder_vector(coll_name, default_size=128)  # Default vector
                         if hasattr(point, 'vector') and point.vector is not None:
                             if isinstance(point.vector, list) and len(point.vector) > 0:
                                 # Ensure it's a flat list of floats
@@ -191,6 +194,8 @@ class DataMigration:
                         collection_name=coll_name,
                         points=points_to_update
                     )
+                    if coll_name == "value_components":
+                        invalidate_value_components_cache()
                     logger.info(f"Rolled back {len(points_to_update)} points in {coll_name}")
             
             return True
@@ -8,7 +8,7 @@ import streamlit as st
 from typing import Dict, Any
 from .data_migration import DataMigration
 from .user_management import UserManager
-from ..database import QDRANT_CLIENT
+from ..database import QDRANT_CLIENT, migrate_payload_only_collections, pending_payload_only_migrations
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,7 @@ class MigrationRunner:
     def run_full_migration(self) -> Dict[str, Any]:
         """Run the complete migration process."""
         results = {
+            "payload_only_migrated": {},
             "users_created": 0,
             "data_migrated": {},
             "verification": {},
@@ -31,6 +32,22 @@ class MigrationRunner:
         }
         
         try:
+            # Step 0: Move collections that only hold payloads off their dummy vectors
+            logger.info("Step 0: Migrating payload-only collections...")
+            try:
+                payload_results = migrate_payload_only_collections()
+                results["payload_only_migrated"] = payload_results
+                for collection, count in payload_results.items():
+                    if isinstance(count, str) and count.startswith("ERROR:"):
+                        results["errors"].append(f"Error migrating {collection} to payload-only: {count}")
+                        results["success"] = False
+                logger.info(f"Payload-only migration complete: {payload_results}")
+            except Exception as e:
+                error_msg = f"Error migrating payload-only collections: {e}"
+                logger.error(error_msg)
+                results["errors"].append(error_msg)
+                results["success"] = False
+            
             # Step 1: Ensure users collection and default user
             logger.info("Step 1: Setting up users collection...")
             try:
@@ -93,12 +110,14 @@ class MigrationRunner:
             
             # Check data migration status
             verification_results = self.data_migration.verify_migration()
+            pending_payload_only = pending_payload_only_migrations()
             
             return {
                 "users_collection_exists": users_exist,
                 "default_user_exists": default_user is not None,
                 "data_migration_status": verification_results,
-                "migration_complete": all(
+                "payload_only_pending": pending_payload_only,
+                "migration_complete": not pending_payload_only and all(
                     status.get("migration_complete", False) 
                     for status in verification_results.values() 
                     if isinstance(status, dict)
@@ -112,6 +131,7 @@ class MigrationRunner:
                 "users_collection_exists": False,
                 "default_user_exists": False,
                 "data_migration_status": {},
+                "payload_only_pending": [],
                 "migration_complete": False
             }
 
@@ -165,6 +185,10 @@ def run_migration_ui():
             else:
                 st.markdown(f"**{collection}:** {details}")
     
+    if status.get("payload_only_pending"):
+        st.markdown("### 📦 Payload-only Collections")
+        st.markdown(f"Still storing dummy vectors: {', '.join(status['payload_only_pending'])}")
+    
     # Migration button
     st.markdown("## 🚀 Run Migration")
     
@@ -178,6 +202,11 @@ def run_migration_ui():
             # Show results
             st.markdown("### 📈 Migration Results")
             
+            if results["payload_only_migrated"]:
+                st.markdown("**Moved to payload-only collections:**")
+                for collection, count in results["payload_only_migrated"].items():
+                    st.markdown(f"- {collection}: {count} items")
+            
             if results["data_migrated"]:
                 st.markdown("**Data Migrated:**")
                 for collection, count in results["data_migrated"].items():
@@ -218,6 +247,7 @@ def run_migration_ui():
     st.markdown("### 💡 Migration Information")
     st.markdown("""
     **What this migration does:**
+    - Moves payload-only collections (users, sessions, activities, background tasks, value components, framework customizations) off their dummy vectors
     - Creates a users collection in the database
     - Creates a default user account (username: `default_user`, password: `default`)
     - Adds `user_id` field to all existing data
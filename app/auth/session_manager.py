@@ -7,11 +7,83 @@ import streamlit as st
 import logging
 import time
 import hashlib
+import threading
 from typing import Dict, Any, Optional
 from .user_management import UserManager
+from .session_tokens import issue_session_token, verify_session_token, is_legacy_token
+
+# Import session configuration
+try:
+    from app.config import SESSION_REVALIDATE_INTERVAL, SESSION_ACCESS_FLUSH_INTERVAL
+except ImportError:
+    # Fallback values if config import fails
+    SESSION_REVALIDATE_INTERVAL = 300
+    SESSION_ACCESS_FLUSH_INTERVAL = 60
 
 logger = logging.getLogger(__name__)
 
+class SessionAccessBatcher:
+    """Coalesces last_accessed updates of sessions into one periodic write."""
+    
+    def __init__(self, collection_name: str = "user_sessions", flush_interval: float = SESSION_ACCESS_FLUSH_INTERVAL):
+        self.collection_name = collection_name
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, float] = {}  # session_token -> last access
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+        self._flushing = False
+    
+    def record(self, session_token: str):
+        """Note an access; the write happens in the background once per flush interval."""
+        now = time.time()
+        with self._lock:
+            self._pending[session_token] = now
+            due = not self._flushing and now - self._last_flush >= self.flush_interval
+            if due:
+                self._flushing = True
+        if due:
+            threading.Thread(target=self.flush, name="session-access-flush", daemon=True).start()
+    
+    def discard(self, session_token: str):
+        """Drop a pending update (the session is being deleted)."""
+        with self._lock:
+            self._pending.pop(session_token, None)
+    
+    def flush(self) -> int:
+        """Write all pending access times in one request. Returns the number of sessions updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            if not pending:
+                return 0
+            from app.database import QDRANT_CLIENT
+            from qdrant_client.models import Filter, FieldCondition, MatchValue, SetPayload, SetPayloadOperation
+            
+            # Partial updates selected by token: sessions deleted in the meantime are not recreated
+            operations = [
+                SetPayloadOperation(set_payload=SetPayload(
+                    payload={"last_accessed": accessed_at},
+                    filter=Filter(must=[FieldCondition(key="session_token", match=MatchValue(value=session_token))])  # type: ignore[arg-type]
+                ))
+                for session_token, accessed_at in pending.items()
+            ]
+            QDRANT_CLIENT.batch_update_points(collection_name=self.collection_name, update_operations=operations, wait=False)
+            logger.debug(f"Updated access time of {len(operations)} sessions")
+            return len(operations)
+        except Exception as e:
+            logger.error(f"Error updating session access times: {e}")
+            with self._lock:
+                for session_token, accessed_at in pending.items():
+                    self._pending.setdefault(session_token, accessed_at)
+            return 0
+        finally:
+            with self._lock:
+                self._last_flush = time.time()
+                self._flushing = False
+
+# Global instance shared by all SessionManager instances
+session_access_batcher = SessionAccessBatcher()
+
 class SessionManager:
     """Manages user sessions in Streamlit."""
     
@@ -52,6 +124,7 @@ class SessionManager:
                 st.session_state.display_name = user_data.get("display_name", username)
                 st.session_state.is_authenticated = True
                 st.session_state.session_start_time = time.time()
+                st.session_state.session_validated_at = time.time()
                 
                 # Generate and store session token
                 user_id = user_data.get("user_id")
@@ -91,13 +164,14 @@ class SessionManager:
             
             # Delete session from database
             if session_token:
+                session_access_batcher.discard(session_token)
                 self._delete_session_from_database(session_token)
         
         # Clear session state - including persona-related data
         keys_to_clear = [
             # Authentication keys
             "user_id", "username", "display_name", "is_authenticated", 
-            "session_start_time", "session_token",
+            "session_start_time", "session_token", "session_validated_at",
             
             # Persona-related keys (FIX: Clear to prevent data leakage)
             "persona", "persona_saved", "generator_version", "persona_in_progress",
@@ -158,10 +232,8 @@ class SessionManager:
             return False
     
     def _generate_session_token(self, user_id: str, username: str) -> str:
-        """Generate a session token for persistence."""
-        timestamp = str(int(time.time()))
-        token_data = f"{user_id}:{username}:{timestamp}"
-        return hashlib.sha256(token_data.encode()).hexdigest()
+        """Generate a signed session token that expires with the session."""
+        return issue_session_token(user_id, self.session_timeout)
     
     def _generate_public_session_id(self, session_token: str) -> str:
         """Generate a funky B2B action-rollercoaster-color-meaningful session ID for URL display."""
@@ -318,18 +390,21 @@ class SessionManager:
             return None
     
     def _validate_session_token(self, token: str, user_id: str, username: str) -> bool:
-        """Validate a session token."""
+        """Validate a session token locally (signature, expiry and user), without a database query."""
         if not token or not user_id or not username:
             return False
         
-        # For now, we'll use a simple validation
-        # In a production system, you'd want to store tokens in the database
-        return True
+        # Unsigned tokens from before signing was introduced stay valid until their database session expires
+        if is_legacy_token(token):
+            return True
+        
+        claims = verify_session_token(token)
+        return claims is not None and claims.get("uid") == user_id
     
     def _store_session_in_database(self, user_id: str, username: str, session_token: str) -> bool:
         """Store session data in database for persistence across page refresh."""
         try:
-            from app.database import QDRANT_CLIENT
+            from app.database import QDRANT_CLIENT, PAYLOAD_ONLY_VECTOR
             from qdrant_client.models import PointStruct
             
             # Generate public session ID for URL display
@@ -350,7 +425,7 @@ class SessionManager:
             point = PointStruct(
                 id=abs(hash(session_token)) % (2**63),  # Use positive hash as point ID
                 payload=session_data,
-                vector=[0.0] * 128  # Dummy vector for Qdrant
+                vector=PAYLOAD_ONLY_VECTOR  # Payload-only collection
             )
             
             QDRANT_CLIENT.upsert(
@@ -398,7 +473,7 @@ class SessionManager:
                     self._delete_session_from_database(session_token)
                     return None
                 
-                # Update last accessed time
+                # Update last accessed time (batched)
                 self._update_session_access_time(session_token)
                 
                 return session_data
@@ -410,48 +485,9 @@ class SessionManager:
             return None
     
     def _update_session_access_time(self, session_token: str) -> bool:
-        """Update the last accessed time for a session."""
-        try:
-            from app.database import QDRANT_CLIENT
-            from qdrant_client.models import Filter, FieldCondition, MatchValue
-            
-            # Find session
-            session_filter = Filter(
-                must=[FieldCondition(key="session_token", match=MatchValue(value=session_token))]  # type: ignore[arg-type]
-            )
-            
-            results = QDRANT_CLIENT.scroll(
-                collection_name=self.session_collection,
-                scroll_filter=session_filter,
-                limit=1,
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            if results[0]:
-                session_data = results[0][0].payload
-                session_data["last_accessed"] = time.time()
-                
-                # Update session
-                from qdrant_client.models import PointStruct
-                point = PointStruct(
-                    id=results[0][0].id,
-                    payload=session_data,
-                    vector=[0.0] * 128
-                )
-                
-                QDRANT_CLIENT.upsert(
-                    collection_name=self.session_collection,
-                    points=[point]
-                )
-                
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error updating session access time: {e}")
-            return False
+        """Update the last accessed time for a session (coalesced into periodic batched writes)."""
+        session_access_batcher.record(session_token)
+        return True
     
     def _delete_session_from_database(self, session_token: str) -> bool:
         """Delete session from database."""
@@ -489,9 +525,11 @@ class SessionManager:
             return False
     
     def _ensure_session_collection_exists(self):
-        """Ensure the session collection exists in the database."""
+        """Ensure the session collection exists in the database (checked against Qdrant once per process)."""
         try:
-            from app.database import QDRANT_CLIENT
+            from app.database import QDRANT_CLIENT, PAYLOAD_ONLY_VECTOR_SIZE, is_collection_verified, mark_collection_verified
+            if is_collection_verified(self.session_collection):
+                return
             
             # Check if collection exists
             collections = QDRANT_CLIENT.get_collections()
@@ -503,11 +541,13 @@ class SessionManager:
                 
                 QDRANT_CLIENT.create_collection(
                     collection_name=self.session_collection,
-                    vectors_config=VectorParams(size=128, distance=Distance.COSINE)
+                    vectors_config=VectorParams(size=PAYLOAD_ONLY_VECTOR_SIZE, distance=Distance.COSINE)
                 )
                 
                 logger.info(f"Created session collection: {self.session_collection}")
             
+            mark_collection_verified(self.session_collection)
+            
         except Exception as e:
             logger.error(f"Error ensuring session collection exists: {e}")
     
@@ -568,14 +608,22 @@ class SessionManager:
                 username = st.session_state.username
                 session_token = st.session_state.session_token
                 
-                # Validate the session token
+                # Validate the session token (locally, no database query)
                 if self._validate_session_token(session_token, user_id, username):
+                    # Fast path: the user record was checked recently
+                    validated_at = st.session_state.get("session_validated_at", 0)
+                    if time.time() - validated_at < SESSION_REVALIDATE_INTERVAL and st.session_state.get("is_authenticated"):
+                        self._update_session_access_time(session_token)
+                        return True
+                    
                     # Verify user still exists in database
                     user = self.user_manager.get_user_by_id(user_id)
                     if user and user.get("is_active", True):
                         # Restore session data
                         st.session_state.display_name = user.get("display_name", username)
                         st.session_state.is_authenticated = True
+                        st.session_state.session_validated_at = time.time()
+                        self._update_session_access_time(session_token)
                         
                         # Update session start time if not present
                         if "session_start_time" not in st.session_state:
@@ -606,6 +654,10 @@ class SessionManager:
             # Method 2: Try to restore from database using public session ID from URL
             # This is for page refresh scenarios
             session_token = self._get_session_token_from_storage()
+            if session_token and not is_legacy_token(session_token) and verify_session_token(session_token) is None:
+                logger.warning("Stored session token has an invalid signature or has expired")
+                self._delete_session_from_database(session_token)
+                return False
             if session_token:
                 session_data = self._get_session_from_database(session_token)
                 if session_data:
@@ -626,6 +678,7 @@ class SessionManager:
                         st.session_state.display_name = user.get("display_name", username)
                         st.session_state.is_authenticated = True
                         st.session_state.session_start_time = time.time()
+                        st.session_state.session_validated_at = time.time()
                         st.session_state.session_token = session_token
                         
                         # Ensure public session ID is in URL
@@ -734,7 +787,7 @@ class SessionManager:
         keys_to_clear = [
             # Authentication keys
             "user_id", "username", "display_name", "is_authenticated", 
-            "session_start_time", "session_token",
+            "session_start_time", "session_token", "session_validated_at",
             
             # Persona-related keys (FIX: Clear to prevent data leakage)
             "persona", "persona_saved", "generator_version", "persona_in_progress",
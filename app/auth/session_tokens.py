@@ -0,0 +1,110 @@
+"""
+Session Tokens
+HMAC-signed, expiring session tokens that can be validated without a database query.
+
+A token is "<payload>.<signature>": the payload is base64url JSON with the user_id, issue and
+expiry time and a nonce; the signature is HMAC-SHA256 over the payload with SESSION_SECRET.
+Tokens issued before signing was introduced (plain SHA-256 hex) have no '.' and are reported
+as legacy so callers can fall back to the database record.
+"""
+
+import os
+import json
+import hmac
+import time
+import base64
+import hashlib
+import logging
+import secrets
+import threading
+from typing import Dict, Any, Optional
+
+# Import session configuration
+try:
+    from app.config import SESSION_SECRET, SESSION_SECRET_PATH
+except ImportError:
+    # Fallback values if config import fails
+    SESSION_SECRET = ""
+    SESSION_SECRET_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'cache', 'session_secret')
+
+logger = logging.getLogger(__name__)
+
+_secret: Optional[bytes] = None
+_secret_lock = threading.Lock()
+
+
+def _load_secret_file(path: str) -> bytes:
+    """Read the generated secret, creating it first if needed. The file only ever appears complete."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        temp_path = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            with os.fdopen(fd, "w") as secret_file:
+                secret_file.write(secrets.token_hex(32))
+                secret_file.flush()
+                os.fsync(secret_file.fileno())
+            # Atomic and never overwrites: if another process won the race, its secret is used
+            os.link(temp_path, path)
+            logger.warning(f"[session_tokens] SESSION_SECRET not set, generated one in {path}")
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp_path)
+    with open(path, "r") as secret_file:
+        secret = secret_file.read().strip()
+    if not secret:
+        raise RuntimeError(f"Session secret file {path} is empty")
+    return secret.encode("utf-8")
+
+
+def _get_secret() -> bytes:
+    """SESSION_SECRET, or a random secret generated once and kept on disk so tokens survive restarts."""
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            if SESSION_SECRET:
+                _secret = SESSION_SECRET.encode("utf-8")
+            else:
+                # Not cached if reading fails, so the next call tries again
+                _secret = _load_secret_file(os.path.abspath(SESSION_SECRET_PATH))
+        return _secret
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(_get_secret(), payload.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+def issue_session_token(user_id: str, lifetime: float) -> str:
+    """Signed token for the user, valid for `lifetime` seconds."""
+    now = int(time.time())
+    claims = {"uid": user_id, "iat": now, "exp": now + int(lifetime), "nonce": secrets.token_hex(8)}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def is_legacy_token(token: str) -> bool:
+    """True for unsigned tokens issued before session tokens were signed."""
+    return bool(token) and "." not in token
+
+
+def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
+    """Claims of a correctly signed, unexpired token; None otherwise. Does not touch the database."""
+    try:
+        payload, signature = token.split(".", 1)
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+        if not claims.get("uid") or time.time() > claims.get("exp", 0):
+            return None
+        return claims
+    except Exception:
+        return None
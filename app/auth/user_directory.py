@@ -0,0 +1,125 @@
+"""
+User Directory
+In-memory id -> user and username -> user lookup shared by all UserManager instances.
+
+Display names for personas and the session check on every Streamlit rerun resolve users
+through here instead of scrolling the users collection each time. Entries expire after
+USER_DIRECTORY_TTL seconds so changes made by other processes are picked up; changes made
+through UserManager invalidate the affected user immediately. Missing users are not cached.
+"""
+
+import copy
+import time
+import logging
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Import directory configuration
+try:
+    from app.config import USER_DIRECTORY_TTL
+except ImportError:
+    # Fallback value if config import fails
+    USER_DIRECTORY_TTL = 60
+
+logger = logging.getLogger(__name__)
+
+
+class UserDirectory:
+    """TTL-bound in-memory cache of user records, keyed by user_id and by username"""
+
+    def __init__(self, ttl: float = USER_DIRECTORY_TTL):
+        self.ttl = ttl
+        self._by_id: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._id_by_username: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _fresh(self, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached user if present and not expired (caller must hold the lock)."""
+        entry = self._by_id.get(user_id) if user_id else None
+        if entry is None:
+            return None
+        stored_at, user = entry
+        if self.ttl and time.time() - stored_at > self.ttl:
+            self._drop(user_id)
+            return None
+        return user
+
+    def _drop(self, user_id: str):
+        """Remove one user from both maps (caller must hold the lock)."""
+        entry = self._by_id.pop(user_id, None)
+        if entry is not None:
+            username = entry[1].get("username")
+            if username and self._id_by_username.get(username) == user_id:
+                del self._id_by_username[username]
+
+    def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Copy of the cached user, or None on miss."""
+        with self._lock:
+            user = self._fresh(user_id)
+            self._stats["hits" if user else "misses"] += 1
+            return copy.deepcopy(user) if user else None
+
+    def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """Copy of the cached user, or None on miss."""
+        with self._lock:
+            user = self._fresh(self._id_by_username.get(username))
+            self._stats["hits" if user else "misses"] += 1
+            return copy.deepcopy(user) if user else None
+
+    def get_many(self, user_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Cached users by id and the ids that still have to be loaded."""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                user = self._fresh(user_id)
+                if user:
+                    found[user_id] = copy.deepcopy(user)
+                else:
+                    missing.append(user_id)
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(missing)
+        return found, missing
+
+    def put(self, user: Optional[Dict[str, Any]]):
+        """Store a user record as read from (or just written to) the users collection."""
+        self.put_many([user] if user else [])
+
+    def put_many(self, users: Iterable[Dict[str, Any]]):
+        now = time.time()
+        with self._lock:
+            for user in users:
+                user_id = user.get("user_id") if user else None
+                if not user_id:
+                    continue
+                self._drop(user_id)
+                self._by_id[user_id] = (now, copy.deepcopy(user))
+                if user.get("username"):
+                    self._id_by_username[user["username"]] = user_id
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Forget one user (or everyone) after a change."""
+        with self._lock:
+            if user_id is None:
+                self._by_id.clear()
+                self._id_by_username.clear()
+            else:
+                self._drop(user_id)
+            self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["cached_users"] = len(self._by_id)
+            stats["ttl"] = self.ttl
+            return stats
+
+
+# Global instance shared by all UserManager instances
+user_directory = UserDirectory()
+
+def get_user_directory() -> UserDirectory:
+    """Get the global user directory instance"""
+    return user_directory
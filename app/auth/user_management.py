@@ -7,9 +7,11 @@ import hashlib
 import time
 import uuid
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, MatchAny
+from app.database import PAYLOAD_ONLY_VECTOR, PAYLOAD_ONLY_VECTOR_SIZE, is_collection_verified, mark_collection_verified
+from .user_directory import user_directory
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +30,7 @@ class UserManager:
             self.client = QDRANT_CLIENT
     
     def _ensure_users_collection(self):
-        """Ensure the users collection exists."""
+        """Ensure the users collection exists (checked against Qdrant once per process)."""
         if self._collection_ensured:
             return
         
@@ -37,6 +39,10 @@ class UserManager:
         if not self.client:
             logger.error("Qdrant client is not available")
             raise RuntimeError("Qdrant client is not available")
+        
+        if is_collection_verified(self.users_collection):
+            self._collection_ensured = True
+            return
             
         try:
             collections = self.client.get_collections()
@@ -45,7 +51,7 @@ class UserManager:
             if self.users_collection not in collection_names:
                 self.client.create_collection(
                     collection_name=self.users_collection,
-                    vectors_config=VectorParams(size=128, distance=Distance.COSINE)
+                    vectors_config=VectorParams(size=PAYLOAD_ONLY_VECTOR_SIZE, distance=Distance.COSINE)
                 )
                 logger.info(f"Created users collection: {self.users_collection}")
                 
@@ -54,6 +60,7 @@ class UserManager:
             else:
                 logger.info(f"Users collection already exists: {self.users_collection}")
             
+            mark_collection_verified(self.users_collection)
             self._collection_ensured = True
                 
         except Exception as e:
@@ -80,7 +87,7 @@ class UserManager:
                 collection_name=self.users_collection,
                 points=[PointStruct(
                     id=hash(default_user["user_id"]) % (2**63),  # Convert to integer ID
-                    vector=[0.0] * 128,  # Dummy vector
+                    vector=PAYLOAD_ONLY_VECTOR,  # Payload-only collection
                     payload=default_user
                 )]
             )
@@ -118,11 +125,12 @@ class UserManager:
                 collection_name=self.users_collection,
                 points=[PointStruct(
                     id=hash(user_id) % (2**63),  # Convert to integer ID
-                    vector=[0.0] * 128,  # Dummy vector
+                    vector=PAYLOAD_ONLY_VECTOR,  # Payload-only collection
                     payload=user_data
                 )]
             )
             
+            user_directory.put(user_data)
             logger.info(f"Created new user: {username}")
             return user_data
             
@@ -155,7 +163,11 @@ class UserManager:
             return None
     
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get user by username."""
+        """Get user by username (served from the user directory when cached)."""
+        cached = user_directory.get_by_username(username)
+        if cached:
+            return cached
+        
         self._ensure_users_collection()
         if not self.client:
             return None
@@ -170,6 +182,7 @@ class UserManager:
             )
             
             if response[0]:
+                user_directory.put(response[0][0].payload)
                 return response[0][0].payload
             return None
             
@@ -178,7 +191,11 @@ class UserManager:
             return None
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by user_id."""
+        """Get user by user_id (served from the user directory when cached)."""
+        cached = user_directory.get_by_id(user_id)
+        if cached:
+            return cached
+        
         self._ensure_users_collection()
         if not self.client:
             return None
@@ -193,6 +210,7 @@ class UserManager:
             )
             
             if response[0]:
+                user_directory.put(response[0][0].payload)
                 return response[0][0].payload
             return None
             
@@ -200,6 +218,38 @@ class UserManager:
             logger.error(f"Error getting user by ID: {e}")
             return None
     
+    def get_users_by_ids(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several users at once (user_id -> user); uncached ones are loaded in one query.
+        Unknown user IDs are left out."""
+        users, missing = user_directory.get_many(user_id for user_id in user_ids if user_id)
+        if not missing:
+            return users
+        
+        self._ensure_users_collection()
+        if not self.client:
+            return users
+        
+        try:
+            response = self.client.scroll(
+                collection_name=self.users_collection,
+                scroll_filter=Filter(
+                    must=[FieldCondition(key="user_id", match=MatchAny(any=missing))]  # type: ignore[arg-type]
+                ),
+                limit=len(missing),
+                with_payload=True,
+                with_vectors=False
+            )
+            
+            loaded = [point.payload for point in response[0] if point.payload]
+            user_directory.put_many(loaded)
+            for user in loaded:
+                users[user["user_id"]] = user
+            return users
+            
+        except Exception as e:
+            logger.error(f"Error getting users by ID: {e}")
+            return users
+    
     def get_all_users(self) -> list:
         """Get all users from the database."""
         self._ensure_users_collection()
@@ -219,6 +269,7 @@ class UserManager:
                 user_data = point.payload
                 if not user_data:
                     continue
+                user_directory.put(user_data)
                 
                 # Add some default values for display
                 if 'last_login' not in user_data:
@@ -254,11 +305,12 @@ class UserManager:
                 collection_name=self.users_collection,
                 points=[PointStruct(
                     id=hash(user_id) % (2**63),
-                    vector=[0.0] * 128,
+                    vector=PAYLOAD_ONLY_VECTOR,
                     payload=user
                 )]
             )
             
+            user_directory.invalidate(user_id)
             logger.info(f"Updated user {user_id} status to {'active' if is_active else 'inactive'}")
             return True
             
@@ -295,11 +347,12 @@ class UserManager:
                 collection_name=self.users_collection,
                 points=[PointStruct(
                     id=hash(user_id) % (2**63),
-                    vector=[0.0] * 128,
+                    vector=PAYLOAD_ONLY_VECTOR,
                     payload=user
                 )]
             )
             
+            user_directory.invalidate(user_id)
             logger.info(f"Password reset for user: {user_id}")
             return {
                 "success": True,
@@ -330,11 +383,12 @@ class UserManager:
                 collection_name=self.users_collection,
                 points=[PointStruct(
                     id=hash(user_id) % (2**63),  # Convert to integer ID
-                    vector=[0.0] * 128,
+                    vector=PAYLOAD_ONLY_VECTOR,
                     payload=user
                 )]
             )
             
+            user_directory.invalidate(user_id)
             logger.info(f"Updated user: {user_id}")
             return True
             
@@ -370,6 +424,7 @@ class UserManager:
                     points_selector=[point_id]  # type: ignore[arg-type]
                 )
                 
+                user_directory.invalidate(user_id)
                 logger.info(f"Deleted user: {user_id}")
                 return True
             
@@ -3,13 +3,43 @@ Company website data enhancer for value components generation.
 Integrates scraped website content with AI-generated value components.
 """
 
+import hashlib
+import json
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from app.database_company_website import get_company_website_data
 from app.config import ENABLE_COMPANY_WEBSITE_SCRAPING
 
 logger = logging.getLogger(__name__)
 
+# Map categories to relevant website content
+CATEGORY_SOURCES = {
+    'company_overview': ['company_overview', 'about_us'],
+    'products_services': ['products_services', 'value_propositions'],
+    'value_propositions': ['value_propositions', 'benefits'],
+    'benefits': ['benefits', 'value_propositions'],
+    'features': ['features', 'products_services'],
+    'technical_value': ['features', 'products_services'],
+    'business_value': ['value_propositions', 'benefits'],
+    'strategic_value': ['company_overview', 'value_propositions'],
+    'after_sales_value': ['benefits', 'value_propositions']
+}
+
+# Website sections each context entry is extracted from (see the _extract_* methods)
+CONTEXT_SECTIONS = {
+    'company_overview': ['about_us', 'company_overview'],
+    'products_services': ['products_services'],
+    'value_propositions': ['value_propositions'],
+    'benefits': ['benefits'],
+    'features': ['features']
+}
+
+# Enhanced prompts per category, reused while the base prompt and the website sections
+# the category draws from are unchanged: category -> ((base prompt hash, source hashes), prompt)
+_enhanced_prompt_cache: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], str]] = {}
+_enhanced_prompt_lock = threading.Lock()
+
 class CompanyWebsiteEnhancer:
     """Enhances value components generation with company website data."""
     
@@ -53,36 +83,61 @@ class CompanyWebsiteEnhancer:
                 return base_prompts
             
             content = self.website_data.get('content', {})
+            section_hashes = self._section_hashes(content)
+            website_context: Optional[Dict[str, str]] = None
             
-            # Extract relevant content for each category
-            company_overview = self._extract_company_overview(content)
-            products_services = self._extract_products_services(content)
-            value_propositions = self._extract_value_propositions(content)
-            benefits = self._extract_benefits(content)
-            features = self._extract_features(content)
-            
-            # Enhance prompts with website context
+            # Enhance prompts with website context; only categories whose base prompt or
+            # source sections changed since the last call are rebuilt
             enhanced_prompts = {}
+            rebuilt = 0
             
             for category, base_prompt in base_prompts.items():
-                enhanced_prompt = self._enhance_prompt_for_category(
-                    category, base_prompt, {
-                        'company_overview': company_overview,
-                        'products_services': products_services,
-                        'value_propositions': value_propositions,
-                        'benefits': benefits,
-                        'features': features
-                    }
+                cache_key = (
+                    hashlib.md5(base_prompt.encode()).hexdigest(),
+                    tuple(
+                        section_hashes.get(section, '')
+                        for source in CATEGORY_SOURCES.get(category, [])
+                        for section in CONTEXT_SECTIONS.get(source, [source])
+                    )
                 )
+                with _enhanced_prompt_lock:
+                    cached = _enhanced_prompt_cache.get(category)
+                if cached and cached[0] == cache_key:
+                    enhanced_prompts[category] = cached[1]
+                    continue
+                
+                if website_context is None:
+                    # Extract relevant content for each category
+                    website_context = {
+                        'company_overview': self._extract_company_overview(content),
+                        'products_services': self._extract_products_services(content),
+                        'value_propositions': self._extract_value_propositions(content),
+                        'benefits': self._extract_benefits(content),
+                        'features': self._extract_features(content)
+                    }
+                enhanced_prompt = self._enhance_prompt_for_category(category, base_prompt, website_context)
+                with _enhanced_prompt_lock:
+                    _enhanced_prompt_cache[category] = (cache_key, enhanced_prompt)
                 enhanced_prompts[category] = enhanced_prompt
+                rebuilt += 1
             
-            logger.info("Enhanced prompts with website data")
+            logger.info(f"Enhanced prompts with website data ({rebuilt} of {len(base_prompts)} rebuilt)")
             return enhanced_prompts
             
         except Exception as e:
             logger.error(f"Error enhancing prompts with website data: {e}")
             return base_prompts
     
+    def _section_hashes(self, content: Dict[str, Any]) -> Dict[str, str]:
+        """Per-section content hashes (stored by the scraper; computed for older records)."""
+        stored = self.website_data.get('section_hashes') if self.website_data else None
+        if stored:
+            return stored
+        return {
+            section: hashlib.md5(json.dumps(items, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+            for section, items in content.items()
+        }
+    
     def _extract_company_overview(self, content: Dict[str, Any]) -> str:
         """Extract company overview content."""
         overview_parts = []
@@ -122,22 +177,9 @@ class CompanyWebsiteEnhancer:
     def _enhance_prompt_for_category(self, category: str, base_prompt: str, website_context: Dict[str, str]) -> str:
         """Enhance a specific prompt with relevant website context."""
         
-        # Map categories to relevant website content
-        category_mapping = {
-            'company_overview': ['company_overview', 'about_us'],
-            'products_services': ['products_services', 'value_propositions'],
-            'value_propositions': ['value_propositions', 'benefits'],
-            'benefits': ['benefits', 'value_propositions'],
-            'features': ['features', 'products_services'],
-            'technical_value': ['features', 'products_services'],
-            'business_value': ['value_propositions', 'benefits'],
-            'strategic_value': ['company_overview', 'value_propositions'],
-            'after_sales_value': ['benefits', 'value_propositions']
-        }
-        
         # Get relevant content for this category
         relevant_content = []
-        for content_type in category_mapping.get(category, []):
+        for content_type in CATEGORY_SOURCES.get(category, []):
             content_text = website_context.get(content_type, '')
             if content_text:
                 relevant_content.append(content_text)
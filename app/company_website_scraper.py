@@ -3,35 +3,122 @@ Company website scraper for extracting value proposition content.
 Scrapes the company's own website to generate better initial value components.
 """
 
+import os
 import logging
 import hashlib
+import json
 import re
+import time
 import asyncio
-from typing import Dict, Any, List, Optional, cast
-from bs4 import Tag
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, cast
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 import httpx
-from bs4 import BeautifulSoup
 import streamlit as st
+from app.html_extractor import clean_text, extract_page, parse_in_pool, should_use_pool
+
+# Import crawler configuration
+try:
+    from app.config import (
+        SCRAPER_MAX_PAGES, SCRAPER_MAX_CONCURRENCY, SCRAPER_PER_HOST_CONCURRENCY,
+        SCRAPER_PER_HOST_DELAY, SCRAPER_PAGE_CACHE_SIZE, SCRAPER_HTML_FIXTURE_DIR
+    )
+except ImportError:
+    # Fallback values if config import fails
+    SCRAPER_MAX_PAGES = 10
+    SCRAPER_MAX_CONCURRENCY = 8
+    SCRAPER_PER_HOST_CONCURRENCY = 4
+    SCRAPER_PER_HOST_DELAY = 0.1
+    SCRAPER_PAGE_CACHE_SIZE = 500
+    SCRAPER_HTML_FIXTURE_DIR = ""
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def _site_host(url: str) -> str:
+    """Host of the URL, lowercased and without a leading 'www.' (example.com and www.example.com are one site)."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class PageCache:
+    """Process-wide LRU cache of fetched pages with their validators (ETag / Last-Modified),
+    so repeated scrapes send conditional GETs and reuse unchanged content."""
+
+    def __init__(self, max_entries: int = SCRAPER_PAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]):
+        if not etag and not last_modified:
+            return  # nothing to revalidate with
+        with self._lock:
+            self._entries[url] = {"content": content, "etag": etag, "last_modified": last_modified}
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Global instance shared by all scrapes
+page_cache = PageCache()
+
 class CompanyWebsiteScraper:
     """Scraper for extracting value proposition content from company websites."""
     
-    def __init__(self):
+    # Pages that are never relevant for value proposition extraction
+    SKIP_KEYWORDS = [
+        'login', 'register', 'signup', 'signin', 'logout', 'admin',
+        'cart', 'checkout', 'payment', 'billing', 'account',
+        'privacy', 'terms', 'legal', 'cookie', 'sitemap',
+        '404', 'error', 'not-found', 'search', 'contact'
+    ]
+    
+    # Keywords that mark business-relevant pages
+    BUSINESS_KEYWORDS = [
+        'about', 'company', 'services', 'products', 'solutions',
+        'value', 'benefits', 'why', 'features', 'capabilities',
+        'mission', 'vision', 'expertise', 'experience', 'team',
+        'what', 'how', 'our', 'we', 'business', 'industry'
+    ]
+    
+    def __init__(self, max_pages: int = SCRAPER_MAX_PAGES, max_concurrency: int = SCRAPER_MAX_CONCURRENCY):
         self.session = None
         self.base_url = None
         self.scraped_content = {}
+        self.max_pages = max_pages
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_next_request: Dict[str, float] = {}
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._previous_pages: Dict[str, Dict[str, Any]] = {}  # page records of the last scrape
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}  # url -> (ETag, Last-Modified)
+        self._not_modified: set = set()  # URLs answered with 304 and no cached body
+        self._parsed: Dict[str, Dict[str, Any]] = {}  # pages already parsed during discovery
+        self._use_pool = False
         
     async def __aenter__(self):
         """Async context manager entry."""
         self.session = httpx.AsyncClient(
             timeout=30.0,
             follow_redirects=True,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_connections=max(1, SCRAPER_MAX_CONCURRENCY))
         )
         return self
         
@@ -42,38 +129,12 @@ class CompanyWebsiteScraper:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
-        if not text:
-            return ""
-        
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Remove common unwanted elements
-        text = re.sub(r'[^\w\s.,!?;:()\-&]', '', text)
-        
-        return text
-    
-    def _extract_text_from_element(self, element) -> str:
-        """Extract clean text from BeautifulSoup element."""
-        if not element:
-            return ""
-        
-        # Remove script and style elements
-        for script in element(["script", "style"]):
-            script.decompose()
-        
-        text = element.get_text()
-        return self._clean_text(text)
+        return clean_text(text)
     
     def _is_relevant_page(self, url: str, title: str, content: str) -> bool:
         """Check if a page is relevant for value proposition extraction."""
         # Skip pages that are clearly not relevant
-        skip_keywords = [
-            'login', 'register', 'signup', 'signin', 'logout', 'admin',
-            'cart', 'checkout', 'payment', 'billing', 'account',
-            'privacy', 'terms', 'legal', 'cookie', 'sitemap',
-            '404', 'error', 'not-found', 'search', 'contact'
-        ]
+        skip_keywords = self.SKIP_KEYWORDS
         
         url_lower = url.lower()
         title_lower = title.lower()
@@ -93,12 +154,7 @@ class CompanyWebsiteScraper:
             return content_substantial  # Homepage just needs some content
         
         # For other pages, check for business-relevant content
-        business_keywords = [
-            'about', 'company', 'services', 'products', 'solutions',
-            'value', 'benefits', 'why', 'features', 'capabilities',
-            'mission', 'vision', 'expertise', 'experience', 'team',
-            'what', 'how', 'our', 'we', 'business', 'industry'
-        ]
+        business_keywords = self.BUSINESS_KEYWORDS
         
         # Check URL, title, or content for business keywords
         has_business_content = any(
@@ -110,90 +166,84 @@ class CompanyWebsiteScraper:
         
         return content_substantial and has_business_content
     
-    async def _scrape_page(self, url: str) -> Optional[Dict[str, Any]]:
-        """Scrape a single page and extract relevant content."""
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, SCRAPER_PER_HOST_CONCURRENCY))
+            self._host_semaphores[host] = semaphore
+        return semaphore
+    
+    async def _polite_get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET with the global and per-host concurrency limits and per-host request spacing
+        (robots.txt Crawl-delay if given, else SCRAPER_PER_HOST_DELAY)."""
+        if not self.session:
+            raise RuntimeError("Session not initialized")
+        host = urlparse(url).netloc
+        robots = self._robots.get(host)
+        delay = SCRAPER_PER_HOST_DELAY
+        if robots is not None:
+            delay = max(delay, float(robots.crawl_delay(USER_AGENT) or 0))
+        async with self._semaphore, self._host_semaphore(host):
+            # Reserve the next start slot for this host, then wait for ours
+            now = time.monotonic()
+            start = max(now, self._host_next_request.get(host, now))
+            self._host_next_request[host] = start + delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            return await self.session.get(url, headers=headers)
+    
+    async def _fetch(self, url: str) -> Optional[bytes]:
+        """Fetch a page body, revalidating cached copies with a conditional GET.
+        
+        Validators come from the page cache or, failing that, from the previous scrape's
+        page record. Returns None if the page is unchanged since the previous scrape and
+        its body is not cached."""
+        cached = page_cache.get(url)
+        previous = self._previous_pages.get(url) or {}
+        validators = cached or previous
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        response = await self._polite_get(url, headers=headers or None)
+        if response.status_code == 304 and validators:
+            self._validators[url] = (validators.get("etag"), validators.get("last_modified"))
+            if cached:
+                logger.info(f"Page not modified, using cached copy: {url}")
+                return cached["content"]
+            logger.info(f"Page not modified since last scrape: {url}")
+            self._not_modified.add(url)
+            return None
+        response.raise_for_status()
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        self._validators[url] = (etag, last_modified)
+        page_cache.set(url, response.content, etag, last_modified)
+        if SCRAPER_HTML_FIXTURE_DIR:
+            self._save_fixture(url, response.content)
+        return response.content
+    
+    def _save_fixture(self, url: str, content: bytes):
+        """Keep a copy of the page for the extraction benchmark (app/utils/html_extraction_benchmark.py)."""
+        try:
+            os.makedirs(SCRAPER_HTML_FIXTURE_DIR, exist_ok=True)
+            name = hashlib.sha256(url.encode()).hexdigest()[:16] + '.html'
+            with open(os.path.join(SCRAPER_HTML_FIXTURE_DIR, name), 'wb') as fixture:
+                fixture.write(content)
+        except OSError as e:
+            logger.warning(f"Could not save HTML fixture for {url}: {e}")
+    
+    async def _scrape_page(self, url: str, content: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """Scrape a single page and extract relevant content (content is fetched unless given)."""
         try:
             logger.info(f"Scraping page: {url}")
             
-            if not self.session:
-                logger.error("Session not initialized")
-                return None
-            
-            response = await self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract basic page info
-            title = self._extract_text_from_element(soup.find('title'))
-            description = self._extract_text_from_element(soup.find('meta', attrs={'name': 'description'}))
-            
-            # Extract main content
-            main_content = ""
-            
-            # Try to find main content areas
-            content_selectors = [
-                'main', 'article', '.content', '.main-content', 
-                '.page-content', '#content', '.container'
-            ]
-            
-            for selector in content_selectors:
-                element = soup.select_one(selector)
-                if element:
-                    main_content = self._extract_text_from_element(element)
-                    break
-            
-            # If no main content found, use body
-            if not main_content:
-                body = soup.find('body')
-                if body:
-                    main_content = self._extract_text_from_element(body)
-            
-            # Extract headings
-            headings = []
-            for level in range(1, 7):
-                for heading in soup.find_all(f'h{level}'):
-                    heading_text = self._extract_text_from_element(heading)
-                    if heading_text:
-                        headings.append({
-                            'level': level,
-                            'text': heading_text
-                        })
-            
-            # Extract lists (often contain value propositions)
-            lists = []
-            for ul in soup.find_all(['ul', 'ol']):
-                ul_tag = cast(Tag, ul)
-                list_items = []
-                for li in ul_tag.find_all('li'):
-                    item_text = self._extract_text_from_element(li)
-                    if item_text and len(item_text) > 10:  # Only meaningful items
-                        list_items.append(item_text)
-                
-                if list_items:
-                    lists.append({
-                        'type': ul_tag.name,
-                        'items': list_items
-                    })
-            
-            # Extract paragraphs with substantial content
-            paragraphs = []
-            for p in soup.find_all('p'):
-                p_text = self._extract_text_from_element(p)
-                if p_text and len(p_text) > 50:  # Only substantial paragraphs
-                    paragraphs.append(p_text)
-            
-            page_data = {
-                'url': url,
-                'title': title,
-                'description': description,
-                'main_content': main_content,
-                'headings': headings,
-                'lists': lists,
-                'paragraphs': paragraphs,
-                'word_count': len(main_content.split()),
-                'scraped_at': datetime.utcnow().isoformat()
-            }
+            page_data = self._parsed.pop(url, None)
+            if page_data is None:
+                if content is None:
+                    content = await self._fetch(url)
+                # One lxml parse per page; moved to the process pool on larger crawls
+                page_data = await parse_in_pool(url, content or b"", use_pool=self._use_pool)
             
             logger.info(f"Successfully scraped {url}: {page_data['word_count']} words")
             return page_data
@@ -202,108 +252,222 @@ class CompanyWebsiteScraper:
             logger.error(f"Error scraping page {url}: {e}")
             return None
     
-    async def _discover_pages(self, base_url: str) -> List[str]:
-        """Discover relevant pages to scrape from the website."""
+    async def _load_robots(self, base_url: str) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt for the site (None if unavailable)."""
+        host = _site_host(base_url)
+        if host in self._robots:
+            return self._robots[host]
+        robots = None
+        try:
+            response = await self._polite_get(urljoin(base_url, '/robots.txt'))
+            if response.status_code == 200:
+                robots = RobotFileParser()
+                robots.parse(response.text.splitlines())
+        except Exception as e:
+            logger.info(f"No robots.txt for {host}: {e}")
+        self._robots[host] = robots
+        return robots
+    
+    def _allowed(self, url: str) -> bool:
+        robots = self._robots.get(_site_host(url))
+        return robots is None or robots.can_fetch(USER_AGENT, url)
+    
+    async def _sitemap_urls(self, base_url: str, robots: Optional[RobotFileParser]) -> Dict[str, float]:
+        """URLs listed in the site's sitemaps (robots.txt Sitemap entries or /sitemap.xml),
+        with their <priority> (0.5 if not given). Sitemap indexes are followed one level."""
+        sitemap_urls = list((robots.site_maps() if robots else None) or []) or [urljoin(base_url, '/sitemap.xml')]
+        found: Dict[str, float] = {}
+        nested: List[str] = []
+        
+        async def read(sitemap_url: str) -> List[Tuple[str, str, float]]:
+            try:
+                response = await self._polite_get(sitemap_url)
+                if response.status_code != 200:
+                    return []
+                root = ET.fromstring(response.content)
+            except Exception as e:
+                logger.info(f"Could not read sitemap {sitemap_url}: {e}")
+                return []
+            entries = []
+            for element in root:
+                kind = element.tag.rsplit('}', 1)[-1]  # 'url' or 'sitemap', namespace stripped
+                loc, priority = None, 0.5
+                for child in element:
+                    name = child.tag.rsplit('}', 1)[-1]
+                    if name == 'loc' and child.text:
+                        loc = child.text.strip()
+                    elif name == 'priority' and child.text:
+                        try:
+                            priority = float(child.text)
+                        except ValueError:
+                            pass
+                if loc:
+                    entries.append((kind, loc, priority))
+            return entries
+        
+        for entries in await asyncio.gather(*(read(url) for url in sitemap_urls[:3])):
+            for kind, loc, priority in entries:
+                if kind == 'sitemap':
+                    nested.append(loc)
+                else:
+                    found[loc] = priority
+        if nested:
+            for entries in await asyncio.gather(*(read(url) for url in nested[:5])):
+                found.update({loc: priority for kind, loc, priority in entries if kind == 'url'})
+        return found
+    
+    def _link_priority(self, url: str, anchor_text: str = "", sitemap_priority: float = 0.0) -> Optional[float]:
+        """Score a candidate page with the _is_relevant_page heuristics: business keywords in
+        the URL or link text raise it, deep paths lower it; None for pages that are never relevant."""
+        url_lower = url.lower()
+        text_lower = anchor_text.lower()
+        if any(keyword in url_lower or keyword in text_lower for keyword in self.SKIP_KEYWORDS):
+            return None
+        path = urlparse(url_lower).path
+        path_words = set(re.split(r'[^a-z]+', path))
+        text_words = set(re.split(r'[^a-z]+', text_lower))
+        score = sum(2.0 for keyword in self.BUSINESS_KEYWORDS if keyword in path_words)
+        score += sum(1.0 for keyword in self.BUSINESS_KEYWORDS if keyword in text_words)
+        depth = len([part for part in path.split('/') if part])
+        return score + sitemap_priority - 0.5 * depth
+    
+    def _select_pages(self, base_url: str, links: Dict[str, str], sitemap: Dict[str, float]) -> List[str]:
+        """Pick up to max_pages - 1 pages besides the homepage, highest priority first."""
+        base_host = _site_host(base_url)
+        normalized_home = base_url.rstrip('/')
+        candidates: Dict[str, Optional[float]] = {}
+        for url, text in links.items():
+            candidates[url] = self._link_priority(url, text, sitemap.get(url, 0.0))
+        for url, priority in sitemap.items():
+            if url not in candidates and _site_host(url) == base_host:
+                candidates[url] = self._link_priority(url, "", priority)
+        ranked = sorted(
+            (url for url, score in candidates.items()
+             if score is not None and url.rstrip('/') != normalized_home and self._allowed(url)),
+            key=lambda url: (-cast(float, candidates[url]), url)  # ties broken by URL so selection is stable
+        )
+        return ranked[:max(0, self.max_pages - 1)]
+    
+    async def _discover_pages(self, base_url: str) -> Tuple[List[str], Optional[bytes]]:
+        """Discover relevant pages to scrape from the website.
+        
+        The homepage, robots.txt and sitemap are fetched concurrently; returns the selected
+        pages (homepage first) and the homepage body so it is not fetched twice."""
         try:
             logger.info(f"Discovering pages from {base_url}")
             
-            if not self.session:
-                logger.error("Session not initialized")
-                return [base_url]
-            
-            response = await self.session.get(base_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            pages_to_scrape = [base_url]  # Always include homepage
-            
-            # Find internal links
-            for link in soup.find_all('a', href=True):
-                link_tag = cast(Tag, link)
-                href_attr = link_tag.get('href')
-                if not href_attr:
-                    continue
-                
-                # Handle href as string or list
-                href = href_attr if isinstance(href_attr, str) else str(href_attr)
-                full_url = urljoin(base_url, href)
-                
-                # Only process internal links
-                if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                    # Skip common non-content pages
-                    skip_patterns = [
-                        'mailto:', 'tel:', '#', 'javascript:', 'pdf', 'doc', 'docx',
-                        'jpg', 'jpeg', 'png', 'gif', 'css', 'js', 'xml'
-                    ]
-                    
-                    href_lower = href.lower() if isinstance(href, str) else str(href).lower()
-                    if not any(pattern in href_lower for pattern in skip_patterns):
-                        pages_to_scrape.append(full_url)
-            
-            # Remove duplicates and limit to reasonable number
-            unique_pages = list(set(pages_to_scrape))[:10]  # Limit to 10 pages max
-            
-            logger.info(f"Found {len(unique_pages)} pages to scrape")
-            return unique_pages
+            robots_task = asyncio.ensure_future(self._load_robots(base_url))
+            homepage_task = asyncio.ensure_future(self._fetch(base_url))
+            robots = await robots_task
+            sitemap, homepage = await asyncio.gather(self._sitemap_urls(base_url, robots), homepage_task)
+            
+            if homepage is None and self._previous_pages:
+                # Homepage unchanged since the last scrape: its links are too
+                pages = [base_url] + [url for url in self._previous_pages if url != base_url]
+                logger.info(f"Homepage unchanged, reusing {len(pages)} pages of the last scrape")
+                return pages, None
+            
+            links: Dict[str, str] = {}
+            if homepage:
+                # Parsed once: the same page data is used for scraping the homepage
+                homepage_data = extract_page(base_url, homepage)
+                self._parsed[base_url] = homepage_data
+                links = homepage_data.get('links', {})
+            pages = [base_url] + self._select_pages(base_url, links, sitemap)
+            logger.info(f"Found {len(links)} links and {len(sitemap)} sitemap entries, selected {len(pages)} pages to scrape")
+            return pages, homepage
             
         except Exception as e:
             logger.error(f"Error discovering pages: {e}")
-            return [base_url]  # Fallback to just homepage
+            return [base_url], None  # Fallback to just homepage
+    
+    async def _process_page(self, url: str, content: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build the page record for one page: fetch metadata, body hash, relevance and the
+        page's organized sections. Pages whose body is unchanged since the previous scrape
+        (304 or same hash) reuse their previous record without being parsed again.
+        """
+        try:
+            if content is None and url not in self._not_modified:
+                content = await self._fetch(url)
+        except Exception as e:
+            logger.error(f"Error fetching page {url}: {e}")
+            return None
+        
+        previous = self._previous_pages.get(url)
+        etag, last_modified = self._validators.get(url, (None, None))
+        body_hash = hashlib.sha256(content).hexdigest() if content is not None else None
+        if previous and (content is None or previous.get("content_hash") == body_hash):
+            logger.info(f"Page unchanged, reusing previous result: {url}")
+            return dict(previous, etag=etag, last_modified=last_modified, changed=False)
+        if content is None:
+            return None  # 304 without a previous record cannot happen, but never parse nothing
+        
+        page_data = await self._scrape_page(url, content)
+        if not page_data:
+            return None
+        title = page_data.get('title', '')
+        main_content = page_data.get('main_content', '')
+        is_relevant = self._is_relevant_page(url, title, main_content)
+        logger.info(f"Page data: title='{title[:50]}...', content_length={len(main_content)}, words={page_data.get('word_count', 0)}, relevant={is_relevant}")
+        return {
+            'url': url,
+            'title': title,
+            'content_hash': body_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': datetime.utcnow().isoformat(),
+            'relevant': is_relevant,
+            'word_count': page_data.get('word_count', 0),
+            'sections': self._organize_content([page_data]),
+            'changed': True
+        }
     
-    async def scrape_website(self, website_url: str) -> Dict[str, Any]:
+    async def scrape_website(self, website_url: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Scrape the company website and extract value proposition content.
         
         Args:
             website_url: The company's website URL
+            previous: Stored result of the last scrape; unchanged pages are then revalidated
+                with conditional GETs and reused instead of being parsed again
             
         Returns:
-            Dict containing scraped content organized by category
+            Dict containing scraped content organized by category, per-page records and
+            the pages / sections that changed since `previous`
         """
         try:
             logger.info(f"Starting website scrape for {website_url}")
             
             self.base_url = website_url
+            if previous and previous.get('website_url') == website_url:
+                self._previous_pages = dict(previous.get('pages') or {})
             
             # Discover pages to scrape
-            pages_to_scrape = await self._discover_pages(website_url)
+            pages_to_scrape, homepage = await self._discover_pages(website_url)
             logger.info(f"Discovered {len(pages_to_scrape)} pages to scrape: {pages_to_scrape}")
-            
-            # Scrape each page
-            scraped_pages = []
+            self._use_pool = should_use_pool(len(pages_to_scrape))
+            
+            # Process all pages concurrently (the homepage body is reused from discovery)
+            records = await asyncio.gather(*(
+                self._process_page(page_url, homepage if page_url == website_url else None)
+                for page_url in pages_to_scrape
+            ))
+            pages = {record['url']: record for record in records if record}
             for page_url in pages_to_scrape:
-                logger.info(f"Processing page: {page_url}")
-                page_data = await self._scrape_page(page_url)
-                
-                if page_data:
-                    title = page_data.get('title', '')
-                    content = page_data.get('main_content', '')
-                    word_count = page_data.get('word_count', 0)
-                    
-                    logger.info(f"Page data: title='{title[:50]}...', content_length={len(content)}, words={word_count}")
-                    
-                    is_relevant = self._is_relevant_page(page_url, title, content)
-                    logger.info(f"Page relevance check: {is_relevant}")
-                    
-                    if is_relevant:
-                        scraped_pages.append(page_data)
-                        logger.info(f"✅ Page added to scraped pages: {page_url}")
-                    else:
-                        logger.info(f"❌ Page filtered out: {page_url}")
-                else:
+                if page_url not in pages:
                     logger.warning(f"❌ Failed to scrape page: {page_url}")
             
-            # If no pages were scraped, try to scrape just the homepage with relaxed filtering
-            if not scraped_pages:
-                logger.warning("No pages were scraped with normal filtering. Trying homepage with relaxed filtering...")
-                homepage_data = await self._scrape_page(website_url)
-                if homepage_data:
-                    # Force include homepage even if it doesn't meet relevance criteria
-                    scraped_pages.append(homepage_data)
-                    logger.info(f"✅ Added homepage with relaxed filtering: {website_url}")
+            relevant_pages = [record for record in pages.values() if record['relevant']]
+            if not relevant_pages and website_url in pages:
+                # Force include homepage even if it doesn't meet relevance criteria
+                logger.warning("No pages were scraped with normal filtering. Using homepage with relaxed filtering...")
+                relevant_pages = [pages[website_url]]
             
-            # Organize content by category
-            organized_content = self._organize_content(scraped_pages)
+            # Combine the per-page sections; only changed pages were organized again
+            organized_content = self._merge_sections([record['sections'] for record in relevant_pages])
+            section_hashes = {category: self._generate_content_hash(items) for category, items in organized_content.items()}
+            previous_hashes = (previous or {}).get('section_hashes') or {}
             
             # Generate content hash for change detection
             content_hash = self._generate_content_hash(organized_content)
@@ -312,18 +476,31 @@ class CompanyWebsiteScraper:
                 'website_url': website_url,
                 'scraped_at': datetime.utcnow().isoformat(),
                 'content_hash': content_hash,
-                'pages_scraped': len(scraped_pages),
-                'total_words': sum(page.get('word_count', 0) for page in scraped_pages),
-                'content': organized_content
+                'pages_scraped': len(relevant_pages),
+                'total_words': sum(record.get('word_count', 0) for record in relevant_pages),
+                'content': organized_content,
+                'section_hashes': section_hashes,
+                'pages': {url: {k: v for k, v in record.items() if k != 'changed'} for url, record in pages.items()},
+                'changed_pages': [url for url, record in pages.items() if record['changed']],
+                'changed_sections': [category for category, digest in section_hashes.items() if previous_hashes.get(category) != digest]
             }
             
-            logger.info(f"Website scrape completed: {result['pages_scraped']} pages, {result['total_words']} words")
+            logger.info(f"Website scrape completed: {result['pages_scraped']} pages, {result['total_words']} words, "
+                        f"{len(result['changed_pages'])} pages and {len(result['changed_sections'])} sections changed")
             return result
             
         except Exception as e:
             logger.error(f"Error scraping website {website_url}: {e}")
             raise
     
+    def _merge_sections(self, sections_list: List[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        """Union of per-page organized content, deduplicated and sorted like _organize_content."""
+        merged: Dict[str, List[str]] = {category: [] for category in self._organize_content([])}
+        for sections in sections_list:
+            for category, items in sections.items():
+                merged.setdefault(category, []).extend(items)
+        return {category: sorted(set(items)) for category, items in merged.items()}
+    
     def _organize_content(self, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Organize scraped content into categories for value components generation."""
         organized = {
@@ -415,32 +592,33 @@ class CompanyWebsiteScraper:
                     # Default to value propositions for general lists
                     organized['value_propositions'].extend(list_items)
         
-        # Clean and deduplicate content
+        # Clean and deduplicate content (sorted, so content hashes are stable across runs)
         for category in organized:
-            organized[category] = list(set([
+            organized[category] = sorted(set([
                 self._clean_text(item) for item in organized[category] 
                 if item and len(item.strip()) > 20
             ]))
         
         return organized
     
-    def _generate_content_hash(self, content: Dict[str, Any]) -> str:
+    def _generate_content_hash(self, content: Any) -> str:
         """Generate a hash of the content for change detection."""
-        content_str = str(content)
+        content_str = json.dumps(content, sort_keys=True, ensure_ascii=False)
         return hashlib.md5(content_str.encode()).hexdigest()
 
-async def scrape_company_website(website_url: str) -> Dict[str, Any]:
+async def scrape_company_website(website_url: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Main function to scrape a company website.
     
     Args:
         website_url: The company's website URL
+        previous: Stored data of the last scrape, for an incremental re-scrape
         
     Returns:
         Dict containing scraped and organized content
     """
     async with CompanyWebsiteScraper() as scraper:
-        return await scraper.scrape_website(website_url)
+        return await scraper.scrape_website(website_url, previous=previous)
 
 # Import datetime at the top
 from datetime import datetime
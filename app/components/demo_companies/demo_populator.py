@@ -7,7 +7,7 @@ import streamlit as st
 import logging
 from typing import Dict, Any, List, Optional
 from .company_data import get_company_by_id, get_customers_for_company
-from app.database import save_value_component, ensure_collections_exist
+from app.database import save_value_components, ensure_collections_exist
 from app.categories import COMPONENT_STRUCTURES
 import asyncio
 
@@ -241,36 +241,34 @@ class DemoPopulator:
     
     async def _save_components(self, value_components: Dict[str, Any], user_id: str, preserve_existing: bool) -> List[Dict[str, Any]]:
         """Save value components to database"""
-        saved_components = []
+        payloads = []
         
         for main_category, category_data in value_components.items():
             for subcategory, subcategory_data in category_data.items():
                 for component_name, component_value in subcategory_data.items():
                     if component_value and component_value.strip():
-                        try:
-                            # Create component payload
-                            payload = {
-                                "main_category": main_category,
-                                "category": subcategory,
-                                "name": component_name,
-                                "original_value": component_value,
-                                "ai_processed_value": f"AI-generated benefit: {component_value}",
-                                "chain_of_thought": f"Demo data generated for {component_name} based on company profile",
-                                "weight": len(f"AI-generated benefit: {component_value}"),  # Calculate weight based on AI processed value length
-                                "user_rating": 3,  # Set a meaningful rating for demo data
-                                "user_id": user_id  # Ensure user_id is set
-                            }
-                            
-                            # Save to database
-                            success = save_value_component(payload)
-                            if success:
-                                saved_components.append(payload)
-                                logger.info(f"Successfully saved demo component: {component_name} for {main_category}/{subcategory}")
-                            else:
-                                logger.error(f"Failed to save demo component: {component_name}")
-                            
-                        except Exception as e:
-                            logger.error(f"Error saving component {component_name}: {e}")
+                        # Create component payload
+                        payloads.append({
+                            "main_category": main_category,
+                            "category": subcategory,
+                            "name": component_name,
+                            "original_value": component_value,
+                            "ai_processed_value": f"AI-generated benefit: {component_value}",
+                            "chain_of_thought": f"Demo data generated for {component_name} based on company profile",
+                            "weight": len(f"AI-generated benefit: {component_value}"),  # Calculate weight based on AI processed value length
+                            "user_rating": 3,  # Set a meaningful rating for demo data
+                            "user_id": user_id  # Ensure user_id is set
+                        })
+        
+        # Save to database in batched upserts
+        results = save_value_components(payloads)
+        saved_components = []
+        for payload, success in zip(payloads, results):
+            if success:
+                saved_components.append(payload)
+            else:
+                logger.error(f"Failed to save demo component: {payload['name']}")
+        logger.info(f"Saved {len(saved_components)}/{len(payloads)} demo components for user {user_id}")
         
         return saved_components
     
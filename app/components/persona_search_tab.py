@@ -2,7 +2,7 @@ import streamlit as st
 import asyncio
 import pandas as pd
 from datetime import datetime
-from app.database import get_personas, delete_persona_by_id, GENERATOR_VERSION
+from app.database import search_personas, delete_persona_by_id, GENERATOR_VERSION, PERSONA_SEARCH_PAGE_SIZE
 from app.utils.spinner import delete_spinner, search_spinner
 
 def get_sortable_value(persona, column):
@@ -61,31 +61,38 @@ async def run_persona_search_tab():
         if "sort_direction" not in st.session_state:
             st.session_state.sort_direction = "asc"
 
-        # --- Data Fetching and Filtering ---
+        if "persona_search_page" not in st.session_state:
+            st.session_state.persona_search_page = 0
+        if "persona_search_query" not in st.session_state:
+            st.session_state.persona_search_query = ""
+
+        search_query = st.text_input("Search by company, website, industry, value drivers or scan date", "")
+        if search_query != st.session_state.persona_search_query:
+            # New query: start again from the first page
+            st.session_state.persona_search_query = search_query
+            st.session_state.persona_search_page = 0
+        
+        # --- Data Fetching (semantic + keyword search, one page at a time) ---
+        page = st.session_state.persona_search_page
         with search_spinner("personas"):
-            personas = await get_personas()
-        if not isinstance(personas, list):
+            search_result = await search_personas(
+                query=search_query,
+                limit=PERSONA_SEARCH_PAGE_SIZE,
+                offset=page * PERSONA_SEARCH_PAGE_SIZE
+            )
+        if search_result.get("error"):
             st.error("Error: Could not retrieve personas")
             return
+        personas = search_result["personas"]
         
-        search_query = st.text_input("Search by company, website, or scan date", "")
-        
-        filtered_personas = personas
-        if search_query:
-            search_query_lc = search_query.lower()
-            filtered_personas = [
-                p for p in personas if (
-                    search_query_lc in str(p.get("persona", {}).get("company", {}).get("name", "")).lower() or
-                    search_query_lc in str(p.get("persona", {}).get("company_name", "")).lower() or
-                    search_query_lc in str(p.get("persona", {}).get("website", "")).lower() or
-                    search_query_lc in str(p.get("scan_date", "")).lower()
-                )
-            ]
-        
-        # --- Apply Sorting ---
-        filtered_personas = sort_personas(filtered_personas, st.session_state.sort_column, st.session_state.sort_direction)
+        # --- Apply Sorting (within the current page; search results are otherwise ordered by relevance) ---
+        filtered_personas = sort_personas(personas, st.session_state.sort_column, st.session_state.sort_direction)
         
-        st.write(f"Found {len(filtered_personas)} personas.")
+        first = page * PERSONA_SEARCH_PAGE_SIZE
+        if search_result.get("total") is not None:
+            st.write(f"Found {search_result['total']} personas." + (f" Showing {first + 1}–{first + len(personas)}." if personas and search_result["total"] > len(personas) else ""))
+        else:
+            st.write(f"Showing {first + 1}–{first + len(personas)} best matches." if personas else "No matching personas.")
 
         # --- Confirmation Dialog for Deletion ---
         if st.session_state.persona_to_delete_id:
@@ -161,6 +168,18 @@ async def run_persona_search_tab():
         
         st.markdown("---")
 
+        # --- Pagination ---
+        if page > 0 or search_result.get("has_more"):
+            prev_col, next_col, _ = st.columns([1, 1, 5])
+            with prev_col:
+                if page > 0 and st.button("◀ Previous", key="persona_search_prev"):
+                    st.session_state.persona_search_page = page - 1
+                    st.rerun()
+            with next_col:
+                if search_result.get("has_more") and st.button("Next ▶", key="persona_search_next"):
+                    st.session_state.persona_search_page = page + 1
+                    st.rerun()
+
         for p in filtered_personas:
             persona_id = p.get("id")
             if not persona_id:
@@ -26,85 +26,39 @@ def check_background_task_running() -> Tuple[bool, Optional[str]]:
     Check if any background task is running for the current user.
     Centralized function to check running tasks consistently across all components.
     
-    This function is optimized to:
-    1. First check session state (fastest)
-    2. Then verify with database if needed
-    3. Always ensure background_persona_task_id is set for sidebar progress
+    Task state is read from the in-process task registry, so this never queries the database
+    and works the same inside and outside an event loop. It also ensures
+    background_persona_task_id is set for sidebar progress.
     
     Returns:
         Tuple of (is_running: bool, running_website: Optional[str])
     """
-    # First check session state - fastest path
-    task_id_in_session = st.session_state.get("background_persona_task_id")
+    from app.core.task_registry import task_registry
     
-    # If we have task_id, verify it's still running
-    if task_id_in_session:
-        try:
-            from app.database import get_background_task
-            # Use new_event_loop() to avoid conflicts with existing async context
-            import asyncio
-            try:
-                # Check if we're in an async context
-                loop = asyncio.get_running_loop()
-                # We're in async - can't use asyncio.run(), assume running based on task_id
-                logger.debug(f"In async context, using session state task_id {task_id_in_session}")
-                return True, None
-            except RuntimeError:
-                # No running loop - safe to use asyncio.run()
-                task = asyncio.run(get_background_task(task_id_in_session))
-                
-                if task and task.get("status") == "running":
-                    return True, task.get("website", "unknown")
-                elif task and task.get("status") == "completed":
-                    # Task completed - clear it
-                    st.session_state.background_persona_task_id = None
-                    return False, None
-                elif task and task.get("status") == "failed":
-                    # Task failed - clear it
-                    st.session_state.background_persona_task_id = None
-                    return False, None
-                elif task is None:
-                    # Task doesn't exist in database - but don't clear immediately
-                    # It might be a timing issue. Only clear if we're sure it's not running
-                    # For now, preserve task_id and assume it's running (safer approach)
-                    logger.warning(f"Task {task_id_in_session} not found in database, but preserving task_id in session")
-                    return True, None
-                else:
-                    # Task has other status - preserve task_id and assume running
-                    # This handles edge cases where status might be temporarily unavailable
-                    logger.debug(f"Task {task_id_in_session} has status {task.get('status')}, preserving task_id")
-                    return True, None
-        except Exception as e:
-            logger.debug(f"Could not verify task {task_id_in_session}: {e}")
-            # If we can't verify but have task_id, assume it's running
-            # This is safer - don't clear on errors as it might be temporary
-            return True, None
+    task_id_in_session = st.session_state.get("background_persona_task_id")
     
-    # No task_id in session - check database for any running tasks
     try:
-        from app.database import get_any_running_task_for_user
+        # If we have task_id, verify it's still running
+        if task_id_in_session:
+            task = task_registry.get(task_id_in_session)
+            
+            if task is None:
+                # Unknown task - preserve task_id and assume it's running (safer approach)
+                logger.warning(f"Task {task_id_in_session} not found, but preserving task_id in session")
+                return True, None
+            if task.get("status") in ("completed", "failed", "cancelled"):
+                # Task finished - clear it
+                st.session_state.background_persona_task_id = None
+                return False, None
+            return True, task.get("website", "unknown")
         
+        # No task_id in session - check for any running task of this user
         user_id = st.session_state.get('user_id', 'anonymous')
-        
-        # Check if we're in async context
-        import asyncio
-        try:
-            loop = asyncio.get_running_loop()
-            # We're in async context - can't use asyncio.run()
-            # Return False for now (async caller should handle this differently)
-            logger.debug("In async context, cannot query database here")
-            return False, None
-        except RuntimeError:
-            # No running loop - safe to use asyncio.run()
-            existing_task = asyncio.run(get_any_running_task_for_user(user_id))
-            
-            if existing_task:
-                # Found a running task - store task_id in session state for sidebar
-                task_id = existing_task.get("task_id")
-                if task_id:
-                    st.session_state.background_persona_task_id = task_id
-                
-                return True, existing_task.get("website", "unknown")
+        existing_task = task_registry.get_active_for_user(user_id)
+        if existing_task:
+            # Found a running task - store task_id in session state for sidebar
+            st.session_state.background_persona_task_id = existing_task.get("task_id")
+            return True, existing_task.get("website", "unknown")
         
         return False, None
         
@@ -1897,6 +1851,9 @@ async def run_persona_tab():
                             task_to_cancel = await get_background_task(current_task_id)
                             if task_to_cancel and task_to_cancel.get("status") == "running":
                                 await update_background_task(current_task_id, status="cancelled")
+                                # Stop the generation itself (or drop it from the queue)
+                                from app.ai.persona_executor import persona_executor
+                                persona_executor.cancel(current_task_id)
                                 logger.info(f"[persona_tab] Cancelled task {current_task_id}")
                         except Exception as e:
                             logger.debug(f"Could not cancel task in database: {e}")
@@ -2138,26 +2095,26 @@ async def run_persona_tab():
                         verified_company_name = st.session_state.get("verified_company_name")
                         verified_industry = st.session_state.get("verified_industry")
                         
-                        # Start background generation (non-blocking)
-                        import threading
-                        def run_background_task():
-                            import asyncio
-                            try:
-                                if task_id:
-                                    asyncio.run(run_persona_generation_background(
-                                        task_id, 
-                                        website, 
-                                        user_id,
-                                        verified_company_name=verified_company_name,
-                                        verified_industry=verified_industry
-                                    ))
-                            except Exception as e:
-                                logger.error(f"[Background Thread] Error in persona generation: {e}", exc_info=True)
-                        
-                        # Start the background task in a separate thread
-                        background_thread = threading.Thread(target=run_background_task, daemon=True)
-                        background_thread.start()
-                        logger.info(f"[persona_tab] Background thread started for task {task_id}")
+                        # Queue the generation on the shared persona worker pool (non-blocking)
+                        from app.ai.persona_executor import persona_executor
+                        accepted = persona_executor.submit(
+                            task_id,
+                            user_id,
+                            lambda: run_persona_generation_background(
+                                task_id,
+                                website,
+                                user_id,
+                                verified_company_name=verified_company_name,
+                                verified_industry=verified_industry
+                            )
+                        )
+                        if not accepted:
+                            from app.database import update_background_task
+                            await update_background_task(task_id, status="failed", error_message="Server is busy, please try again in a few minutes")
+                            st.session_state.background_persona_task_id = None
+                            st.error("❌ Too many persona generations are queued right now. Please try again in a few minutes.")
+                            return
+                        logger.info(f"[persona_tab] Task {task_id} queued on persona executor")
                         
                         # Show success message - progress will be shown on main page
                         st.success("🚀 Persona generation started! Progress will be shown below.")
@@ -24,6 +24,15 @@ if not OLLAMA_BASE_URL:
     raise RuntimeError("OLLAMA_BASE_URL environment variable is not set. Please set it to the correct Ollama address.")
 
 MODEL = "mistral"
+
+# Embeddings (Ollama /api/embed); the model must produce VECTOR_DIM-dimensional vectors
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", MODEL)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))  # texts per request
+EMBEDDING_BATCH_WINDOW = float(os.getenv("EMBEDDING_BATCH_WINDOW", "0.01"))  # seconds to collect concurrent texts
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "60"))  # seconds per request
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(os.path.dirname(__file__), '..', 'cache', 'embeddings.sqlite3'))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
 AI_TIMEOUT = 30  # seconds
 AI_MAX_RETRIES = 3
 
@@ -38,6 +47,27 @@ OPENAI_MAX_RETRIES = 3
 ENABLE_DUAL_MODEL_PERSONA = os.getenv("ENABLE_DUAL_MODEL_PERSONA", "true").lower() == "true"
 ENABLE_WEB_SEARCH = os.getenv("ENABLE_WEB_SEARCH", "true").lower() == "true"
 
+# Persona pipeline concurrency (independent generation steps run in parallel)
+# Set PERSONA_PIPELINE_MAX_CONCURRENCY=1 to run the steps one at a time
+PERSONA_PIPELINE_MAX_CONCURRENCY = int(os.getenv("PERSONA_PIPELINE_MAX_CONCURRENCY", "4"))
+PERSONA_PIPELINE_PROVIDER_LIMITS = {
+    "sonar": int(os.getenv("PERSONA_PIPELINE_SONAR_LIMIT", "2")),
+    "gemini": int(os.getenv("PERSONA_PIPELINE_GEMINI_LIMIT", "2")),
+    "chatgpt": int(os.getenv("PERSONA_PIPELINE_CHATGPT_LIMIT", "2")),
+}
+# Start generation steps before the previous step's Sonar validation has finished
+# (re-run if the validation fails or returns corrections, otherwise its findings are attached)
+PERSONA_PIPELINE_SPECULATION = os.getenv("PERSONA_PIPELINE_SPECULATION", "true").lower() == "true"
+
+# Background persona generation worker pool (jobs beyond the workers wait in per-user queues)
+PERSONA_EXECUTOR_WORKERS = int(os.getenv("PERSONA_EXECUTOR_WORKERS", "4"))
+PERSONA_EXECUTOR_MAX_QUEUED = int(os.getenv("PERSONA_EXECUTOR_MAX_QUEUED", "50"))
+
+# Deep website analysis: run the independent analysis passes concurrently
+WEBSITE_ANALYSIS_CONCURRENT = os.getenv("WEBSITE_ANALYSIS_CONCURRENT", "true").lower() == "true"
+WEBSITE_ANALYSIS_MAX_CONCURRENCY = int(os.getenv("WEBSITE_ANALYSIS_MAX_CONCURRENCY", "3"))
+WEBSITE_ANALYSIS_PASS_TIMEOUT = float(os.getenv("WEBSITE_ANALYSIS_PASS_TIMEOUT", "180"))  # seconds per pass
+
 # Demo mode settings
 # Option 1: Set via environment variable (ENABLE_DEMO_MODE=true)
 # Option 2: Set directly in this file by changing the value below
@@ -49,6 +79,17 @@ ENABLE_DEMO_MODE = os.getenv("ENABLE_DEMO_MODE", "false").lower() == "true" or D
 COMPANY_WEBSITE_URL = os.getenv("COMPANY_WEBSITE_URL", "")
 ENABLE_COMPANY_WEBSITE_SCRAPING = os.getenv("ENABLE_COMPANY_WEBSITE_SCRAPING", "true").lower() == "true"
 
+# Company website crawler: pages per scrape, concurrent requests (overall and per host),
+# minimum seconds between requests to one host (robots.txt Crawl-delay wins if larger)
+SCRAPER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "10"))
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "8"))
+SCRAPER_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", "4"))
+SCRAPER_PER_HOST_DELAY = float(os.getenv("SCRAPER_PER_HOST_DELAY", "0.1"))
+SCRAPER_PAGE_CACHE_SIZE = int(os.getenv("SCRAPER_PAGE_CACHE_SIZE", "500"))  # pages kept for conditional GETs
+SCRAPER_PARSE_PROCESSES = int(os.getenv("SCRAPER_PARSE_PROCESSES", "2"))  # 0 parses inline on the event loop
+SCRAPER_PROCESS_POOL_MIN_PAGES = int(os.getenv("SCRAPER_PROCESS_POOL_MIN_PAGES", "6"))
+SCRAPER_HTML_FIXTURE_DIR = os.getenv("SCRAPER_HTML_FIXTURE_DIR", "")  # save fetched pages for the extraction benchmark
+
 # --- DETERMINISTIC AI CONFIGURATION ---
 # These parameters ensure consistent, reproducible results across all AI calls
 AI_TEMPERATURE = 0.0  # Set to 0.0 for most deterministic output
@@ -87,6 +128,81 @@ CHATGPT_MAX_TOKENS = 4000  # ChatGPT's maximum limit
 CACHE_TTL = 3600  # 1 hour
 MAX_CACHE_SIZE = 1000
 
+# Framework customizations are cached in memory; writes in this process invalidate immediately,
+# writes from other processes are seen after this many seconds
+FRAMEWORK_CUSTOMIZATION_CACHE_TTL = int(os.getenv("FRAMEWORK_CUSTOMIZATION_CACHE_TTL", "300"))
+
+# User records (display names, session checks) are cached in memory for this many seconds;
+# changes made through UserManager in this process invalidate immediately
+USER_DIRECTORY_TTL = int(os.getenv("USER_DIRECTORY_TTL", "60"))
+
+# Session tokens are HMAC-signed and checked locally on every rerun. Without SESSION_SECRET a
+# random secret is generated once and kept in SESSION_SECRET_PATH.
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+SESSION_SECRET_PATH = os.getenv("SESSION_SECRET_PATH", os.path.join(os.path.dirname(__file__), '..', 'cache', 'session_secret'))
+SESSION_REVALIDATE_INTERVAL = int(os.getenv("SESSION_REVALIDATE_INTERVAL", "300"))  # re-check the user record (seconds)
+SESSION_ACCESS_FLUSH_INTERVAL = int(os.getenv("SESSION_ACCESS_FLUSH_INTERVAL", "60"))  # batch last_accessed writes (seconds)
+
+# LLM response cache (on-disk, shared by Gemini, ChatGPT and Sonar clients)
+# Responses are keyed by a hash of (provider, model, prompt, generation config)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(__file__), '..', 'cache', 'llm_responses.sqlite3'))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # 7 days
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Sonar validation cache (per-domain relevance and identity results)
+SONAR_VALIDATION_CACHE_ENABLED = os.getenv("SONAR_VALIDATION_CACHE_ENABLED", "true").lower() == "true"
+SONAR_VALIDATION_CACHE_PATH = os.getenv("SONAR_VALIDATION_CACHE_PATH", os.path.join(os.path.dirname(__file__), '..', 'cache', 'sonar_validations.sqlite3'))
+SONAR_VALIDATION_CACHE_TTL = int(os.getenv("SONAR_VALIDATION_CACHE_TTL", str(7 * 24 * 3600)))  # 7 days
+
+# Shared HTTP client pool for AI providers (Gemini, OpenAI, Sonar, Ollama)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # seconds
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"  # Requires httpx[http2]
+
+# Global LLM admission scheduler (per-provider token buckets, 0 = unlimited)
+# Interactive UI calls are admitted before background persona tasks; background calls
+# waiting longer than LLM_SCHEDULER_STARVATION_SECONDS compete as interactive.
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_SCHEDULER_STARVATION_SECONDS = float(os.getenv("LLM_SCHEDULER_STARVATION_SECONDS", "30"))
+LLM_RATE_LIMITS = {
+    "gemini": {
+        "rpm": int(os.getenv("GEMINI_RPM", "10")),  # quota the previous Gemini limiter was sized for
+        "tpm": int(os.getenv("GEMINI_TPM", "1000000")),
+        "max_concurrency": int(os.getenv("GEMINI_MAX_CONCURRENCY", "3")),
+    },
+    "openai": {
+        "rpm": int(os.getenv("OPENAI_RPM", "500")),
+        "tpm": int(os.getenv("OPENAI_TPM", "200000")),
+        "max_concurrency": int(os.getenv("OPENAI_MAX_CONCURRENCY", "8")),
+    },
+    "sonar": {
+        "rpm": int(os.getenv("SONAR_RPM", "50")),
+        "tpm": int(os.getenv("SONAR_TPM", "0")),
+        "max_concurrency": int(os.getenv("SONAR_MAX_CONCURRENCY", "4")),
+    },
+    "ollama": {
+        "rpm": int(os.getenv("OLLAMA_RPM", "0")),
+        "tpm": int(os.getenv("OLLAMA_TPM", "0")),
+        "max_concurrency": int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")),
+    },
+}
+
+# Batched Qdrant writes: points per upsert request for bulk saves
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "64"))
+# Read each value component back after saving it (adds one request per save)
+VALUE_COMPONENT_VERIFY_WRITES = os.getenv("VALUE_COMPONENT_VERIFY_WRITES", "false").lower() == "true"
+
+# Persona search (semantic search over persona embeddings with keyword boost)
+PERSONA_SEARCH_PAGE_SIZE = int(os.getenv("PERSONA_SEARCH_PAGE_SIZE", "25"))
+PERSONA_SEARCH_SCORE_THRESHOLD = float(os.getenv("PERSONA_SEARCH_SCORE_THRESHOLD", "0.3"))
+PERSONA_SEARCH_KEYWORD_BOOST = float(os.getenv("PERSONA_SEARCH_KEYWORD_BOOST", "0.25"))
+
+# Background task registry: in-memory task state, written behind to Qdrant
+TASK_REGISTRY_FLUSH_INTERVAL = float(os.getenv("TASK_REGISTRY_FLUSH_INTERVAL", "2.0"))  # seconds between progress writes
+TASK_REGISTRY_RETENTION_HOURS = float(os.getenv("TASK_REGISTRY_RETENTION_HOURS", "24"))  # finished tasks kept in memory
+
 # Data validation
 MAX_URL_LENGTH = 500
 MAX_ANALYSIS_SIZE = 1024 * 1024  # 1MB
@@ -0,0 +1,297 @@
+"""
+Background Task Registry
+Process-wide, in-memory store for background persona tasks.
+
+The registry is the authoritative copy of every task started by this process: admission,
+progress updates and status reads are served from memory under a threading lock (background
+tasks run in their own threads and event loops). Changes are written behind to the Qdrant
+`background_tasks` collection by a flusher thread, so task state survives a crash or restart;
+tasks found running in Qdrant at startup belonged to a dead process and are marked failed.
+
+Subscribers are notified with a snapshot of the task after every change.
+"""
+
+import atexit
+import copy
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+# Import registry configuration
+try:
+    from app.config import TASK_REGISTRY_FLUSH_INTERVAL, TASK_REGISTRY_RETENTION_HOURS
+except ImportError:
+    # Fallback values if config import fails
+    TASK_REGISTRY_FLUSH_INTERVAL = 2.0
+    TASK_REGISTRY_RETENTION_HOURS = 24
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("running", "pending")
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+TaskCallback = Callable[[Dict[str, Any]], None]
+
+
+class TaskRegistry:
+    """In-memory background task store with write-behind persistence and per-user admission"""
+
+    def __init__(self, flush_interval: float = TASK_REGISTRY_FLUSH_INTERVAL,
+                 retention_hours: float = TASK_REGISTRY_RETENTION_HOURS):
+        self.flush_interval = max(0.1, flush_interval)
+        self.retention_seconds = retention_hours * 3600
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._point_ids: Dict[str, Any] = {}
+        self._active_by_user: Dict[str, str] = {}
+        self._dirty: set = set()
+        self._unknown: set = set()  # task IDs already looked up in Qdrant without a result
+        self._subscribers: Dict[Optional[str], List[TaskCallback]] = {}
+        self._recovered = False
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    # --- Admission ---
+
+    def admit(self, user_id: str, website: str) -> Tuple[str, str, str]:
+        """
+        Atomically create a task for the user unless one is already running.
+        Only ONE task per user can run at a time, regardless of website.
+
+        Returns:
+            tuple: (task_id, status, message) with status "created" or "already_running"
+        """
+        self._recover()
+        with self._lock:
+            running = self._active_task(user_id)
+            if running:
+                running_website = running.get("website", "unknown")
+                logger.info(f"[task_registry] User {user_id} already has task {running['task_id']} {running.get('status')} for {running_website}")
+                return (running["task_id"], "already_running",
+                        f"Persona generation already in progress for {running_website}. Only one generation per user at a time.")
+
+            task_id = str(uuid.uuid4())
+            now = datetime.now().isoformat()
+            task = {
+                "task_id": task_id,
+                "user_id": user_id,
+                "website": website,
+                "status": "running",
+                "progress_percent": 0,
+                "current_step": "Initializing...",
+                "step_description": "Starting persona generation process",
+                "error_message": None,
+                "result_persona": None,
+                "created_at": now,
+                "updated_at": now
+            }
+            self._tasks[task_id] = task
+            self._point_ids[task_id] = task_id  # UUID strings are valid Qdrant point IDs
+            self._active_by_user[user_id] = task_id
+            self._dirty.add(task_id)
+            snapshot = copy.deepcopy(task)
+
+        logger.info(f"[task_registry] Created background task {task_id} for user {user_id}")
+        self._wake.set()  # persist new tasks promptly
+        self._ensure_flusher()
+        self._notify(snapshot)
+        return (task_id, "created", f"New task created for {website}")
+
+    # --- Updates ---
+
+    def update(self, task_id: str, **updates) -> bool:
+        """Apply updates to a task. Returns False if the task is unknown."""
+        if task_id not in self._tasks:
+            self.get(task_id)  # tasks of an earlier run are loaded on first access
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                logger.warning(f"[task_registry] Task {task_id} not found for update")
+                return False
+            task.update(updates)
+            task["updated_at"] = datetime.now().isoformat()
+            finished = task.get("status") not in ACTIVE_STATUSES
+            if finished and self._active_by_user.get(task.get("user_id")) == task_id:
+                del self._active_by_user[task["user_id"]]
+            self._dirty.add(task_id)
+            snapshot = copy.deepcopy(task)
+
+        if finished:
+            self._wake.set()  # final states are persisted right away
+        self._ensure_flusher()
+        self._notify(snapshot)
+        return True
+
+    # --- Reads ---
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a task. Tasks not started by this process are looked up in Qdrant once."""
+        self._recover()
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                return copy.deepcopy(task)
+            if task_id in self._unknown:
+                return None
+
+        loaded = self._load_task(task_id)
+        with self._lock:
+            if loaded is None:
+                self._unknown.add(task_id)
+                return None
+            point_id, payload = loaded
+            task = self._tasks.setdefault(task_id, payload)
+            self._point_ids.setdefault(task_id, point_id)
+            return copy.deepcopy(task)
+
+    def get_active_for_user(self, user_id: str, website: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The user's running or pending task, optionally only if it is for `website`."""
+        self._recover()
+        with self._lock:
+            task = self._active_task(user_id)
+            if task is None or (website is not None and task.get("website") != website):
+                return None
+            return copy.deepcopy(task)
+
+    def get_user_tasks(self, user_id: str) -> List[Dict[str, Any]]:
+        """Snapshots of every task of the user held in memory."""
+        self._recover()
+        with self._lock:
+            return [copy.deepcopy(task) for task in self._tasks.values() if task.get("user_id") == user_id]
+
+    def _active_task(self, user_id: str) -> Optional[Dict[str, Any]]:
+        task_id = self._active_by_user.get(user_id)
+        task = self._tasks.get(task_id) if task_id else None
+        return task if task and task.get("status") in ACTIVE_STATUSES else None
+
+    # --- Notifications ---
+
+    def subscribe(self, callback: TaskCallback, task_id: Optional[str] = None) -> Callable[[], None]:
+        """Call `callback(snapshot)` after every change of `task_id` (or of any task if None).
+        Callbacks run on the thread that made the change. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.setdefault(task_id, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(task_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(task_id, None)
+        return unsubscribe
+
+    def _notify(self, snapshot: Dict[str, Any]):
+        with self._lock:
+            callbacks = list(self._subscribers.get(snapshot["task_id"], [])) + list(self._subscribers.get(None, []))
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"[task_registry] Subscriber failed for task {snapshot['task_id']}: {e}")
+
+    # --- Persistence ---
+
+    def flush(self) -> int:
+        """Write all changed tasks to Qdrant in one batched upsert. Returns the number written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            dirty = {self._point_ids[task_id]: copy.deepcopy(self._tasks[task_id]) for task_id in self._dirty}
+            self._dirty.clear()
+
+        try:
+            from app.database import persist_background_tasks
+            return persist_background_tasks(dirty)
+        except Exception as e:
+            logger.error(f"[task_registry] Failed to persist {len(dirty)} background tasks: {e}")
+            with self._lock:
+                # Re-queue tasks that were not changed again meanwhile
+                self._dirty.update(payload["task_id"] for payload in dirty.values())
+            return 0
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name="task-registry-flusher", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            self._evict_finished()
+
+    def _evict_finished(self):
+        """Drop finished, persisted tasks older than the retention window from memory."""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            for task_id, task in list(self._tasks.items()):
+                if task.get("status") in ACTIVE_STATUSES or task_id in self._dirty:
+                    continue
+                try:
+                    updated = datetime.fromisoformat(str(task.get("updated_at"))).timestamp()
+                except ValueError:
+                    updated = 0
+                if updated < cutoff:
+                    del self._tasks[task_id]
+                    self._point_ids.pop(task_id, None)
+
+    def _load_task(self, task_id: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        try:
+            from app.database import load_background_tasks
+            loaded = load_background_tasks(task_id=task_id)
+            return loaded[0] if loaded else None
+        except Exception as e:
+            logger.error(f"[task_registry] Could not load task {task_id}: {e}")
+            return None
+
+    def _recover(self):
+        """Once per process: mark tasks left running by a previous process as failed."""
+        if self._recovered:
+            return
+        with self._lock:
+            if self._recovered:
+                return
+            self._recovered = True
+        try:
+            from app.database import load_background_tasks
+            orphaned = load_background_tasks(statuses=list(ACTIVE_STATUSES))
+        except Exception as e:
+            logger.error(f"[task_registry] Could not recover background tasks: {e}")
+            return
+        if not orphaned:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            for point_id, payload in orphaned:
+                task_id = payload.get("task_id")
+                if not task_id or task_id in self._tasks:
+                    continue
+                payload.update(status="failed", error_message="Interrupted by application restart", updated_at=now)
+                self._tasks[task_id] = payload
+                self._point_ids[task_id] = point_id
+                self._dirty.add(task_id)
+        logger.warning(f"[task_registry] Marked {len(orphaned)} interrupted background tasks as failed")
+        self._wake.set()
+        self._ensure_flusher()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Task counts for monitoring"""
+        with self._lock:
+            return {
+                "tasks": len(self._tasks),
+                "active": len(self._active_by_user),
+                "unpersisted": len(self._dirty),
+            }
+
+
+# Global instance for easy access
+task_registry = TaskRegistry()
+atexit.register(task_registry.flush)
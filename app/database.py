@@ -27,6 +27,18 @@ from app.config import (
 )
 import asyncio
 import hashlib
+import threading
+try:
+    from app.config import QDRANT_UPSERT_BATCH_SIZE, VALUE_COMPONENT_VERIFY_WRITES
+except ImportError:
+    QDRANT_UPSERT_BATCH_SIZE = 64
+    VALUE_COMPONENT_VERIFY_WRITES = False
+try:
+    from app.config import PERSONA_SEARCH_PAGE_SIZE, PERSONA_SEARCH_SCORE_THRESHOLD, PERSONA_SEARCH_KEYWORD_BOOST
+except ImportError:
+    PERSONA_SEARCH_PAGE_SIZE = 25
+    PERSONA_SEARCH_SCORE_THRESHOLD = 0.3
+    PERSONA_SEARCH_KEYWORD_BOOST = 0.25
 from app.categories import COMPONENT_STRUCTURES
 from app.utils.spinner import database_spinner, ai_processing_spinner
 import app.utils as utils
@@ -69,70 +81,203 @@ upsert_logger = logging.getLogger("upsert")
 error_logger = logging.getLogger("error")
 info_logger = logging.getLogger("info")
 
-# Collection schemas (for Qdrant, just for reference, not used for creation)
+# Collections that are only ever read by ID or payload filter get the "payload" profile: a 1-dim
+# placeholder vector instead of a dummy VECTOR_DIM/128-dim one, which keeps upserts small and
+# saves Qdrant RAM and disk. Collections with the "vector" profile store real embeddings.
+PAYLOAD_ONLY_VECTOR_SIZE = 1
+PAYLOAD_ONLY_VECTOR = [1.0]
+
+# Collection schemas used by ensure_collections_exist
 COLLECTIONS = {
     GLOBAL_SETTINGS_COLLECTION: {
         "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     COLLECTION_NAME: {
         "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "website_structure": {
         "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "value_components": {
-        "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     },
     "personas": {
         "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "background_tasks": {
-        "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     },
     "users": {
-        "vector_size": 128,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     },
     "user_sessions": {
-        "vector_size": 128,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     },
     "user_activities": {
-        "vector_size": 128,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     },
     "archived_data": {
         "vector_size": 128,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "company_profiles": {
         "vector_size": 128,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "company_settings": {
         "vector_size": 128,
-        "distance": "Cosine"
+        "distance": "Cosine",
+        "profile": "vector"
     },
     "framework_customizations": {
-        "vector_size": VECTOR_DIM,
-        "distance": "Cosine"
+        "vector_size": PAYLOAD_ONLY_VECTOR_SIZE,
+        "distance": "Cosine",
+        "profile": "payload"
     }
 }
 
+PAYLOAD_ONLY_COLLECTIONS = [name for name, schema in COLLECTIONS.items() if schema.get("profile") == "payload"]
+
+def is_payload_only(collection_name: str) -> bool:
+    """True if the collection uses the payload-only profile."""
+    return COLLECTIONS.get(collection_name, {}).get("profile") == "payload"
+
+def placeholder_vector(collection_name: str, default_size: int = VECTOR_DIM) -> List[float]:
+    """Dummy vector to store with a point in a collection whose vectors are never searched."""
+    if is_payload_only(collection_name):
+        return list(PAYLOAD_ONLY_VECTOR)
+    return [0.0] * COLLECTIONS.get(collection_name, {}).get("vector_size", default_size)
+
+# Namespace for deterministic value component point IDs (see value_component_point_id)
+VALUE_COMPONENT_ID_NAMESPACE = uuid.UUID("6f1c8a52-3d4e-5b7a-9c0d-2e4f6a8b1c3d")
+
 PERSONA_COLLECTION = "personas"
 PERSONA_VECTOR_DIM = VECTOR_DIM  # Use your existing VECTOR_DIM
 GENERATOR_VERSION = "1.0.0"  # Increment this whenever persona generator logic/structure changes
 
 # --- Qdrant helpers ---
+def _get_collection_vector_size(collection_name: str) -> Optional[int]:
+    """Vector size of an existing collection, or None if it cannot be determined."""
+    collection_info = QDRANT_CLIENT.get_collection(collection_name)
+    vectors_config = collection_info.config.params.vectors
+    if hasattr(vectors_config, 'size'):
+        return vectors_config.size
+    if hasattr(vectors_config, 'params') and hasattr(vectors_config.params, 'size'):
+        return vectors_config.params.size
+    return None
+
+def _copy_collection_points(source: str, target: str, batch_size: Optional[int] = None) -> int:
+    """Copy all points (IDs and payloads) from source into the payload-only collection target."""
+    batch_size = max(1, batch_size or QDRANT_UPSERT_BATCH_SIZE)
+    copied = 0
+    scroll_offset = None
+    with BatchUpsertWriter(target, batch_size=batch_size) as writer:
+        while True:
+            points, next_offset = QDRANT_CLIENT.scroll(
+                collection_name=source,
+                limit=batch_size,
+                offset=scroll_offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            for point in points:
+                writer.add(point.id, list(PAYLOAD_ONLY_VECTOR), point.payload or {})
+            copied += len(points)
+            if not next_offset:
+                break
+            scroll_offset = next_offset
+    return copied
+
+def migrate_collection_to_payload_only(collection_name: str) -> int:
+    """Move an existing collection with dummy vectors over to the payload-only profile, keeping point IDs and payloads.
+
+    Qdrant cannot change vector size in place, so points are copied to a staging collection, the original is
+    recreated with a 1-dim vector and the points are copied back. If a previous run was interrupted, the
+    staging collection is picked up again. Returns the number of points migrated."""
+    staging = f"{collection_name}__payload_migration"
+    forget_collection(collection_name)
+    distance = COLLECTIONS.get(collection_name, {}).get("distance", "Cosine")
+    vectors_config = models.VectorParams(size=PAYLOAD_ONLY_VECTOR_SIZE, distance=getattr(models.Distance, distance.upper()))
+    staging_exists = collection_exists(staging)
+    # The original is missing only if an earlier run was interrupted right after deleting it
+    original_exists = collection_exists(collection_name)
+    current_size = _get_collection_vector_size(collection_name) if original_exists else None
+
+    if original_exists and current_size == PAYLOAD_ONLY_VECTOR_SIZE and not staging_exists:
+        return 0
+
+    if original_exists and current_size != PAYLOAD_ONLY_VECTOR_SIZE:
+        # Stage everything first; upserts are idempotent, so a partial earlier copy is simply redone
+        if not staging_exists:
+            QDRANT_CLIENT.create_collection(collection_name=staging, vectors_config=vectors_config)
+        staged = _copy_collection_points(collection_name, staging)
+        logger.info(f"[migration] Staged {staged} points from {collection_name} (vector size {current_size})")
+        QDRANT_CLIENT.delete_collection(collection_name)
+        original_exists = False
+
+    if not original_exists:
+        QDRANT_CLIENT.create_collection(collection_name=collection_name, vectors_config=vectors_config)
+    _ensure_collection_indexes(collection_name)
+    migrated = _copy_collection_points(staging, collection_name)
+    QDRANT_CLIENT.delete_collection(staging)
+    logger.info(f"[migration] Migrated {migrated} points in {collection_name} to the payload-only profile")
+    return migrated
+
+def pending_payload_only_migrations() -> List[str]:
+    """Payload-only collections that still store dummy vectors (or have an interrupted migration)."""
+    pending = []
+    for collection_name in PAYLOAD_ONLY_COLLECTIONS:
+        try:
+            if _get_collection_vector_size(collection_name) != PAYLOAD_ONLY_VECTOR_SIZE:
+                pending.append(collection_name)
+                continue
+        except Exception:
+            pass  # Collection does not exist yet
+        if collection_exists(f"{collection_name}__payload_migration"):
+            pending.append(collection_name)
+    return pending
+
+def migrate_payload_only_collections() -> Dict[str, Any]:
+    """Migrate every payload-only collection that still stores dummy vectors. Returns per-collection counts or errors."""
+    results: Dict[str, Any] = {}
+    for collection_name in PAYLOAD_ONLY_COLLECTIONS:
+        try:
+            if not collection_exists(collection_name) and not collection_exists(f"{collection_name}__payload_migration"):
+                results[collection_name] = 0
+                continue
+            results[collection_name] = migrate_collection_to_payload_only(collection_name)
+        except Exception as e:
+            logger.error(f"[migration] Error migrating {collection_name} to the payload-only profile: {e}")
+            results[collection_name] = f"ERROR: {e}"
+    return results
+
 def ensure_collection(collection_name: str, vector_size: int, distance: str = "Cosine"):
-    """Ensure Qdrant collection exists with correct vector dimensions."""
+    """Ensure Qdrant collection exists with correct vector dimensions.
+    Payload-only collections always use the 1-dim placeholder and are migrated, not recreated, on mismatch."""
+    if is_payload_only(collection_name):
+        vector_size = PAYLOAD_ONLY_VECTOR_SIZE
     collection_recreated = False
+    needs_migration = False
     try:
         collection_info = QDRANT_CLIENT.get_collection(collection_name)
         # Check if vector dimension matches - if not, recreate collection
@@ -147,8 +292,12 @@ def ensure_collection(collection_name: str, vector_size: int, distance: str = "C
         except Exception as e:
             logger.warning(f"Could not determine vector size for {collection_name}: {e}")
         
+        # Payload-only collections keep their data: move the points over instead of recreating
+        if current_vector_size is not None and current_vector_size != vector_size and is_payload_only(collection_name):
+            logger.warning(f"Collection {collection_name} has vector size {current_vector_size}, migrating to the payload-only profile...")
+            needs_migration = True
         # If dimension mismatch, recreate collection (this deletes existing data)
-        if current_vector_size is not None and current_vector_size != vector_size:
+        elif current_vector_size is not None and current_vector_size != vector_size:
             logger.warning(f"Collection {collection_name} has vector size {current_vector_size}, expected {vector_size}. Recreating collection...")
             QDRANT_CLIENT.recreate_collection(
                 collection_name=collection_name,
@@ -159,58 +308,189 @@ def ensure_collection(collection_name: str, vector_size: int, distance: str = "C
         else:
             logger.debug(f"Collection {collection_name} exists with correct vector size {vector_size}")
     except Exception:
-        # Collection doesn't exist, create it
-        QDRANT_CLIENT.recreate_collection(
-            collection_name=collection_name,
-            vectors_config=models.VectorParams(size=vector_size, distance=getattr(models.Distance, distance.upper()))
-        )
-        logger.info(f"Created Qdrant collection: {collection_name} with vector size {vector_size}")
-        collection_recreated = True
+        if is_payload_only(collection_name) and collection_exists(f"{collection_name}__payload_migration"):
+            # An interrupted migration left the data in the staging collection
+            needs_migration = True
+        else:
+            # Collection doesn't exist, create it
+            QDRANT_CLIENT.recreate_collection(
+                collection_name=collection_name,
+                vectors_config=models.VectorParams(size=vector_size, distance=getattr(models.Distance, distance.upper()))
+            )
+            logger.info(f"Created Qdrant collection: {collection_name} with vector size {vector_size}")
+            collection_recreated = True
+    
+    # Outside the try above, so a failed migration never falls through to recreating (and emptying) the collection
+    if needs_migration:
+        migrate_collection_to_payload_only(collection_name)
     
     # After creating/recreating collection, ensure required indexes exist
     if collection_recreated:
         _ensure_collection_indexes(collection_name)
 
+# Payload indexes required by the filtered lookups below, per collection. Every field used in a
+# find_points/delete_points filter must be declared here; they are created at startup.
+COLLECTION_INDEXES = {
+    COLLECTION_NAME: {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "website": models.PayloadSchemaType.KEYWORD,
+    },
+    "website_structure": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+    },
+    "value_components": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "name": models.PayloadSchemaType.KEYWORD,
+        "main_category": models.PayloadSchemaType.KEYWORD,
+        "category": models.PayloadSchemaType.KEYWORD,
+    },
+    "framework_customizations": {
+        "industry_name": models.PayloadSchemaType.KEYWORD,
+    },
+    "personas": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "source_website": models.PayloadSchemaType.KEYWORD,
+        "id": models.PayloadSchemaType.KEYWORD,
+        "industry": models.PayloadSchemaType.KEYWORD,
+        "search_text": models.PayloadSchemaType.TEXT,
+    },
+    "background_tasks": {
+        "task_id": models.PayloadSchemaType.KEYWORD,
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "status": models.PayloadSchemaType.KEYWORD,
+        "website": models.PayloadSchemaType.KEYWORD,
+    },
+    "users": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "username": models.PayloadSchemaType.KEYWORD,
+    },
+    "user_sessions": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "session_id": models.PayloadSchemaType.KEYWORD,
+        "session_token": models.PayloadSchemaType.KEYWORD,
+        "public_id": models.PayloadSchemaType.KEYWORD,
+        "is_active": models.PayloadSchemaType.BOOL,
+        "created_at": models.PayloadSchemaType.FLOAT,
+        "start_time": models.PayloadSchemaType.FLOAT,
+    },
+    "user_activities": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+        "timestamp": models.PayloadSchemaType.FLOAT,
+    },
+    "archived_data": {
+        "original_user_id": models.PayloadSchemaType.KEYWORD,
+    },
+    "company_profiles": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+    },
+    "company_settings": {
+        "user_id": models.PayloadSchemaType.KEYWORD,
+    },
+}
+
 def _ensure_collection_indexes(collection_name: str):
-    """Ensure required payload indexes exist for a collection after recreation."""
+    """Ensure the payload indexes declared in COLLECTION_INDEXES exist for a collection."""
     try:
-        # Define indexes needed for each collection
-        indexes = {
-            "value_components": [
-                {"field": "user_id", "type": models.PayloadSchemaType.KEYWORD},
-                {"field": "name", "type": models.PayloadSchemaType.KEYWORD},
-                {"field": "main_category", "type": models.PayloadSchemaType.KEYWORD},
-                {"field": "category", "type": models.PayloadSchemaType.KEYWORD}
-            ],
-            "framework_customizations": [
-                {"field": "industry_name", "type": models.PayloadSchemaType.KEYWORD}
-            ],
-            "personas": [
-                {"field": "user_id", "type": models.PayloadSchemaType.KEYWORD},
-                {"field": "source_website", "type": models.PayloadSchemaType.KEYWORD}
-            ],
-            "background_tasks": [
-                {"field": "task_id", "type": models.PayloadSchemaType.KEYWORD},
-                {"field": "user_id", "type": models.PayloadSchemaType.KEYWORD}
-            ]
-        }
-        
-        if collection_name in indexes:
-            for index_config in indexes[collection_name]:
-                try:
-                    QDRANT_CLIENT.create_payload_index(
-                        collection_name=collection_name,
-                        field_name=index_config["field"],
-                        field_schema=index_config["type"]
-                    )
-                    logger.info(f"Created index on '{index_config['field']}' for collection '{collection_name}'")
-                except Exception as e:
-                    # Index might already exist (if collection wasn't actually recreated)
-                    if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
-                        logger.warning(f"Could not create index on '{index_config['field']}' for '{collection_name}': {e}")
+        for field_name, field_schema in COLLECTION_INDEXES.get(collection_name, {}).items():
+            try:
+                QDRANT_CLIENT.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+                logger.info(f"Created index on '{field_name}' for collection '{collection_name}'")
+            except Exception as e:
+                # Index might already exist (if collection wasn't actually recreated)
+                if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
+                    logger.warning(f"Could not create index on '{field_name}' for '{collection_name}': {e}")
     except Exception as e:
         logger.warning(f"Error ensuring indexes for collection '{collection_name}': {e}")
 
+# --- Index-aware query layer ---
+class QueryIndexError(RuntimeError):
+    """A filtered lookup used a field without a payload index. Raised instead of scanning the collection."""
+
+def _build_filter(collection_name: str, match: Optional[Dict[str, Any]] = None,
+                  match_any: Optional[Dict[str, List[Any]]] = None,
+                  ranges: Optional[Dict[str, models.Range]] = None) -> Optional[models.Filter]:
+    """Build an AND filter, checking every field against COLLECTION_INDEXES."""
+    declared = COLLECTION_INDEXES.get(collection_name, {})
+    must = []
+    for field, value in (match or {}).items():
+        must.append(models.FieldCondition(key=field, match=models.MatchValue(value=value)))
+    for field, values in (match_any or {}).items():
+        must.append(models.FieldCondition(key=field, match=models.MatchAny(any=list(values))))
+    for field, range_ in (ranges or {}).items():
+        must.append(models.FieldCondition(key=field, range=range_))
+    undeclared = [condition.key for condition in must if condition.key not in declared]
+    if undeclared:
+        raise QueryIndexError(f"No payload index declared for {undeclared} in '{collection_name}'; add it to COLLECTION_INDEXES")
+    return models.Filter(must=must) if must else None  # type: ignore[arg-type]
+
+def _is_missing_index_error(error: Exception) -> bool:
+    return "index required" in str(error).lower()
+
+def find_points(collection_name: str, match: Optional[Dict[str, Any]] = None,
+                match_any: Optional[Dict[str, List[Any]]] = None,
+                ranges: Optional[Dict[str, models.Range]] = None,
+                limit: Optional[int] = None, page_size: int = 256,
+                with_payload: Any = True) -> List[Any]:
+    """Return every point matching the filter, following scroll pagination to the end (or up to `limit`).
+
+    Fields must have a declared payload index. If Qdrant reports a missing index, the declared index is
+    created and the query retried once; if it still fails, QueryIndexError is raised."""
+    scroll_filter = _build_filter(collection_name, match, match_any, ranges)
+    for attempt in range(2):
+        try:
+            points: List[Any] = []
+            scroll_offset = None
+            while True:
+                batch_limit = page_size if limit is None else min(page_size, limit - len(points))
+                batch, next_offset = QDRANT_CLIENT.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=batch_limit,
+                    offset=scroll_offset,
+                    with_payload=with_payload,
+                    with_vectors=False
+                )
+                points.extend(batch)
+                if not next_offset or (limit is not None and len(points) >= limit):
+                    return points
+                scroll_offset = next_offset
+        except Exception as e:
+            if not _is_missing_index_error(e):
+                raise
+            if attempt == 0:
+                logger.warning(f"[database.py] Missing payload index on '{collection_name}', creating declared indexes and retrying")
+                _ensure_collection_indexes(collection_name)
+                continue
+            raise QueryIndexError(f"Payload index missing on '{collection_name}' for filter {scroll_filter}: {e}") from e
+    return []
+
+def find_payloads(collection_name: str, **kwargs) -> List[Dict[str, Any]]:
+    """Payloads of every point matching the filter (see find_points)."""
+    return [point.payload for point in find_points(collection_name, **kwargs)]
+
+def find_one(collection_name: str, **kwargs) -> Optional[Any]:
+    """First point matching the filter, or None."""
+    points = find_points(collection_name, limit=1, **kwargs)
+    return points[0] if points else None
+
+def delete_points(collection_name: str, match: Optional[Dict[str, Any]] = None,
+                  match_any: Optional[Dict[str, List[Any]]] = None,
+                  ranges: Optional[Dict[str, models.Range]] = None, wait: bool = True):
+    """Delete every point matching the filter in a single request. An empty filter is refused."""
+    delete_filter = _build_filter(collection_name, match, match_any, ranges)
+    if delete_filter is None:
+        raise ValueError(f"Refusing to delete from '{collection_name}' without a filter")
+    try:
+        return QDRANT_CLIENT.delete(collection_name=collection_name, points_selector=models.FilterSelector(filter=delete_filter), wait=wait)
+    except Exception as e:
+        if _is_missing_index_error(e):
+            raise QueryIndexError(f"Payload index missing on '{collection_name}' for filter {delete_filter}: {e}") from e
+        raise
+
 # --- Connection logic ---
 def get_connection() -> bool:
     """Qdrant is stateless, so just check if server is up."""
@@ -254,8 +534,45 @@ def create_collection(collection_name: str, schema: Dict[str, Any]):
 
 def drop_collection(collection_name: str):
     QDRANT_CLIENT.delete_collection(collection_name)
+    forget_collection(collection_name)
     logger.info(f"Qdrant collection dropped: {collection_name}")
 
+# --- Collection registry ---
+# Collections (with their payload indexes) verified by this process. Existence checks on hot paths
+# are served from here instead of asking Qdrant every time; anything that deletes or recreates a
+# collection must call forget_collection() so the next check verifies it again.
+_verified_collections: set = set()
+_verified_collections_lock = threading.RLock()
+
+def is_collection_verified(collection_name: str) -> bool:
+    """True if the collection was already verified (or created) by this process."""
+    with _verified_collections_lock:
+        return collection_name in _verified_collections
+
+def mark_collection_verified(collection_name: str):
+    """Record that the collection and its payload indexes exist."""
+    with _verified_collections_lock:
+        _verified_collections.add(collection_name)
+
+def forget_collection(collection_name: Optional[str] = None):
+    """Refresh hook: drop one collection (or all) from the registry after it was deleted or recreated."""
+    with _verified_collections_lock:
+        if collection_name is None:
+            _verified_collections.clear()
+        else:
+            _verified_collections.discard(collection_name)
+
+def ensure_collection_once(collection_name: str, vector_size: int, distance: str = "Cosine"):
+    """ensure_collection() plus its declared payload indexes, checked against Qdrant once per process."""
+    if is_collection_verified(collection_name):
+        return
+    with _verified_collections_lock:
+        if collection_name in _verified_collections:
+            return
+        ensure_collection(collection_name, vector_size, distance)
+        _ensure_collection_indexes(collection_name)
+        _verified_collections.add(collection_name)
+
 async def ensure_collections_exist():
     try:
         if not await ensure_connection():
@@ -266,6 +583,8 @@ async def ensure_collections_exist():
         # Also ensure indexes exist for all collections (even if not recreated)
         for collection_name in COLLECTIONS.keys():
             _ensure_collection_indexes(collection_name)
+            mark_collection_verified(collection_name)
+        backfill_persona_search_text()
         logger.info("All Qdrant collections and indexes ensured.")
         return True
     except Exception as e:
@@ -280,6 +599,68 @@ def upsert_point(collection_name: str, point_id: int, vector: List[float], paylo
     )
     logger.info(f"Upserted point {point_id} in {collection_name}")
 
+def upsert_points(collection_name: str, points: Sequence[models.PointStruct], batch_size: Optional[int] = None, wait: bool = True) -> int:
+    """Upsert points in batches of batch_size. All batches but the last are sent with wait=False, so
+    Qdrant applies them while the next request is on the wire; the last one honours `wait`."""
+    batch_size = max(1, batch_size or QDRANT_UPSERT_BATCH_SIZE)
+    points = list(points)
+    for start in range(0, len(points), batch_size):
+        batch = points[start:start + batch_size]
+        is_last = start + batch_size >= len(points)
+        QDRANT_CLIENT.upsert(collection_name=collection_name, points=batch, wait=wait if is_last else False)
+    if points:
+        logger.info(f"Upserted {len(points)} points in {collection_name} ({(len(points) + batch_size - 1) // batch_size} requests)")
+    return len(points)
+
+class BatchUpsertWriter:
+    """Buffers points for one collection and upserts them in batches.
+
+    Full batches are sent with wait=False (pipelined); the final flush on exit uses wait=True so
+    everything written is visible once the `with` block ends. Nothing is flushed if the block raises.
+
+        with BatchUpsertWriter("value_components") as writer:
+            for component in components:
+                writer.add(point_id, vector, payload)
+    """
+
+    def __init__(self, collection_name: str, batch_size: Optional[int] = None):
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size or QDRANT_UPSERT_BATCH_SIZE)
+        self._buffer: List[models.PointStruct] = []
+        self.written = 0
+        self.requests = 0
+
+    def add(self, point_id, vector: List[float], payload: dict):
+        self._buffer.append(models.PointStruct(id=point_id, vector=vector, payload=payload))
+        # Send a full batch only once another point is waiting, so the final flush is never empty
+        # and its wait=True covers every pipelined batch before it
+        if len(self._buffer) > self.batch_size:
+            self._send(self._buffer[:self.batch_size], wait=False)
+            self._buffer = self._buffer[self.batch_size:]
+
+    def flush(self, wait: bool = True):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self._send(batch, wait)
+
+    def _send(self, batch: List[models.PointStruct], wait: bool):
+        QDRANT_CLIENT.upsert(collection_name=self.collection_name, points=batch, wait=wait)
+        self.written += len(batch)
+        self.requests += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush(wait=True)
+            logger.info(f"Upserted {self.written} points in {self.collection_name} ({self.requests} requests)")
+        else:
+            logger.error(f"Discarding {len(self._buffer)} buffered points for {self.collection_name}: {exc}")
+            self._buffer = []
+        return False
+
 def search_points(collection_name: str, query_vector: List[float], limit: int = 5, filter_payload: Optional[dict] = None):
     filter_obj = None
     if filter_payload:
@@ -309,14 +690,7 @@ def search_websites(*args, **kwargs):
 def get_website_details(website: str) -> List[Dict[str, Any]]:
     """Retrieve all analyses for a given website from Qdrant."""
     try:
-        # For now, just search by website field in payload
-        results = QDRANT_CLIENT.scroll(
-            collection_name=COLLECTION_NAME,
-            scroll_filter=models.Filter(must=[models.FieldCondition(key="website", match=models.MatchValue(value=website))]),
-            with_payload=True,
-            with_vectors=False
-        )
-        return [point.payload for point in results[0]]
+        return find_payloads(COLLECTION_NAME, match={"website": website})
     except Exception as e:
         logger.error(f"Error getting website details: {str(e)}")
         return []
@@ -336,246 +710,159 @@ def save_analysis(analysis: Dict[str, Any]) -> bool:
 def get_value_component(name: str) -> Optional[Dict[str, Any]]:
     """Get a single value component by name from Qdrant."""
     try:
-        filter_ = models.Filter(must=[models.FieldCondition(key="name", match=models.MatchValue(value=name))])  # type: ignore[arg-type]
-        try:
-            results = QDRANT_CLIENT.scroll(
-                collection_name="value_components",
-                scroll_filter=filter_,
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, fall back to manual filtering
-            if "index" in str(e).lower() or "Index required" in str(e):
-                logger.warning(f"[database.py] Index not found for name, using manual filtering")
-                # Get all points and filter manually
-                all_points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="value_components",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Manual filtering
-                for point in all_points:
-                    if point.payload.get("name", "").lower() == name.lower():
-                        return point.payload
-                return None
-            else:
-                raise e
-        
-        for point in results[0]:
-            return point.payload
-        return None
+        point = find_one("value_components", match={"name": (name or '').strip().lower()})
+        return point.payload if point else None
     except Exception as e:
         logger.error(f"Error getting value component: {str(e)}")
         return None
 
 def delete_value_component_by_key(main_category: str, category: str, name: str, user_id: Optional[str] = None) -> None:
-    """Delete any value component in Qdrant with the same main_category, category, and name. Also remove any entries where both original_value and ai_processed_value are empty. Logs diagnostics for debugging. Now also attempts a fuzzy delete for similar keys."""
+    """Delete any value component in Qdrant with the same main_category, category, and name (optionally only for user_id).
+    Keys are stored normalized, so one indexed filtered delete covers every copy of the key."""
     try:
         # Normalize keys
         main_category_norm = (main_category or '').strip().lower()
         category_norm = (category or '').strip().lower()
         name_norm = (name or '').strip().lower()
-        logging.warning(f"[database.py][DIAG] Attempting delete for main_category='{main_category_norm}', category='{category_norm}', name='{name_norm}', user_id='{user_id}'")
-        
-        # Build filter conditions
-        filter_conditions = [
-            models.FieldCondition(key="main_category", match=models.MatchValue(value=main_category_norm)),
-            models.FieldCondition(key="category", match=models.MatchValue(value=category_norm)),
-            models.FieldCondition(key="name", match=models.MatchValue(value=name_norm)),
-        ]
-        
-        # Add user_id filter if provided
+        match = {"main_category": main_category_norm, "category": category_norm, "name": name_norm}
         if user_id:
-            filter_conditions.append(models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id)))
-        
-        filter_ = models.Filter(must=filter_conditions)  # type: ignore[arg-type]
+            match["user_id"] = user_id
+        delete_points("value_components", match=match)
+        logger.info(f"[database.py] Deleted value_component(s) for {main_category_norm}/{category_norm}/{name_norm}, user_id='{user_id}'")
+    except Exception as e:
+        logging.error(f"[database.py][ERROR] Exception in delete_value_component_by_key: {e}")
+    finally:
+        invalidate_value_components_cache(user_id)
+
+def _build_value_component_payload(component: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalize keys, stamp created_at and fill in user_id. Returns None for components with no values."""
+    # --- Normalize keys ---
+    main_category = (component.get('main_category','') or '').strip().lower()
+    category = (component.get('category','') or '').strip().lower()
+    name = (component.get('name','') or '').strip().lower()
+    
+    # --- Prevent saving empty entries ---
+    if not component.get('original_value', '').strip() and not component.get('ai_processed_value', '').strip():
+        logging.warning(f"[save_value_component] Skipping save: both original_value and ai_processed_value are empty for {main_category}/{category}/{name}")
+        return None
+    
+    # --- Add created_at timestamp and ensure user_id is present ---
+    payload = component.copy()
+    payload['main_category'] = main_category
+    payload['category'] = category
+    payload['name'] = name
+    payload['created_at'] = datetime.utcnow().isoformat()
+    
+    # Ensure user_id is present (for backward compatibility)
+    if 'user_id' not in payload:
+        # Use demo_profile_manager to get current user_id (handles demo/normal mode correctly)
         try:
-            points = QDRANT_CLIENT.scroll(
-                collection_name="value_components",
-                scroll_filter=filter_,
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, fall back to manual filtering
-            if "index" in str(e).lower() or "Index required" in str(e):
-                logging.warning(f"[database.py] Index not found for main_category/category/name, using manual filtering")
-                # Get all points and filter manually
-                all_points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="value_components",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Manual filtering
-                filtered_points = []
-                for point in all_points:
-                    payload = point.payload
-                    if (payload.get("main_category", "").lower() == main_category_norm and
-                        payload.get("category", "").lower() == category_norm and
-                        payload.get("name", "").lower() == name_norm):
-                        if not user_id or payload.get("user_id") == user_id:
-                            filtered_points.append(point)
-                points = (filtered_points, None)
-            else:
-                raise e
-        ids_to_delete = [point.id for point in points[0]]
-        logging.warning(f"[database.py][DIAG] IDs to delete for {main_category_norm}/{category_norm}/{name_norm}: {ids_to_delete}")
-        logging.warning(f"[database.py][DIAG] Payloads to delete: {[p.payload for p in points[0]]}")
-        if ids_to_delete:
-            QDRANT_CLIENT.delete(
-                collection_name="value_components",
-                points_selector=models.PointIdsList(points=ids_to_delete)
-            )
-            logging.warning(f"[database.py][DIAG] Deleted {len(ids_to_delete)} value_component(s) for {main_category_norm}/{category_norm}/{name_norm}")
-        else:
-            logging.warning(f"[database.py][DIAG] No value_components found to delete for {main_category_norm}/{category_norm}/{name_norm}")
-        # --- Additional: Remove any entries for this key where both values are empty ---
+            from app.components.demo_companies.demo_profile_manager import demo_profile_manager
+            payload['user_id'] = demo_profile_manager.get_current_user_id()
+        except Exception:
+            # Fallback to session state if demo_profile_manager unavailable
+            import streamlit as st
+            payload['user_id'] = st.session_state.get('user_id', 'default_user')
+    return payload
+
+def value_component_point_id(user_id: Optional[str], main_category: str, category: str, name: str) -> str:
+    """Deterministic point ID for a value component, so re-saving the same logical key overwrites in place."""
+    key = "|".join((part or '').strip().lower() for part in (user_id, main_category, category, name))
+    return str(uuid.uuid5(VALUE_COMPONENT_ID_NAMESPACE, key))
+
+def _delete_legacy_value_component_points(saved: List[tuple]):
+    """Delete points saved under older random IDs for the keys just written.
+
+    `saved` holds (point_id, payload) pairs. Issues one filtered delete per user, so the cost scales with
+    the number of items written rather than the size of the collection."""
+    by_user: Dict[str, List[tuple]] = {}
+    for point_id, payload in saved:
+        by_user.setdefault(payload.get('user_id'), []).append((point_id, payload))
+    for user_id, items in by_user.items():
         try:
-            points_after, _ = QDRANT_CLIENT.scroll(
-                collection_name="value_components",
-                scroll_filter=filter_,
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, use manual filtering
-            if "index" in str(e).lower() or "Index required" in str(e):
-                all_points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="value_components",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                points_after = [p for p in all_points if 
-                               p.payload.get("main_category", "").lower() == main_category_norm and
-                               p.payload.get("category", "").lower() == category_norm and
-                               p.payload.get("name", "").lower() == name_norm and
-                               (not user_id or p.payload.get("user_id") == user_id)]
-            else:
-                points_after = []
-        empty_ids = [point.id for point in points_after if not point.payload.get("original_value", "").strip() and not point.payload.get("ai_processed_value", "").strip()]
-        if empty_ids:
-            QDRANT_CLIENT.delete(
-                collection_name="value_components",
-                points_selector=models.PointIdsList(points=empty_ids)
-            )
-            logging.warning(f"[database.py][DIAG] Deleted {len(empty_ids)} empty value_component(s) for {main_category_norm}/{category_norm}/{name_norm}")
-        # --- Fuzzy delete: scan all points for similar keys ---
-        all_points, _ = QDRANT_CLIENT.scroll(collection_name="value_components", with_payload=True, with_vectors=False)
-        fuzzy_ids = []
-        fuzzy_payloads = []
-        for point in all_points:
-            payload = point.payload
-            main = (payload.get("main_category") or '').strip().lower()
-            cat = (payload.get("category") or '').strip().lower()
-            n = (payload.get("name") or '').strip().lower()
-            if main == main_category_norm and cat == category_norm and n == name_norm:
-                if point.id not in ids_to_delete and point.id not in empty_ids:
-                    fuzzy_ids.append(point.id)
-                    fuzzy_payloads.append(payload)
-        if fuzzy_ids:
+            key_filters = [
+                models.Filter(must=[
+                    models.FieldCondition(key="main_category", match=models.MatchValue(value=payload['main_category'])),
+                    models.FieldCondition(key="category", match=models.MatchValue(value=payload['category'])),
+                    models.FieldCondition(key="name", match=models.MatchValue(value=payload['name'])),
+                ])
+                for _, payload in items
+            ]
             QDRANT_CLIENT.delete(
                 collection_name="value_components",
-                points_selector=models.PointIdsList(points=fuzzy_ids)
+                points_selector=models.FilterSelector(filter=models.Filter(
+                    must=[models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))],
+                    should=key_filters,
+                    must_not=[models.HasIdCondition(has_id=[point_id for point_id, _ in items])],
+                )),  # type: ignore[arg-type]
+                wait=True
             )
-            logging.warning(f"[database.py][DIAG] Fuzzy deleted {len(fuzzy_ids)} value_component(s) for {main_category_norm}/{category_norm}/{name_norm}")
-            for p in fuzzy_payloads:
-                logging.warning(f"[database.py][DIAG] Fuzzy deleted payload: {p}")
-        # Log what remains for this key
-        points_final, _ = QDRANT_CLIENT.scroll(
-            collection_name="value_components",
-            scroll_filter=filter_,
-            with_payload=True,
-            with_vectors=False
-        )
-        logging.warning(f"[database.py][DIAG] Remaining payloads for {main_category_norm}/{category_norm}/{name_norm}: {[p.payload for p in points_final]}")
+        except Exception as e:
+            logger.warning(f"[database.py] Could not remove legacy value_component points for user {user_id}: {e}")
+
+def save_value_components(components: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[bool]:
+    """Save many value components with batched upserts instead of one request per component.
+    Returns one flag per input component (False for empty or failed entries)."""
+    results = [False] * len(components)
+    try:
+        saved = []
+        with database_spinner(f"saving {len(components)} value components"):
+            with BatchUpsertWriter("value_components", batch_size=batch_size) as writer:
+                for idx, component in enumerate(components):
+                    payload = _build_value_component_payload(component)
+                    if payload is None:
+                        continue
+                    point_id = value_component_point_id(payload['user_id'], payload['main_category'], payload['category'], payload['name'])
+                    writer.add(point_id, placeholder_vector("value_components"), payload)
+                    saved.append((point_id, payload))
+                    results[idx] = True
+            _delete_legacy_value_component_points(saved)
+            for user_id in {payload.get('user_id') for _, payload in saved}:
+                invalidate_value_components_cache(user_id)
+            logger.info(f"[save_value_components] Saved {sum(results)}/{len(components)} components in {writer.requests} requests")
+        return results
     except Exception as e:
-        logging.error(f"[database.py][ERROR] Exception in delete_value_component_by_key: {e}")
+        logger.error(f"[save_value_components] Error saving value components: {str(e)}")
+        return [False] * len(components)
 
-def save_value_component(component: Dict[str, Any]) -> bool:
-    """Save a value component to Qdrant, using a new UUID for each upsert. After upsert, clean up old duplicates for the same logical key. Keys are normalized for consistency. Deep diagnostics enabled."""
-    import logging
-    import time
-    import uuid
-    from datetime import datetime
-    from app.database import get_value_components, clean_duplicate_value_components
-    from qdrant_client.http import models
+def save_value_component(component: Dict[str, Any], verify: Optional[bool] = None) -> bool:
+    """Save a value component to Qdrant. The point ID is derived from the normalized (user_id, main_category,
+    category, name) key, so saving the same component again overwrites it in place. With verify=True
+    (default VALUE_COMPONENT_VERIFY_WRITES) the point is read back by ID and compared."""
+    if verify is None:
+        verify = VALUE_COMPONENT_VERIFY_WRITES
     try:
-        # --- Normalize keys ---
-        main_category = (component.get('main_category','') or '').strip().lower()
-        category = (component.get('category','') or '').strip().lower()
-        name = (component.get('name','') or '').strip().lower()
-        
-        # --- Prevent saving empty entries ---
-        if not component.get('original_value', '').strip() and not component.get('ai_processed_value', '').strip():
-            logging.warning(f"[save_value_component] Skipping save: both original_value and ai_processed_value are empty for {main_category}/{category}/{name}")
+        payload = _build_value_component_payload(component)
+        if payload is None:
             return False
-        
-        # --- Add created_at timestamp and ensure user_id is present ---
-        payload = component.copy()
-        payload['main_category'] = main_category
-        payload['category'] = category
-        payload['name'] = name
-        payload['created_at'] = datetime.utcnow().isoformat()
-        
-        # Ensure user_id is present (for backward compatibility)
-        if 'user_id' not in payload:
-            # Use demo_profile_manager to get current user_id (handles demo/normal mode correctly)
-            try:
-                from app.components.demo_companies.demo_profile_manager import demo_profile_manager
-                payload['user_id'] = demo_profile_manager.get_current_user_id()
-            except Exception:
-                # Fallback to session state if demo_profile_manager unavailable
-                import streamlit as st
-                payload['user_id'] = st.session_state.get('user_id', 'default_user')
-        
-        point_id = uuid.uuid4().int % (10 ** 12)
-        
-        print(f"[save_value_component][DIAG] Upserting point_id={point_id}, payload={payload}")
+        point_id = value_component_point_id(payload['user_id'], payload['main_category'], payload['category'], payload['name'])
         
         # --- Always upsert with a dummy vector ---
-        upsert_resp = QDRANT_CLIENT.upsert(collection_name="value_components", points=[models.PointStruct(id=point_id, vector=[0.0]*VECTOR_DIM, payload=payload)])
-        print(f"[save_value_component][DIAG] Upsert response: {upsert_resp}")
-        
-        # --- Cleanup: remove old duplicates for this logical key ---
-        deleted = clean_duplicate_value_components()
-        print(f"[save_value_component][DIAG] Duplicates deleted after upsert: {deleted}")
-        
-        # --- Delay to allow Qdrant to index ---
-        time.sleep(1)
-        
-        # --- Print all points in the collection for diagnostics ---
-        all_points, _ = QDRANT_CLIENT.scroll(collection_name="value_components", with_payload=True, with_vectors=False)
-        print("[save_value_component][DIAG] All points in value_components after upsert/cleanup:")
-        for p in all_points:
-            print(p.payload)
-        
-        # --- Post-save verification ---
-        db_val = get_value_components(main_category=main_category, category=category, name=name)
-        print(f"[save_value_component][DIAG] get_value_components result: {db_val}")
-        if not db_val or not db_val.get(main_category) or not db_val[main_category]:
-            print(f"[save_value_component][ERROR] Post-save verification failed: No value found after upsert and cleanup.")
-            return False
-        
-        # Check if the saved value matches the intended value
-        found = False
-        for comp in db_val[main_category]:
-            print(f"[save_value_component][DIAG] Comparing DB comp: {comp} to payload: {payload}")
-            if comp['name'] == name and comp['original_value'] == payload['original_value']:
-                found = True
-        
-        if not found:
-            print(f"[save_value_component][ERROR] Post-save verification failed. Expected: {payload['original_value']}, DB: {db_val}")
-            return False
+        QDRANT_CLIENT.upsert(
+            collection_name="value_components",
+            points=[models.PointStruct(id=point_id, vector=placeholder_vector("value_components"), payload=payload)],
+            wait=True
+        )
+        logger.debug(f"[save_value_component] Upserted {payload['main_category']}/{payload['category']}/{payload['name']} as {point_id}")
+        _delete_legacy_value_component_points([(point_id, payload)])
+        invalidate_value_components_cache(payload.get('user_id'))
+        
+        # --- Optional read-your-write verification ---
+        if verify:
+            stored = QDRANT_CLIENT.retrieve(collection_name="value_components", ids=[point_id], with_payload=True, with_vectors=False)
+            if not stored or stored[0].payload.get('original_value') != payload.get('original_value'):
+                logger.error(f"[save_value_component] Post-save verification failed for {payload['main_category']}/{payload['category']}/{payload['name']}")
+                return False
         
         return True
     except Exception as e:
-        print(f"[save_value_component][CRITICAL] Exception: {e}")
+        logger.error(f"[save_value_component] Exception: {e}")
         return False
 
-# --- CLEANUP: Remove duplicate value_components, keep only the latest for each (main_category, category, name) ---
+# --- CLEANUP: Remove duplicate value_components, keep only the latest for each (user_id, main_category, category, name) ---
 def clean_duplicate_value_components():
-    """Scan all value_components and delete all but the latest for each (main_category, category, name), using created_at timestamp. Keys are normalized for consistency."""
+    """Scan all value_components and delete all but the latest for each (user_id, main_category, category, name), using created_at timestamp. Keys are normalized for consistency.
+    Saves no longer need this (point IDs are deterministic); it is kept as a one-off maintenance pass for old data."""
     try:
         all_components = []
         scroll_offset = None
@@ -597,6 +884,7 @@ def clean_duplicate_value_components():
         for point in all_components:
             payload = point.payload
             key = (
+                payload.get("user_id"),
                 (payload.get("main_category") or "").strip().lower(),
                 (payload.get("category") or "").strip().lower(),
                 (payload.get("name") or "").strip().lower()
@@ -615,66 +903,88 @@ def clean_duplicate_value_components():
                     )
                     deleted += len(to_delete)
         logger.info(f"[CLEANUP] Total duplicates deleted: {deleted}")
+        if deleted:
+            invalidate_value_components_cache()
         return deleted
     except Exception as e:
         logger.error(f"[CLEANUP] Error cleaning duplicate value_components: {str(e)}")
         return 0
 
+class _ReadOnlyDict(dict):
+    """dict that rejects mutation; copy.copy/deepcopy return a plain, mutable dict."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Value component snapshots are read-only; copy them before modifying")
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class _ReadOnlyList(list):
+    """list that rejects mutation; copy.copy/deepcopy return a plain, mutable list."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Value component snapshots are read-only; copy them before modifying")
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = clear = sort = reverse = _readonly  # type: ignore[assignment]
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return _ReadOnlyDict({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return _ReadOnlyList(_freeze(v) for v in value)
+    return value
+
+# In-process cache of fetch_all_value_components results, keyed by user_id (None = all users).
+# Every write path bumps the user's version via invalidate_value_components_cache; a cached
+# snapshot is served only while the version it was loaded under is still current.
+_value_components_cache: Dict[Optional[str], tuple] = {}
+_value_components_versions: Dict[Optional[str], int] = {}
+_value_components_epoch = 0
+_value_components_lock = threading.Lock()
+
+def _value_components_version(user_id: Optional[str]) -> tuple:
+    return (_value_components_epoch, _value_components_versions.get(user_id, 0))
+
+def invalidate_value_components_cache(user_id: Optional[str] = None):
+    """Mark cached value components as stale after a write. user_id=None invalidates every user."""
+    global _value_components_epoch
+    with _value_components_lock:
+        if user_id is None:
+            _value_components_epoch += 1
+            _value_components_cache.clear()
+        else:
+            _value_components_versions[user_id] = _value_components_versions.get(user_id, 0) + 1
+            # The all-users view contains this user's components too
+            _value_components_versions[None] = _value_components_versions.get(None, 0) + 1
+            _value_components_cache.pop(user_id, None)
+            _value_components_cache.pop(None, None)
+
 def fetch_all_value_components(user_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
-    """Get all value components from Qdrant, grouped by main_category. If user_id is provided, only fetch user's data."""
+    """Get all value components grouped by main_category, from the in-process cache when nothing has changed.
+    If user_id is provided, only the user's data is returned. The result is a read-only snapshot."""
+    with _value_components_lock:
+        version = _value_components_version(user_id)
+        cached = _value_components_cache.get(user_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    grouped = _load_value_components(user_id)
+    if grouped is None:
+        return {}
+    snapshot = _freeze(grouped)
+    with _value_components_lock:
+        # Only cache if no write happened while we were scrolling
+        if _value_components_version(user_id) == version:
+            _value_components_cache[user_id] = (version, snapshot)
+    return snapshot
+
+def _load_value_components(user_id: Optional[str] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Scroll all value components from Qdrant, grouped by main_category. Returns None on error."""
     try:
         with database_spinner("fetching value components"):
-            all_components = []
-            scroll_offset = None
-            
             # Debug: Log what we're fetching
             logger.warning(f"[database.py] fetch_all_value_components called with user_id={user_id}")
             
-            # Build filter for user-specific data if user_id provided
-            if user_id:
-                filter_ = models.Filter(must=[models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))])  # type: ignore[arg-type]
-                logger.warning(f"[database.py] Using filter for user_id={user_id}")
-                try:
-                    while True:
-                        results = QDRANT_CLIENT.scroll(
-                            collection_name="value_components",
-                            scroll_filter=filter_,
-                            with_payload=True,
-                            with_vectors=False,
-                            offset=scroll_offset
-                        )
-                        points, next_offset = results
-                        all_components.extend([point.payload for point in points])
-                        if not next_offset:
-                            break
-                        scroll_offset = next_offset
-                except Exception as e:
-                    # If index error, fall back to manual filtering
-                    if "index" in str(e).lower() or "Index required" in str(e):
-                        logger.warning(f"[database.py] Index not found for user_id, using manual filtering")
-                        # Get all points and filter manually
-                        all_points, _ = QDRANT_CLIENT.scroll(
-                            collection_name="value_components",
-                            with_payload=True,
-                            with_vectors=False
-                        )
-                        all_components = [p.payload for p in all_points if p.payload.get("user_id") == user_id]
-                    else:
-                        raise e
-            else:
-                # Fetch all data (backward compatibility)
-                while True:
-                    results = QDRANT_CLIENT.scroll(
-                        collection_name="value_components",
-                        with_payload=True,
-                        with_vectors=False,
-                        offset=scroll_offset
-                    )
-                    points, next_offset = results
-                    all_components.extend([point.payload for point in points])
-                    if not next_offset:
-                        break
-                    scroll_offset = next_offset
+            # Filter to the user's data if user_id provided, otherwise fetch all data (backward compatibility)
+            all_components = find_payloads("value_components", match={"user_id": user_id} if user_id else None)
             
             grouped = {}
             for comp in all_components:
@@ -710,13 +1020,14 @@ def fetch_all_value_components(user_id: Optional[str] = None) -> Dict[str, List[
             return grouped
     except Exception as e:
         logger.error(f"Error getting all value components: {str(e)}")
-        return {}
+        return None
 
 def recreate_value_components_collection():
     """Drop and recreate the value_components collection."""
     try:
         drop_collection("value_components")
-        ensure_collection("value_components", VECTOR_DIM)
+        ensure_collection_once("value_components", COLLECTIONS["value_components"]["vector_size"])
+        invalidate_value_components_cache()
         return True
     except Exception as e:
         logger.error(f"Error recreating value_components collection: {str(e)}")
@@ -737,54 +1048,10 @@ def get_value_components(main_category: str, category: str, name: Optional[str]
         # Always lowercase keys for consistency
         main_category = main_category.lower()
         category = category.lower()
-        must_conditions = [
-            models.FieldCondition(key="main_category", match=models.MatchValue(value=main_category)),
-            models.FieldCondition(key="category", match=models.MatchValue(value=category)),
-        ]
+        match = {"main_category": main_category, "category": category}
         if name:
-            must_conditions.append(models.FieldCondition(key="name", match=models.MatchValue(value=name.lower())))
-        filter_ = models.Filter(must=must_conditions)  # type: ignore[arg-type]
-        print(f"[get_value_components][DIAG] Using filter: {filter_}")
-        try:
-            points, _ = QDRANT_CLIENT.scroll(collection_name="value_components", scroll_filter=filter_, limit=100)
-            print(f"[get_value_components][DIAG] Raw scroll results: {points}")
-        except Exception as e:
-            # If index error, fall back to manual filtering
-            error_str = str(e).lower()
-            if "index" in error_str or "index required" in error_str or "bad request" in error_str:
-                logging.warning(f"[database.py] Index not found for main_category/category/name in get_value_components, using manual filtering: {e}")
-                # Get all points and filter manually
-                try:
-                    all_points, _ = QDRANT_CLIENT.scroll(
-                        collection_name="value_components",
-                        with_payload=True,
-                        with_vectors=False
-                    )
-                    # Manual filtering
-                    filtered_points = []
-                    for point in all_points:
-                        payload = point.payload
-                        if (payload.get("main_category", "").lower() == main_category and
-                            payload.get("category", "").lower() == category):
-                            if not name or payload.get("name", "").lower() == name.lower():
-                                filtered_points.append(point)
-                    points = (filtered_points, None)
-                    print(f"[get_value_components][DIAG] Manual filter results: {len(filtered_points)} points")
-                except Exception as e2:
-                    logging.error(f"[database.py] Error in manual filtering fallback: {e2}")
-                    return {main_category: []} if main_category else {}
-            else:
-                # For other errors, log and return empty result instead of raising
-                logging.error(f"[database.py] Error in get_value_components: {e}")
-                return {main_category: []} if main_category else {}
-        
-        # Parse and group results
-        # Handle both tuple (points, offset) and list of points
-        if isinstance(points, tuple):
-            points_list = points[0]
-        else:
-            points_list = points
-        components = [point.payload for point in points_list]
+            match["name"] = name.lower()
+        components = find_payloads("value_components", match=match)
         grouped = {}
         for comp in components:
             main_cat = comp.get("main_category", "Unknown")
@@ -793,8 +1060,7 @@ def get_value_components(main_category: str, category: str, name: Optional[str]
             return {main_category: grouped.get(main_category, [])}
         return grouped
     except Exception as e:
-        # Catch any unexpected errors and return empty result
-        logging.error(f"[database.py] Unexpected error in get_value_components: {e}")
+        logging.error(f"[database.py] Error in get_value_components: {e}")
         return {main_category.lower() if main_category else "": []}
 
 def get_analysis_history() -> list:
@@ -811,49 +1077,18 @@ def get_analysis_history() -> list:
         return []
 
 def ensure_persona_collection():
-    ensure_collection(
+    ensure_collection_once(
         collection_name=PERSONA_COLLECTION,
         vector_size=PERSONA_VECTOR_DIM,
         distance="Cosine"
     )
 
-async def generate_embedding(text: str, model: str = "mistral") -> List[float]:
-    """Generate embedding for a given text using Ollama."""
-    try:
-        with ai_processing_spinner("generating embedding"):
-            import httpx
-            # Increased timeout to 60 seconds to handle slow Ollama responses
-            # Also add connection timeout separately
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(60.0, connect=10.0)
-            ) as client:
-                response = await client.post(
-                    "http://localhost:11434/api/embeddings",
-                    json={"model": model, "prompt": text}
-                )
-                if response.status_code == 200:
-                    embedding = response.json()["embedding"]
-                    # Check if embedding dimension matches expected dimension
-                    if len(embedding) != VECTOR_DIM:
-                        original_len = len(embedding)
-                        logger.warning(f"Embedding dimension mismatch: got {original_len}, expected {VECTOR_DIM} (model: {model}). Padding to match.")
-                        # Only pad if smaller (never truncate - we want full embeddings)
-                        if original_len < VECTOR_DIM:
-                            embedding.extend([0.0] * (VECTOR_DIM - original_len))
-                            logger.info(f"Padded embedding from {original_len} to {VECTOR_DIM} dimensions")
-                        else:
-                            # If larger than expected, log warning but use full embedding
-                            logger.warning(f"Embedding is larger than expected ({original_len} > {VECTOR_DIM}). Using full embedding.")
-                    return embedding
-                else:
-                    logger.error(f"Error generating embedding: {response.status_code}")
-                    return [0.0] * VECTOR_DIM  # Return zero vector as fallback
-    except httpx.TimeoutException as e:
-        logger.warning(f"Timeout generating embedding (using zero vector): {str(e)}")
-        return [0.0] * VECTOR_DIM  # Return zero vector as fallback
-    except Exception as e:
-        logger.warning(f"Error generating embedding (using zero vector): {str(e)}")
-        return [0.0] * VECTOR_DIM  # Return zero vector as fallback
+async def generate_embedding(text: str) -> List[float]:
+    """Generate a VECTOR_DIM embedding for a given text using Ollama (batched and cached).
+    Raises EmbeddingError if no embedding can be produced."""
+    from app.ai.embedding_service import embedding_service
+    with ai_processing_spinner("generating embedding"):
+        return await embedding_service.embed(text)
 
 async def save_persona(persona: dict, source_website: Optional[str] = None, user_id: Optional[str] = None):
     try:
@@ -867,12 +1102,15 @@ async def save_persona(persona: dict, source_website: Optional[str] = None, user
         embedding_text = f"{persona_name} {persona.get('industry', '')} {' '.join(value_driver_texts)}"
         persona_id = persona.get('id') or str(uuid.uuid4())
         
-        # Try to generate embedding, with fallback to zero vector
+        # A persona is never lost because Ollama is down: it is saved with a zero vector and
+        # flagged, so it stays out of semantic search (keyword search still finds it)
+        embedding_missing = False
         try:
             embedding = await generate_embedding(embedding_text)
         except Exception as e:
-            logger.warning(f"Failed to generate embedding for persona '{persona_name}': {e}. Using zero vector.")
+            logger.error(f"Failed to generate embedding for persona '{persona_name}': {e}. Saving without semantic vector.")
             embedding = [0.0] * VECTOR_DIM
+            embedding_missing = True
         
         # Ensure industry and scan_date are present at the top level
         industry = persona.get("industry")
@@ -924,6 +1162,9 @@ async def save_persona(persona: dict, source_website: Optional[str] = None, user
             "created_by_display_name": created_by_display_name,  # Store display name in payload too
             "persona": persona_with_metadata  # Save the persona dict with metadata as a snapshot
         }
+        payload["search_text"] = _persona_search_text(payload)
+        if embedding_missing:
+            payload["embedding_missing"] = True
         
         QDRANT_CLIENT.upsert(
             collection_name=PERSONA_COLLECTION,
@@ -958,45 +1199,181 @@ async def get_personas(query: Optional[dict] = None) -> list:
         import streamlit as st
         user_id = st.session_state.get('user_id', 'default_user')
         
-        # Build filter for user-specific data
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-        filter_conditions = [FieldCondition(key="user_id", match=MatchValue(value=user_id))]
-        
-        # Add additional query filters if provided
-        if query:
-            for key, value in query.items():
-                if key != "user_id":  # Don't override user_id filter
-                    filter_conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
-        
-        # Scroll through points with user filter
-        results, _ = QDRANT_CLIENT.scroll(
-            collection_name=PERSONA_COLLECTION,
-            scroll_filter=Filter(must=filter_conditions),  # type: ignore[arg-type]
-            limit=100,
-            with_payload=True
-        )
-        return [point.payload for point in results]
+        # User filter plus any additional payload filters; every field must be indexed
+        match = {key: value for key, value in (query or {}).items() if key != "user_id"}
+        match["user_id"] = user_id
+        return find_payloads(PERSONA_COLLECTION, match=match)
     except Exception as e:
         logger.error(f"Error getting personas from Qdrant: {str(e)}")
         return []
 
+def _persona_search_text(payload: dict) -> str:
+    """Lowercased text indexed for keyword persona search: company name, website, industry, scan date and value drivers."""
+    persona = payload.get("persona") or {}
+    company = persona.get("company") if isinstance(persona.get("company"), dict) else {}
+    value_drivers = persona.get("value_drivers") or []
+    driver_names = [vd.get("name", "") if isinstance(vd, dict) else str(vd) for vd in value_drivers]
+    parts = [
+        company.get("name") or persona.get("company_name") or persona.get("name") or "",
+        company.get("website") or persona.get("website") or payload.get("source_website") or "",
+        payload.get("industry") or persona.get("industry") or "",
+        (payload.get("scan_date") or "")[:10],
+        " ".join(driver_names),
+    ]
+    return " ".join(str(part) for part in parts if part).lower()
+
+def backfill_persona_search_text() -> int:
+    """Add search_text to personas saved before keyword search existed. Only touches points missing the field."""
+    updated = 0
+    try:
+        missing = models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="search_text"))])
+        scroll_offset = None
+        while True:
+            points, next_offset = QDRANT_CLIENT.scroll(
+                collection_name=PERSONA_COLLECTION,
+                scroll_filter=missing,
+                limit=QDRANT_UPSERT_BATCH_SIZE,
+                offset=scroll_offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            for point in points:
+                QDRANT_CLIENT.set_payload(
+                    collection_name=PERSONA_COLLECTION,
+                    payload={"search_text": _persona_search_text(point.payload or {})},
+                    points=[point.id],
+                    wait=False
+                )
+            updated += len(points)
+            if not next_offset:
+                break
+            scroll_offset = next_offset
+        if updated:
+            logger.info(f"[database.py] Backfilled search_text for {updated} personas")
+    except Exception as e:
+        logger.warning(f"[database.py] Could not backfill persona search_text: {e}")
+    return updated
+
+async def search_personas(
+    query: str = "",
+    user_id: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = PERSONA_SEARCH_PAGE_SIZE,
+    offset: int = 0,
+    score_threshold: Optional[float] = PERSONA_SEARCH_SCORE_THRESHOLD,
+) -> Dict[str, Any]:
+    """Search the user's personas.
+
+    With a query, the query is embedded and matched against the persona vectors (semantic hits above
+    score_threshold), and personas whose company name, website, industry, scan date or value drivers
+    contain the query words are boosted by PERSONA_SEARCH_KEYWORD_BOOST. Without a query, personas are
+    listed newest first. `filters` are exact payload matches (e.g. {"industry": ..., "source_website": ...}).
+
+    Returns {"personas": [payload + "score"], "offset": offset, "limit": limit, "has_more": bool, "total": int | None}.
+    """
+    try:
+        ensure_persona_collection()
+        if user_id is None:
+            import streamlit as st
+            user_id = st.session_state.get('user_id', 'default_user')
+        must = [models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))]
+        for key, value in (filters or {}).items():
+            if key != "user_id" and value not in (None, ""):
+                must.append(models.FieldCondition(key=key, match=models.MatchValue(value=value)))
+        query = (query or "").strip()
+        window = offset + limit
+
+        if not query:
+            # Order by scan_date using only the small scan_date field, then fetch full payloads for this page
+            dated = []
+            scroll_offset = None
+            while True:
+                points, next_offset = QDRANT_CLIENT.scroll(
+                    collection_name=PERSONA_COLLECTION,
+                    scroll_filter=models.Filter(must=must),  # type: ignore[arg-type]
+                    limit=1000,
+                    offset=scroll_offset,
+                    with_payload=["scan_date"],
+                    with_vectors=False
+                )
+                dated.extend((point.payload.get("scan_date") or "", point.id) for point in points)
+                if not next_offset:
+                    break
+                scroll_offset = next_offset
+            dated.sort(key=lambda item: item[0], reverse=True)
+            total = len(dated)
+            page_ids = [point_id for _, point_id in dated[offset:window]]
+            page = []
+            if page_ids:
+                by_id = {point.id: point.payload for point in QDRANT_CLIENT.retrieve(collection_name=PERSONA_COLLECTION, ids=page_ids, with_payload=True, with_vectors=False)}
+                page = [dict(by_id[point_id], score=None) for point_id in page_ids if point_id in by_id]
+            return {"personas": page, "offset": offset, "limit": limit, "has_more": window < total, "total": total}
+
+        try:
+            query_vector = await generate_embedding(query)
+        except Exception as e:
+            logger.error(f"[database.py] Could not embed persona search query: {e}")
+            query_vector = None
+        scored: Dict[str, Dict[str, Any]] = {}
+        has_more = False
+        if query_vector:
+            semantic_hits = QDRANT_CLIENT.search(
+                collection_name=PERSONA_COLLECTION,
+                query_vector=query_vector,
+                query_filter=models.Filter(must=must),  # type: ignore[arg-type]
+                limit=window,
+                score_threshold=score_threshold,
+                with_payload=True
+            )
+            keyword_hits = QDRANT_CLIENT.search(
+                collection_name=PERSONA_COLLECTION,
+                query_vector=query_vector,
+                query_filter=models.Filter(must=must + [models.FieldCondition(key="search_text", match=models.MatchText(text=query.lower()))]),  # type: ignore[arg-type]
+                limit=window,
+                with_payload=True
+            )
+            has_more = len(semantic_hits) >= window or len(keyword_hits) >= window
+            for hit in semantic_hits:
+                scored[str(hit.id)] = dict(hit.payload, score=hit.score)
+            for hit in keyword_hits:
+                boosted = hit.score + PERSONA_SEARCH_KEYWORD_BOOST
+                if str(hit.id) not in scored or scored[str(hit.id)]["score"] < boosted:
+                    scored[str(hit.id)] = dict(hit.payload, score=boosted)
+        else:
+            # Embedding service unavailable: fall back to keyword matches only
+            logger.warning("[database.py] Query embedding unavailable, persona search uses keyword matches only")
+            scroll_offset = None
+            keyword_filter = models.Filter(must=must + [models.FieldCondition(key="search_text", match=models.MatchText(text=query.lower()))])
+            while len(scored) <= window:
+                points, next_offset = QDRANT_CLIENT.scroll(
+                    collection_name=PERSONA_COLLECTION,
+                    scroll_filter=keyword_filter,  # type: ignore[arg-type]
+                    limit=window + 1,
+                    offset=scroll_offset,
+                    with_payload=True,
+                    with_vectors=False
+                )
+                for point in points:
+                    scored[str(point.id)] = dict(point.payload, score=None)
+                if not next_offset:
+                    break
+                scroll_offset = next_offset
+            has_more = len(scored) > window
+
+        ranked = sorted(scored.values(), key=lambda p: p["score"] if p["score"] is not None else 0.0, reverse=True)
+        return {"personas": ranked[offset:window], "offset": offset, "limit": limit, "has_more": has_more, "total": None}
+    except Exception as e:
+        logger.error(f"Error searching personas in Qdrant: {str(e)}")
+        return {"personas": [], "offset": offset, "limit": limit, "has_more": False, "total": 0, "error": str(e)}
+
 async def get_persona_by_id(persona_id: str) -> Optional[dict]:
     """Retrieve a single persona by its point ID from Qdrant, filtered by user_id."""
     try:
-        # Get all personas and filter by ID (simpler approach)
         import streamlit as st
         user_id = st.session_state.get('user_id', 'default_user')
         
-        # Get all personas for the user
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-        filter_conditions = [FieldCondition(key="user_id", match=MatchValue(value=user_id))]
-        
-        results, _ = QDRANT_CLIENT.scroll(
-            collection_name=PERSONA_COLLECTION,
-            scroll_filter=Filter(must=filter_conditions),  # type: ignore[arg-type]
-            limit=100,
-            with_payload=True
-        )
+        # Look the persona up by its ID (indexed) within the user's personas
+        results = find_points(PERSONA_COLLECTION, match={"user_id": user_id, "id": persona_id}, limit=1)
         
         # Find the persona with matching ID
         for point in results:
@@ -1023,6 +1400,7 @@ async def get_persona_by_id(persona_id: str) -> Optional[dict]:
                             # Try to get from payload first, then look up user if needed
                             persona_dict["created_by_display_name"] = point.payload.get("created_by_display_name")
                             if not persona_dict["created_by_display_name"] and persona_dict.get("user_id"):
+                                # A single user per call: served from the shared user directory after the first lookup
                                 try:
                                     from app.auth.user_management import UserManager
                                     user_manager = UserManager(get_qdrant_client())  # type: ignore[arg-type]
@@ -1049,63 +1427,14 @@ async def delete_persona_by_id(persona_id: str) -> bool:
         import streamlit as st
         user_id = st.session_state.get('user_id', 'default_user')
         
-        # Try to find the persona using filter (requires index)
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-        filter_conditions = [
-            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-            FieldCondition(key="id", match=MatchValue(value=persona_id))
-        ]
-        
-        point_to_delete = None
-        
-        try:
-            # Try to search with filter (requires index on "id" and "user_id")
-            results = QDRANT_CLIENT.search(
-                collection_name=PERSONA_COLLECTION,
-                query_vector=[0.0] * VECTOR_DIM,  # Dummy vector for filtering
-                query_filter=Filter(must=filter_conditions),  # type: ignore[arg-type]
-                limit=1,
-                with_payload=True  # Need payload to verify, and we need point ID
-            )
-            
-            if results:
-                # Get the actual point from results (results are ScoredPoint objects)
-                point_to_delete = results[0]
-        except Exception as e:
-            # If index error, fall back to manual filtering
-            error_str = str(e).lower()
-            if "index" in error_str or "index required" in error_str or "bad request" in error_str:
-                logger.warning(f"[database.py] Index not found for persona deletion, using manual filtering")
-                # Get all points and filter manually
-                all_points, _ = QDRANT_CLIENT.scroll(
-                    collection_name=PERSONA_COLLECTION,
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Manual filtering by user_id and payload.id
-                matching_points = [
-                    p for p in all_points 
-                    if p.payload.get("user_id") == user_id and p.payload.get("id") == persona_id
-                ]
-                if matching_points:
-                    point_to_delete = matching_points[0]
-            else:
-                raise e
+        # Payload "id" and "user_id" are indexed (COLLECTION_INDEXES)
+        point_to_delete = find_one(PERSONA_COLLECTION, match={"user_id": user_id, "id": persona_id}, with_payload=False)
         
         if not point_to_delete:
             logger.warning(f"Persona {persona_id} not found or not owned by user {user_id}")
             return False
         
-        # Get the actual Qdrant point ID (integer) from the found point
-        # point_to_delete could be a ScoredPoint (from search) or a Point (from scroll)
-        if hasattr(point_to_delete, 'id'):
-            qdrant_point_id = point_to_delete.id
-        else:
-            # Fallback: if it's a dict or something else, try to get ID
-            qdrant_point_id = getattr(point_to_delete, 'id', None)
-            if qdrant_point_id is None:
-                logger.error(f"Could not extract point ID from search result for persona {persona_id}")
-                return False
+        qdrant_point_id = point_to_delete.id
         
         # Delete using the actual Qdrant point ID (integer)
         response = QDRANT_CLIENT.delete(
@@ -1126,13 +1455,14 @@ def delete_all_personas():
     """Delete the entire personas collection from Qdrant (removes all saved buyer personas)."""
     try:
         QDRANT_CLIENT.delete_collection(PERSONA_COLLECTION)
+        forget_collection(PERSONA_COLLECTION)
         logger.info("All buyer personas deleted (personas collection dropped).")
         return True
     except Exception as e:
         logger.error(f"Failed to delete personas collection: {e}")
         return False
 
-SITE_VECTOR_DIM = 1536
+SITE_VECTOR_DIM = VECTOR_DIM  # Same embeddings as everything else (create_embedding)
 
 def create_site_collection(site_id: str):
     collection_name = f"site_{site_id}"
@@ -1200,6 +1530,7 @@ def normalize_all_value_component_keys():
             else:
                 print(f"[normalize_all_value_component_keys] Skipped point_id={point.id} (no vector found)")
     print(f"[normalize_all_value_component_keys] Normalization complete. Updated {updated} points.")
+    invalidate_value_components_cache()
 
 def run_normalize_all_value_component_keys():
     import logging
@@ -1230,71 +1561,20 @@ def print_similar_value_components(main_category_substr: str, category_substr: s
         print(m)
 
 def delete_all_value_components(user_id: Optional[str] = None) -> bool:
-    """Delete all value components for a specific user or all users if user_id is None"""
-    import logging
-    from qdrant_client.http import models
-    
+    """Delete all value components for a specific user. Without a user_id nothing is deleted
+    (use recreate_value_components_collection to wipe every user's data)."""
     try:
-        # Build filter for user_id if provided
-        filter_conditions = []
-        if user_id:
-            filter_conditions.append(
-                models.FieldCondition(
-                    key="user_id",
-                    match=models.MatchValue(value=user_id)
-                )
-            )
-        
-        # Create filter if we have conditions
-        query_filter = None
-        if filter_conditions:
-            query_filter = models.Filter(must=filter_conditions)  # type: ignore[arg-type]
-        
-        # Try to delete using filter selector
-        try:
-            result = QDRANT_CLIENT.delete(
-                collection_name="value_components",
-                points_selector=models.FilterSelector(filter=query_filter) if query_filter else models.PointIdsList(points=[])
-            )
-            logging.info(f"[database.py] Deleted all value components for user_id: {user_id}")
+        if not user_id:
+            logging.warning("[database.py] delete_all_value_components called without user_id, nothing deleted")
             return True
-        except Exception as e:
-            # If index error, fall back to manual filtering and deletion
-            error_str = str(e).lower()
-            if "index" in error_str or "index required" in error_str or "bad request" in error_str:
-                logging.warning(f"[database.py] Index not found for user_id in delete_all_value_components, using manual filtering")
-                # Get all points and filter manually
-                all_points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="value_components",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Manual filtering
-                if user_id:
-                    points_to_delete = [p for p in all_points if p.payload.get("user_id") == user_id]
-                else:
-                    points_to_delete = all_points
-                
-                # Extract point IDs
-                point_ids = [point.id for point in points_to_delete]
-                
-                if point_ids:
-                    # Delete all matching points
-                    QDRANT_CLIENT.delete(
-                        collection_name="value_components",
-                        points_selector=models.PointIdsList(points=point_ids)
-                    )
-                    logging.info(f"[database.py] Deleted {len(point_ids)} value components for user_id={user_id} (manual filtering)")
-                    return True
-                else:
-                    logging.info(f"[database.py] No value components found to delete for user_id={user_id}")
-                    return True  # Success even if nothing to delete
-            else:
-                raise e
-        
+        delete_points("value_components", match={"user_id": user_id})
+        logging.info(f"[database.py] Deleted all value components for user_id: {user_id}")
+        return True
     except Exception as e:
         logging.error(f"[database.py][ERROR] Exception in delete_all_value_components: {e}")
         return False
+    finally:
+        invalidate_value_components_cache(user_id)
 
 # =============================================================================
 # BACKGROUND TASK MANAGEMENT FUNCTIONS
@@ -1329,119 +1609,45 @@ def normalize_website(website: str) -> str:
     
     return website
 
+# Background tasks are held by the in-process task registry (app/core/task_registry.py);
+# the functions below are its async facade, and Qdrant only receives write-behind snapshots.
+
+def persist_background_tasks(tasks: Dict[Any, Dict[str, Any]]) -> int:
+    """Upsert task payloads keyed by point ID in batched requests (write-behind target of the task registry)."""
+    points = [
+        models.PointStruct(id=point_id, vector=placeholder_vector("background_tasks"), payload=payload)
+        for point_id, payload in tasks.items()
+    ]
+    return upsert_points("background_tasks", points)
+
+def load_background_tasks(task_id: Optional[str] = None, statuses: Optional[List[str]] = None) -> List[tuple]:
+    """(point_id, payload) pairs of persisted tasks, filtered by task ID and/or status."""
+    match = {"task_id": task_id} if task_id else None
+    match_any = {"status": statuses} if statuses else None
+    return [(point.id, point.payload) for point in find_points("background_tasks", match=match, match_any=match_any)]
+
 async def get_any_running_task_for_user(user_id: str) -> Optional[Dict[str, Any]]:
     """
     Check if user has ANY running or pending task (regardless of website).
     Returns the task if found, None otherwise.
     """
-    try:
-        # Get all tasks for this user
-        try:
-            points, _ = QDRANT_CLIENT.scroll(
-                collection_name="background_tasks",
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="user_id",
-                            match=models.MatchValue(value=user_id)
-                        )
-                    ]
-                ),
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, get all points and filter manually
-            if "Index required" in str(e):
-                logging.warning(f"[database.py] Index not found for user_id, using manual filtering")
-                points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="background_tasks",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Filter manually by user_id
-                points = [p for p in points if p.payload.get("user_id") == user_id]
-            else:
-                raise e
-        
-        # Filter by status (running or pending)
-        for point in points:
-            task = point.payload
-            task_status = task.get("status", "")
-            
-            # Check if status is running or pending
-            if task_status in ["running", "pending"]:
-                logging.info(f"[database.py] Found running task {task.get('task_id')} for user {user_id}")
-                return task
-        
-        return None
-        
-    except Exception as e:
-        logging.error(f"[database.py][ERROR] Exception in get_any_running_task_for_user: {e}")
-        return None
+    from app.core.task_registry import task_registry
+    return task_registry.get_active_for_user(user_id)
 
 async def get_running_task_for_website(user_id: str, website: str) -> Optional[Dict[str, Any]]:
     """
     Check if there's already a running or pending task for a specific website.
     Returns the task if found, None otherwise.
     """
-    try:
-        # Normalize website for consistent comparison
-        normalized_website = normalize_website(website)
-        
-        if not normalized_website:
-            logging.warning(f"[database.py] Empty normalized website, cannot check for running task")
-            return None
-        
-        # Get all tasks for this user
-        try:
-            points, _ = QDRANT_CLIENT.scroll(
-                collection_name="background_tasks",
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="user_id",
-                            match=models.MatchValue(value=user_id)
-                        )
-                    ]
-                ),
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, get all points and filter manually
-            if "Index required" in str(e):
-                logging.warning(f"[database.py] Index not found for user_id, using manual filtering")
-                points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="background_tasks",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Filter manually by user_id
-                points = [p for p in points if p.payload.get("user_id") == user_id]
-            else:
-                raise e
-        
-        # Filter by website and status
-        for point in points:
-            task = point.payload
-            task_website = task.get("website", "")
-            task_status = task.get("status", "")
-            
-            # Normalize task website for comparison
-            normalized_task_website = normalize_website(task_website)
-            
-            # Check if website matches and status is running or pending
-            if (normalized_task_website == normalized_website and 
-                task_status in ["running", "pending"]):
-                logging.info(f"[database.py] Found running task {task.get('task_id')} for website {website}")
-                return task
-        
-        return None
-        
-    except Exception as e:
-        logging.error(f"[database.py][ERROR] Exception in get_running_task_for_website: {e}")
+    from app.core.task_registry import task_registry
+    normalized_website = normalize_website(website)
+    if not normalized_website:
+        logging.warning(f"[database.py] Empty normalized website, cannot check for running task")
         return None
+    task = task_registry.get_active_for_user(user_id)
+    if task and normalize_website(task.get("website", "")) == normalized_website:
+        return task
+    return None
 
 async def check_and_create_background_task(user_id: str, website: str) -> tuple[str, str, str]:
     """
@@ -1455,155 +1661,30 @@ async def check_and_create_background_task(user_id: str, website: str) -> tuple[
         - message: Human-readable message
     """
     try:
-        # Normalize website
         normalized_website = normalize_website(website)
-        
         if not normalized_website:
             return ("", "error", "Invalid website URL")
         
-        # FIRST: Check if user has ANY running task (regardless of website)
-        any_running_task = await get_any_running_task_for_user(user_id)
-        
-        if any_running_task:
-            task_id = any_running_task.get("task_id")
-            if not task_id:
-                return ("", "error", "Task ID not found in running task")
-            task_status = any_running_task.get("status", "running")
-            running_website = any_running_task.get("website", "unknown")
-            logging.info(f"[database.py] User {user_id} already has task {task_id} {task_status} for {running_website}")
-            return (task_id, "already_running", f"Persona generation already in progress for {running_website}. Only one generation per user at a time.")
-        
-        # No existing task, create new one
-        task_id = await create_background_task(user_id, normalized_website)
-        logging.info(f"[database.py] Created new task {task_id} for website {website}")
-        return (task_id, "created", f"New task created for {website}")
+        # Check and create happen under the registry lock, so two reruns cannot both start a task
+        from app.core.task_registry import task_registry
+        return task_registry.admit(user_id, normalized_website)
         
     except Exception as e:
         logging.error(f"[database.py][ERROR] Exception in check_and_create_background_task: {e}")
         return ("", "error", f"Error creating task: {str(e)}")
 
 async def create_background_task(user_id: str, website: str) -> str:
-    """Create a new background task and return task_id."""
-    try:
-        task_id = str(uuid.uuid4())
-        current_time = datetime.now()
-        
-        task_data = {
-            "task_id": task_id,
-            "user_id": user_id,
-            "website": website,
-            "status": "running",
-            "progress_percent": 0,
-            "current_step": "Initializing...",
-            "step_description": "Starting persona generation process",
-            "error_message": None,
-            "result_persona": None,
-            "created_at": current_time.isoformat(),
-            "updated_at": current_time.isoformat()
-        }
-        
-        # CRITICAL: Qdrant point IDs must be integers, not UUID strings
-        # Convert UUID string to integer hash for point ID
-        point_id = abs(hash(task_id)) % (10 ** 12)
-        
-        # Store in Qdrant
-        QDRANT_CLIENT.upsert(
-            collection_name="background_tasks",
-            points=[models.PointStruct(
-                id=point_id,  # Use integer hash, not UUID string
-                vector=[0.0] * VECTOR_DIM,  # Dummy vector for Qdrant
-                payload=task_data  # UUID string stored in payload for querying
-            )]
-        )
-        
-        logging.info(f"[database.py] Created background task {task_id} (point_id: {point_id}) for user {user_id}")
-        return task_id
-        
-    except Exception as e:
-        logging.error(f"[database.py][ERROR] Exception in create_background_task: {e}")
-        raise
+    """Create a new background task and return task_id. Raises if the user already has a running task."""
+    task_id, status, message = await check_and_create_background_task(user_id, website)
+    if status != "created":
+        raise RuntimeError(message)
+    return task_id
 
 async def update_background_task(task_id: str, **updates):
-    """Update task progress/status."""
+    """Update task progress/status (in memory; persisted by the registry's flusher)."""
     try:
-        logging.info(f"[database.py] Starting update for task {task_id} with updates: {updates}")
-        
-        # Get current task data
-        logging.info(f"[database.py] Getting current task data for {task_id}")
-        try:
-            points, _ = QDRANT_CLIENT.scroll(
-                collection_name="background_tasks",
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="task_id",
-                            match=models.MatchValue(value=task_id)
-                        )
-                    ]
-                ),
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, try to get all points and filter manually
-            if "Index required" in str(e):
-                logging.warning(f"[database.py] Index not found for task_id, using manual filtering")
-                points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="background_tasks",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Filter manually
-                points = [p for p in points if p.payload.get("task_id") == task_id]
-            else:
-                raise e
-        
-        if not points:
-            logging.warning(f"[database.py] Task {task_id} not found for update")
-            return False
-            
-        task_data = points[0].payload
-        task_data.update(updates)
-        task_data["updated_at"] = datetime.now().isoformat()
-        
-        # CRITICAL: Get the point ID (integer) from the found point, not from task_id (UUID string)
-        point_id = points[0].id
-        
-        logging.info(f"[database.py] Updating task {task_id} (point_id: {point_id}) with data: {task_data}")
-        
-        # Update in Qdrant with timeout
-        import asyncio
-        try:
-            # Run the synchronous upsert in a thread to avoid blocking
-            loop = asyncio.get_event_loop()
-            await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: QDRANT_CLIENT.upsert(
-                        collection_name="background_tasks",
-                        points=[models.PointStruct(
-                            id=point_id,  # Use the integer point ID from the found point
-                            vector=[0.0] * VECTOR_DIM,
-                            payload=task_data
-                        )]
-                    )
-                ),
-                timeout=2.0  # 2 second timeout (reduced from 3)
-            )
-            logging.info(f"[database.py] Successfully updated task {task_id}")
-        except asyncio.TimeoutError:
-            logging.warning(f"[database.py] Timeout updating task {task_id}, continuing...")
-            return False
-        except Exception as e:
-            logging.error(f"[database.py] Error updating task {task_id}: {e}")
-            return False
-        
-        logging.info(f"[database.py] Successfully updated background task {task_id}")
-        return True
-        
-    except asyncio.TimeoutError:
-        logging.error(f"[database.py] Timeout updating task {task_id}")
-        return False
+        from app.core.task_registry import task_registry
+        return task_registry.update(task_id, **updates)
     except Exception as e:
         logging.error(f"[database.py][ERROR] Exception in update_background_task: {e}")
         return False
@@ -1611,60 +1692,19 @@ async def update_background_task(task_id: str, **updates):
 async def get_background_task(task_id: str) -> Optional[Dict[str, Any]]:
     """Get task by ID."""
     try:
-        try:
-            points, _ = QDRANT_CLIENT.scroll(
-                collection_name="background_tasks",
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="task_id",
-                            match=models.MatchValue(value=task_id)
-                        )
-                    ]
-                ),
-                with_payload=True,
-                with_vectors=False
-            )
-        except Exception as e:
-            # If index error, try to get all points and filter manually
-            if "Index required" in str(e):
-                logging.warning(f"[database.py] Index not found for task_id, using manual filtering")
-                points, _ = QDRANT_CLIENT.scroll(
-                    collection_name="background_tasks",
-                    with_payload=True,
-                    with_vectors=False
-                )
-                # Filter manually
-                points = [p for p in points if p.payload.get("task_id") == task_id]
-            else:
-                raise e
-        
-        if points:
-            return points[0].payload
-        return None
-        
+        from app.core.task_registry import task_registry
+        return task_registry.get(task_id)
     except Exception as e:
         logging.error(f"[database.py][ERROR] Exception in get_background_task: {e}")
         return None
 
 async def get_user_background_tasks(user_id: str) -> List[Dict[str, Any]]:
-    """Get all tasks for a user."""
+    """Get all tasks for a user (persisted tasks, overlaid with the live in-memory state)."""
     try:
-        points, _ = QDRANT_CLIENT.scroll(
-            collection_name="background_tasks",
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="user_id",
-                        match=models.MatchValue(value=user_id)
-                    )
-                ]
-            ),
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        return [point.payload for point in points]
+        from app.core.task_registry import task_registry
+        tasks = {task.get("task_id"): task for task in find_payloads("background_tasks", match={"user_id": user_id})}
+        tasks.update({task["task_id"]: task for task in task_registry.get_user_tasks(user_id)})
+        return list(tasks.values())
         
     except Exception as e:
         logging.error(f"[database.py][ERROR] Exception in get_user_background_tasks: {e}")
@@ -1676,19 +1716,7 @@ async def cleanup_completed_tasks():
         cutoff_time = datetime.now() - timedelta(hours=24)
         
         # Get old completed tasks
-        points, _ = QDRANT_CLIENT.scroll(
-            collection_name="background_tasks",
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="status",
-                        match=models.MatchValue(value="completed")
-                    )
-                ]
-            ),
-            with_payload=True,
-            with_vectors=False
-        )
+        points = find_points("background_tasks", match={"status": "completed"})
         
         # Filter tasks older than 24 hours
         old_tasks = []
@@ -4,15 +4,50 @@ Handles storage and retrieval of scraped company website content.
 """
 
 import logging
+import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional
 from qdrant_client.http import models
-from app.database import QDRANT_CLIENT
+from app.database import QDRANT_CLIENT, is_collection_verified, mark_collection_verified
 
 logger = logging.getLogger(__name__)
 
+def _website_point_id(website_url: str) -> str:
+    """Stable point ID for a website (hash() differs between processes)."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, website_url))
+
+def _build_website_payload(website_url: str, scraped_data: Dict[str, Any], content_hash: str, created_at: str) -> Dict[str, Any]:
+    """Full record for a scrape: organized content plus per-page records and section hashes."""
+    now = datetime.utcnow().isoformat()
+    return {
+        "website_url": website_url,
+        "last_scraped_at": now,
+        "content_hash": content_hash,
+        "created_at": created_at,
+        "updated_at": now,
+        # Flatten scraped data fields
+        "pages_scraped": scraped_data.get('pages_scraped', 0),
+        "total_words": scraped_data.get('total_words', 0),
+        "content": scraped_data.get('content', {}),
+        "section_hashes": scraped_data.get('section_hashes', {}),
+        "pages": scraped_data.get('pages', {}),
+        "scraped_at": scraped_data.get('scraped_at', now)
+    }
+
+def _get_company_website_point():
+    """The stored website record (the collection holds one company), or None."""
+    points, _ = QDRANT_CLIENT.scroll(
+        collection_name="company_website_data",
+        limit=1,
+        with_payload=True,
+        with_vectors=False
+    )
+    return points[0] if points else None
+
 def create_company_website_collection():
-    """Create the company_website_data collection if it doesn't exist."""
+    """Create the company_website_data collection if it doesn't exist (checked against Qdrant once per process)."""
+    if is_collection_verified("company_website_data"):
+        return
     try:
         # Check if collection exists
         collections = QDRANT_CLIENT.get_collections()
@@ -26,6 +61,8 @@ def create_company_website_collection():
             logger.info("Created company_website_data collection")
         else:
             logger.info("company_website_data collection already exists")
+        
+        mark_collection_verified("company_website_data")
             
     except Exception as e:
         logger.error(f"Error creating company_website_data collection: {e}")
@@ -46,22 +83,8 @@ def save_company_website_data(website_url: str, scraped_data: Dict[str, Any], co
     try:
         create_company_website_collection()
         
-        # Create payload - flatten the scraped data
-        payload = {
-            "website_url": website_url,
-            "last_scraped_at": datetime.utcnow().isoformat(),
-            "content_hash": content_hash,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-            # Flatten scraped data fields
-            "pages_scraped": scraped_data.get('pages_scraped', 0),
-            "total_words": scraped_data.get('total_words', 0),
-            "content": scraped_data.get('content', {}),
-            "scraped_at": scraped_data.get('scraped_at', datetime.utcnow().isoformat())
-        }
-        
-        # Use website_url as the point ID (unique identifier)
-        point_id = hash(website_url) % (10 ** 12)
+        payload = _build_website_payload(website_url, scraped_data, content_hash, datetime.utcnow().isoformat())
+        point_id = _website_point_id(website_url)
         
         # Upsert the data
         QDRANT_CLIENT.upsert(
@@ -72,10 +95,15 @@ def save_company_website_data(website_url: str, scraped_data: Dict[str, Any], co
                 payload=payload
             )]
         )
+        # A full save replaces any other stored record (e.g. older hash()-based point IDs)
+        QDRANT_CLIENT.delete(
+            collection_name="company_website_data",
+            points_selector=models.FilterSelector(filter=models.Filter(must_not=[models.HasIdCondition(has_id=[point_id])]))
+        )
         
         logger.info(f"Saved company website data for {website_url}")
         logger.info(f"Payload keys: {list(payload.keys())}")
-        logger.info(f"Content keys: {list(payload.get('scraped_data', {}).keys())}")
+        logger.info(f"Content keys: {list(payload.get('content', {}).keys())}")
         return True
         
     except Exception as e:
@@ -92,17 +120,10 @@ def get_company_website_data() -> Optional[Dict[str, Any]]:
     try:
         create_company_website_collection()
         
-        # Get all points (should be only one for single company)
-        result = QDRANT_CLIENT.scroll(
-            collection_name="company_website_data",
-            limit=1,
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        points = result[0]
-        if points:
-            return points[0].payload
+        # Get the stored record (should be only one for single company)
+        point = _get_company_website_point()
+        if point:
+            return point.payload
         else:
             logger.info("No company website data found")
             return None
@@ -115,6 +136,9 @@ def update_company_website_data(website_url: str, scraped_data: Dict[str, Any],
     """
     Update existing company website data.
     
+    If the organized content is unchanged (same content hash), only the scrape time and
+    per-page fetch metadata are written; otherwise the record is replaced.
+    
     Args:
         website_url: The company's website URL
         scraped_data: Updated processed content
@@ -126,38 +150,38 @@ def update_company_website_data(website_url: str, scraped_data: Dict[str, Any],
     try:
         create_company_website_collection()
         
-        # Get existing data to preserve created_at
-        existing_data = get_company_website_data()
-        created_at = existing_data.get("created_at", datetime.utcnow().isoformat()) if existing_data else datetime.utcnow().isoformat()
-        
-        # Create updated payload - flatten the scraped data
-        payload = {
-            "website_url": website_url,
-            "last_scraped_at": datetime.utcnow().isoformat(),
-            "content_hash": content_hash,
-            "created_at": created_at,
-            "updated_at": datetime.utcnow().isoformat(),
-            # Flatten scraped data fields
-            "pages_scraped": scraped_data.get('pages_scraped', 0),
-            "total_words": scraped_data.get('total_words', 0),
-            "content": scraped_data.get('content', {}),
-            "scraped_at": scraped_data.get('scraped_at', datetime.utcnow().isoformat())
-        }
-        
-        # Use website_url as the point ID
-        point_id = hash(website_url) % (10 ** 12)
-        
-        # Upsert the updated data
+        existing = _get_company_website_point()
+        existing_data = existing.payload if existing else None
+        if not existing_data or existing_data.get("website_url") != website_url:
+            return save_company_website_data(website_url, scraped_data, content_hash)
+        
+        if existing_data.get("content_hash") == content_hash:
+            QDRANT_CLIENT.set_payload(
+                collection_name="company_website_data",
+                payload={
+                    "last_scraped_at": datetime.utcnow().isoformat(),
+                    "scraped_at": scraped_data.get('scraped_at', datetime.utcnow().isoformat()),
+                    "pages": scraped_data.get('pages', {}),
+                    "section_hashes": scraped_data.get('section_hashes', {})
+                },
+                points=[existing.id]
+            )
+            logger.info(f"Company website content unchanged for {website_url}, updated fetch metadata only")
+            return True
+        
+        # Preserve created_at and the existing point
+        created_at = existing_data.get("created_at", datetime.utcnow().isoformat())
+        payload = _build_website_payload(website_url, scraped_data, content_hash, created_at)
         QDRANT_CLIENT.upsert(
             collection_name="company_website_data",
             points=[models.PointStruct(
-                id=point_id,
+                id=existing.id,
                 vector=[0.0] * 384,  # Dummy vector
                 payload=payload
             )]
         )
         
-        logger.info(f"Updated company website data for {website_url}")
+        logger.info(f"Updated company website data for {website_url} (changed sections: {scraped_data.get('changed_sections', 'unknown')})")
         return True
         
     except Exception as e:
@@ -2,39 +2,110 @@
 Framework Customizations Database
 Stores industry framework customizations (added/removed/modified items)
 Shared across all users - admin-only feature
+
+All customizations are read in one scroll and kept in memory. Writers bump a version stamp
+that invalidates the cache; readers such as DynamicIndustryFrameworkGenerator compare the
+stamp to reuse customized frameworks without touching the database. Changes made by other
+processes are picked up after FRAMEWORK_CUSTOMIZATION_CACHE_TTL seconds.
 """
 
+import copy
+import time
 import logging
+import threading
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from qdrant_client.http import models
-from app.database import QDRANT_CLIENT, ensure_collection, VECTOR_DIM
+from app.database import QDRANT_CLIENT, ensure_collection_once, COLLECTIONS, placeholder_vector
+
+# Import cache configuration
+try:
+    from app.config import FRAMEWORK_CUSTOMIZATION_CACHE_TTL
+except ImportError:
+    # Fallback value if config import fails
+    FRAMEWORK_CUSTOMIZATION_CACHE_TTL = 300
 
 logger = logging.getLogger(__name__)
 
 # Collection name for framework customizations
 FRAMEWORK_CUSTOMIZATIONS_COLLECTION = "framework_customizations"
 
+# In-memory copy of all customizations (industry -> customizations) and its version stamp
+_cache_lock = threading.Lock()
+_customizations_cache: Optional[Dict[str, Dict[str, Any]]] = None
+_cache_loaded_at = 0.0
+_customizations_version = 0
+
 def ensure_framework_customizations_collection():
-    """Ensure the framework customizations collection exists with proper indexes"""
-    ensure_collection(FRAMEWORK_CUSTOMIZATIONS_COLLECTION, VECTOR_DIM, "Cosine")
-    
-    # Create index on industry_name for efficient filtering
-    try:
-        QDRANT_CLIENT.create_payload_index(
-            collection_name=FRAMEWORK_CUSTOMIZATIONS_COLLECTION,
-            field_name="industry_name",
-            field_schema=models.PayloadSchemaType.KEYWORD
-        )
-        logger.info(f"Created index on 'industry_name' for {FRAMEWORK_CUSTOMIZATIONS_COLLECTION}")
-    except Exception as e:
-        # Index might already exist, which is fine
-        if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
-            logger.warning(f"Could not create index on 'industry_name' (may already exist): {e}")
+    """Ensure the framework customizations collection exists with proper indexes (checked once per process)"""
+    # The industry_name index is declared in COLLECTION_INDEXES
+    ensure_collection_once(FRAMEWORK_CUSTOMIZATIONS_COLLECTION, COLLECTIONS[FRAMEWORK_CUSTOMIZATIONS_COLLECTION]["vector_size"], "Cosine")
 
 # Note: Framework customizations are shared across all users (admin-only feature)
 # No user_id needed - customizations are per-industry only
 
+def _invalidate_customizations_cache():
+    """Drop the in-memory customizations and bump the version stamp (called by every writer)."""
+    global _customizations_cache, _customizations_version
+    with _cache_lock:
+        _customizations_cache = None
+        _customizations_version += 1
+
+def _load_all_customizations() -> Dict[str, Dict[str, Any]]:
+    """Scroll the whole collection; industries with several points keep the latest update."""
+    ensure_framework_customizations_collection()
+    latest: Dict[str, Dict[str, Any]] = {}
+    offset = None
+    while True:
+        points, offset = QDRANT_CLIENT.scroll(
+            collection_name=FRAMEWORK_CUSTOMIZATIONS_COLLECTION,
+            limit=256,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+        for point in points:
+            payload = point.payload or {}
+            industry = payload.get("industry_name")
+            if not industry:
+                continue
+            if industry not in latest or str(payload.get("updated_at", "")) > str(latest[industry].get("updated_at", "")):
+                latest[industry] = payload
+        if offset is None:
+            break
+    return {industry: payload.get("customizations") or {} for industry, payload in latest.items()}
+
+def _cached_customizations() -> Dict[str, Dict[str, Any]]:
+    """The shared in-memory customizations, loading them if missing or older than the TTL."""
+    global _customizations_cache, _cache_loaded_at, _customizations_version
+    with _cache_lock:
+        if _customizations_cache is not None and time.time() - _cache_loaded_at < FRAMEWORK_CUSTOMIZATION_CACHE_TTL:
+            return _customizations_cache
+        version = _customizations_version
+    
+    loaded = _load_all_customizations()
+    with _cache_lock:
+        if _customizations_version == version:
+            # Not stored if a writer invalidated the cache while we were reading
+            if loaded != _customizations_cache:
+                _customizations_version += 1  # the reload brought changes made by other processes
+            _customizations_cache = loaded
+            _cache_loaded_at = time.time()
+    logger.info(f"Loaded framework customizations for {len(loaded)} industries")
+    return loaded
+
+def get_customizations_version() -> int:
+    """
+    Version stamp of the customizations; changes whenever they are written or a reload finds changes.
+    Costs no database round trip while the cache is fresh.
+    """
+    try:
+        _cached_customizations()
+    except Exception as e:
+        logger.error(f"Error loading framework customizations: {e}", exc_info=True)
+    with _cache_lock:
+        return _customizations_version
+
 def save_framework_customization(industry_name: str, customizations: Dict[str, Any]) -> bool:
     """
     Save framework customizations for an industry (shared across all users)
@@ -81,11 +152,12 @@ def save_framework_customization(industry_name: str, customizations: Dict[str, A
             collection_name=FRAMEWORK_CUSTOMIZATIONS_COLLECTION,
             points=[models.PointStruct(
                 id=point_id,
-                vector=[0.0] * VECTOR_DIM,  # Dummy vector
+                vector=placeholder_vector(FRAMEWORK_CUSTOMIZATIONS_COLLECTION),  # Payload-only collection
                 payload=payload
             )]
         )
         
+        _invalidate_customizations_cache()
         logger.info(f"Saved framework customizations for industry: {normalized_industry} (shared across all users)")
         return True
         
@@ -104,47 +176,9 @@ def get_framework_customization(industry_name: str) -> Optional[Dict[str, Any]]:
         Dict with customizations or None if not found
     """
     try:
-        ensure_framework_customizations_collection()
-        
         normalized_industry = industry_name.lower().replace(" ", "_")
-        
-        # Search for customizations (no user_id filter - shared across all users)
-        # Use scroll without filter if index doesn't exist, then filter manually
-        try:
-            results = QDRANT_CLIENT.scroll(
-                collection_name=FRAMEWORK_CUSTOMIZATIONS_COLLECTION,
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="industry_name",
-                            match=models.MatchValue(value=normalized_industry)
-                        )
-                    ]
-                ),
-                limit=1
-            )
-        except Exception as e:
-            # If index error, fall back to manual filtering
-            if "index" in str(e).lower() or "Index required" in str(e):
-                logger.warning(f"Index not found for industry_name, using manual filtering: {e}")
-                all_results = QDRANT_CLIENT.scroll(
-                    collection_name=FRAMEWORK_CUSTOMIZATIONS_COLLECTION,
-                    limit=100  # Get all customizations (should be small number)
-                )
-                # Filter manually
-                points = all_results[0] if all_results[0] else []
-                matching_points = [p for p in points if p.payload.get("industry_name") == normalized_industry]
-                if matching_points:
-                    return matching_points[0].payload.get("customizations")
-                return None
-            else:
-                raise e
-        
-        if results[0]:  # results is (points, next_page_offset)
-            point = results[0][0]
-            return point.payload.get("customizations")
-        
-        return None
+        customizations = _cached_customizations().get(normalized_industry)
+        return copy.deepcopy(customizations) if customizations else None
         
     except Exception as e:
         logger.error(f"Error getting framework customizations: {e}", exc_info=True)
@@ -166,8 +200,8 @@ def apply_customizations_to_framework(framework_data: Dict[str, Any], industry_n
     if not customizations:
         return framework_data
     
-    # Create a copy to avoid modifying original
-    customized_framework = framework_data.copy()
+    # Create a copy to avoid modifying original (the property lists are changed in place below)
+    customized_framework = copy.deepcopy(framework_data)
     
     # Apply added items
     added_items = customizations.get("added_items", {})
@@ -6,7 +6,7 @@ Extends the existing database functionality with user-based filtering.
 import logging
 from typing import Optional, Dict, Any, List
 from qdrant_client.models import Filter, FieldCondition, MatchValue
-from .database import QDRANT_CLIENT, ensure_collections_exist
+from .database import QDRANT_CLIENT, ensure_collections_exist, invalidate_value_components_cache
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +113,7 @@ class UserAwareDatabase:
                     collection_name="value_components",
                     points_selector=[point_id]
                 )
+                invalidate_value_components_cache(self.user_id)
                 logger.info(f"Deleted user value component: {name}")
                 return True
             
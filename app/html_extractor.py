@@ -0,0 +1,266 @@
+"""
+HTML extraction engine for the company website scraper.
+Parses each page once with lxml. Internal links are collected from the whole document; title,
+description, main content, headings, lists and paragraphs come from a single walk over the
+tree after dropping boilerplate (scripts, navigation, footers, sidebars, forms without page
+content). Falls back to BeautifulSoup's html.parser when lxml is not installed.
+
+CPU-heavy parsing of many pages can be moved off the event loop with parse_in_pool().
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urldefrag
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Import extraction configuration
+try:
+    from app.config import SCRAPER_PARSE_PROCESSES, SCRAPER_PROCESS_POOL_MIN_PAGES
+except ImportError:
+    # Fallback values if config import fails
+    SCRAPER_PARSE_PROCESSES = 2
+    SCRAPER_PROCESS_POOL_MIN_PAGES = 6
+
+logger = logging.getLogger(__name__)
+
+# Elements whose text is never page content (page headers are kept: they often hold the hero headline)
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'nav', 'footer', 'aside']
+
+# Forms are only dropped when they hold no page content: ASP.NET WebForms pages wrap the whole
+# body in <form runat="server">
+FORM_CONTENT_TAGS = ('main', 'article', 'h1', 'h2')
+
+# Main content candidates, in the order the BeautifulSoup path tried its CSS selectors
+# ('main', 'article', '.content', '.main-content', '.page-content', '#content', '.container')
+MAIN_CONTENT_XPATHS = [
+    '//main',
+    '//article',
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' main-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' page-content ')]",
+    "//*[@id='content']",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' container ')]",
+]
+
+SKIP_LINK_PATTERNS = [
+    'mailto:', 'tel:', 'javascript:', '.pdf', '.doc', '.docx',
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.css', '.js', '.xml', '.zip'
+]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_UNWANTED_CHARS_RE = re.compile(r'[^\w\s.,!?;:()\-&]')
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text content."""
+    if not text:
+        return ""
+    text = _WHITESPACE_RE.sub(' ', text.strip())
+    return _UNWANTED_CHARS_RE.sub('', text)
+
+
+def _element_text(element) -> str:
+    return clean_text(''.join(element.itertext()))
+
+
+def extract_page(url: str, content: bytes) -> Dict[str, Any]:
+    """
+    Extract the scraper's page data from raw HTML.
+
+    Returns:
+        Dict with url, title, description, main_content, headings, lists, paragraphs,
+        word_count, scraped_at and links (internal URL -> anchor text)
+    """
+    if not LXML_AVAILABLE:
+        return extract_page_bs4(url, content)
+
+    root = lxml.html.fromstring(content) if content.strip() else lxml.html.fromstring("<html></html>")
+
+    title_element = root.find('.//title')
+    title = _element_text(title_element) if title_element is not None else ""
+    description = ""
+    for meta in root.iter('meta'):
+        if (meta.get('name') or '').lower() == 'description':
+            description = clean_text(meta.get('content') or '')
+            break
+
+    # Links come from the whole document: menus and footers are what page discovery follows
+    base_host = urlparse(url).netloc
+    links: Dict[str, str] = {}
+    for element in root.iter('a'):
+        href = element.get('href')
+        if not href or href.startswith('#') or any(pattern in href.lower() for pattern in SKIP_LINK_PATTERNS):
+            continue
+        full_url = urldefrag(urljoin(url, href))[0]
+        if urlparse(full_url).netloc == base_host:
+            links.setdefault(full_url, ' '.join(''.join(element.itertext()).split()))
+
+    # Boilerplate removal (keeps the tail text of removed elements)
+    for element in list(root.iter(*BOILERPLATE_TAGS)):
+        element.drop_tree()
+    for form in list(root.iter('form')):
+        if next(form.iter(*FORM_CONTENT_TAGS), None) is None:
+            form.drop_tree()
+
+    headings: List[Tuple[int, str]] = []
+    lists: List[Dict[str, Any]] = []
+    paragraphs: List[str] = []
+
+    # Single walk over the cleaned tree for content
+    for element in root.iter():
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            text = _element_text(element)
+            if text:
+                headings.append((int(tag[1]), text))
+        elif tag == 'p':
+            text = _element_text(element)
+            if text and len(text) > 50:  # Only substantial paragraphs
+                paragraphs.append(text)
+        elif tag in ('ul', 'ol'):
+            items = [text for text in (_element_text(li) for li in element.iter('li')) if text and len(text) > 10]
+            if items:
+                lists.append({'type': tag, 'items': items})
+
+    main_content = ""
+    for xpath in MAIN_CONTENT_XPATHS:
+        matches = root.xpath(xpath)
+        if matches:
+            main_content = _element_text(matches[0])
+            break
+    if not main_content:
+        body = root.find('.//body')
+        main_content = _element_text(body if body is not None else root)
+
+    # Headings grouped by level, like the BeautifulSoup path
+    headings.sort(key=lambda heading: heading[0])
+
+    return {
+        'url': url,
+        'title': title,
+        'description': description,
+        'main_content': main_content,
+        'headings': [{'level': level, 'text': text} for level, text in headings],
+        'lists': lists,
+        'paragraphs': paragraphs,
+        'word_count': len(main_content.split()),
+        'scraped_at': datetime.utcnow().isoformat(),
+        'links': links
+    }
+
+
+def extract_page_bs4(url: str, content: bytes) -> Dict[str, Any]:
+    """The previous BeautifulSoup (html.parser) extraction path; used without lxml and as the benchmark baseline."""
+    from bs4 import BeautifulSoup
+
+    def element_text(element) -> str:
+        if not element:
+            return ""
+        for script in element(["script", "style"]):
+            script.decompose()
+        return clean_text(element.get_text())
+
+    soup = BeautifulSoup(content, 'html.parser')
+    title = element_text(soup.find('title'))
+    meta = soup.find('meta', attrs={'name': 'description'})
+    description = clean_text(str(meta.get('content') or '')) if meta else ""
+
+    main_content = ""
+    for selector in ['main', 'article', '.content', '.main-content', '.page-content', '#content', '.container']:
+        element = soup.select_one(selector)
+        if element:
+            main_content = element_text(element)
+            break
+    if not main_content:
+        body = soup.find('body')
+        if body:
+            main_content = element_text(body)
+
+    headings = []
+    for level in range(1, 7):
+        for heading in soup.find_all(f'h{level}'):
+            text = element_text(heading)
+            if text:
+                headings.append({'level': level, 'text': text})
+
+    lists = []
+    for list_element in soup.find_all(['ul', 'ol']):
+        items = [text for text in (element_text(li) for li in list_element.find_all('li')) if text and len(text) > 10]
+        if items:
+            lists.append({'type': list_element.name, 'items': items})
+
+    paragraphs = [text for text in (element_text(p) for p in soup.find_all('p')) if text and len(text) > 50]
+
+    base_host = urlparse(url).netloc
+    links: Dict[str, str] = {}
+    for link in soup.find_all('a', href=True):
+        href = str(link.get('href'))
+        if href.startswith('#') or any(pattern in href.lower() for pattern in SKIP_LINK_PATTERNS):
+            continue
+        full_url = urldefrag(urljoin(url, href))[0]
+        if urlparse(full_url).netloc == base_host:
+            links.setdefault(full_url, link.get_text(" ", strip=True))
+
+    return {
+        'url': url,
+        'title': title,
+        'description': description,
+        'main_content': main_content,
+        'headings': headings,
+        'lists': lists,
+        'paragraphs': paragraphs,
+        'word_count': len(main_content.split()),
+        'scraped_at': datetime.utcnow().isoformat(),
+        'links': links
+    }
+
+
+# --- Process pool ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for page parsing (None if SCRAPER_PARSE_PROCESSES is 0)."""
+    global _pool
+    if SCRAPER_PARSE_PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: the Streamlit process has worker threads and held locks
+            _pool = ProcessPoolExecutor(max_workers=SCRAPER_PARSE_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+            logger.info(f"[html_extractor] Started parse pool with {SCRAPER_PARSE_PROCESSES} processes")
+        return _pool
+
+
+async def parse_in_pool(url: str, content: bytes, use_pool: bool = True) -> Dict[str, Any]:
+    """extract_page() in the parse pool, or inline if the pool is disabled or unusable."""
+    pool = get_parse_pool() if use_pool else None
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, extract_page, url, content)
+        except Exception as e:
+            # e.g. BrokenProcessPool; parsing inline still works
+            logger.warning(f"[html_extractor] Parse pool failed for {url}, parsing inline: {e}")
+    return extract_page(url, content)
+
+
+def should_use_pool(page_count: int) -> bool:
+    """Parsing moves to the process pool only when a crawl has enough pages to amortize the IPC."""
+    return SCRAPER_PARSE_PROCESSES > 0 and page_count >= SCRAPER_PROCESS_POOL_MIN_PAGES
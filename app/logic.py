@@ -666,17 +666,16 @@ async def calculate_and_save_value_bricks(new_components_raw: List[Dict[str, Any
         logging.warning(f"[logic.py] Saving value bricks: {keys}")
         logging.warning(f"[logic.py] Names being saved: {[c.get('name') for c in deduped_components]}")
 
-        # Save each processed component to value_components
-        from app.database import save_value_component
-        save_success = True
+        # Save all processed components to value_components in batched upserts
+        from app.database import save_value_components
         total_components = len(deduped_components)
         logger.info(f"[calculate_and_save_value_bricks] Saving {total_components} components to database...")
         
-        for idx, comp in enumerate(deduped_components, 1):
-            logger.info(f"[calculate_and_save_value_bricks] Saving component {idx}/{total_components}: {comp.get('name', 'Unknown')}")
-            if not save_value_component(comp):
+        results = save_value_components(deduped_components)
+        for comp, saved in zip(deduped_components, results):
+            if not saved:
                 logger.error(f"[calculate_and_save_value_bricks] Failed to save value component: {comp}")
-                save_success = False
+        save_success = all(results)
         
         if save_success:
             logger.info(f"[calculate_and_save_value_bricks] Successfully saved all {total_components} components")
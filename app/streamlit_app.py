@@ -98,40 +98,20 @@ from app.admin.company_setup_wizard import CompanySetupWizard
 def render_background_task_progress():
     """Show background task progress in sidebar with stable rendering to prevent duplicates."""
     try:
-        from app.database import get_background_task, get_any_running_task_for_user
+        from app.core.task_registry import task_registry
         
         task_id = st.session_state.get("background_persona_task_id")
         
-        # If no task_id in session, try to find one in database
+        # If no task_id in session, look for a running task of this user (in memory, no database query)
         if not task_id:
-            try:
-                user_id = st.session_state.get('user_id', 'anonymous')
-                existing_task = asyncio.run(get_any_running_task_for_user(user_id))
-                if existing_task:
-                    task_id = existing_task.get("task_id")
-                    if task_id:
-                        st.session_state.background_persona_task_id = task_id
-                    else:
-                        return
-                else:
-                    return
-            except Exception as e:
-                logging.debug(f"Could not check for running tasks: {e}")
+            user_id = st.session_state.get('user_id', 'anonymous')
+            existing_task = task_registry.get_active_for_user(user_id)
+            if not existing_task:
                 return
+            task_id = existing_task["task_id"]
+            st.session_state.background_persona_task_id = task_id
         
-        # Try to get task from database
-        task = None
-        try:
-            task = asyncio.run(get_background_task(task_id))
-        except RuntimeError as e:
-            # Event loop already running - try alternative approach
-            logging.debug(f"Event loop issue: {e}, showing initializing state")
-            # Show "initializing" state if we can't query yet
-            task = {"status": "running", "progress_percent": 0, "current_step": "Initializing..."}
-        except Exception as e:
-            logging.error(f"Error getting task {task_id}: {e}")
-            # Show "initializing" state if task not found yet (might be just created)
-            task = {"status": "running", "progress_percent": 0, "current_step": "Initializing..."}
+        task = task_registry.get(task_id)
         
         if not task:
             # Task not found - might be just created, show initializing state
@@ -1376,7 +1376,7 @@ class AuthenticatedUI:
         """Delete all data for a specific user."""
         try:
             with st.spinner("Deleting user data..."):
-                from app.database import QDRANT_CLIENT
+                from app.database import QDRANT_CLIENT, invalidate_value_components_cache
                 from qdrant_client.models import Filter, FieldCondition, MatchValue
                 
                 user_filter = Filter(
@@ -1400,6 +1400,7 @@ class AuthenticatedUI:
                             collection_name="value_components",
                             points_selector=point_ids
                         )
+                        invalidate_value_components_cache(user_id)
                         deleted_count += len(point_ids)
                 except Exception:
                     pass
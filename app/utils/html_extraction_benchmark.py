@@ -0,0 +1,111 @@
+"""
+HTML Extraction Benchmark
+
+Compares the previous BeautifulSoup extraction path with the lxml single-parse engine
+(app/html_extractor.py), inline and through the parse process pool, on a directory of
+saved HTML pages. A small corpus of representative company pages (including an ASP.NET
+WebForms page) is kept in app/utils/html_fixtures; more can be collected by setting
+SCRAPER_HTML_FIXTURE_DIR while scraping a few company websites.
+
+Usage:
+    python -m app.utils.html_extraction_benchmark app/utils/html_fixtures --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.html_extractor import extract_page, extract_page_bs4, parse_in_pool, get_parse_pool
+
+FIXTURE_URL = "https://fixture.example.com/"
+
+
+def load_fixtures(directory: str) -> List[Tuple[str, bytes]]:
+    """Read every .html file in the directory as (url, content)."""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), 'rb') as fixture:
+                fixtures.append((FIXTURE_URL + name, fixture.read()))
+    return fixtures
+
+
+def time_sync(extract: Callable, fixtures: List[Tuple[str, bytes]], rounds: int) -> List[float]:
+    """Seconds per round for extracting all fixtures one after another."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for url, content in fixtures:
+            extract(url, content)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_pool(fixtures: List[Tuple[str, bytes]], rounds: int) -> List[float]:
+    """Seconds per round for extracting all fixtures concurrently in the parse pool."""
+    async def run_round():
+        await asyncio.gather(*(parse_in_pool(url, content) for url, content in fixtures))
+
+    get_parse_pool()
+    asyncio.run(run_round())  # warm up the worker processes
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        asyncio.run(run_round())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def compare_outputs(fixtures: List[Tuple[str, bytes]]) -> Dict[str, float]:
+    """Average per-page differences between the two engines' results."""
+    word_ratio, heading_diff, link_diff = [], [], []
+    for url, content in fixtures:
+        old, new = extract_page_bs4(url, content), extract_page(url, content)
+        if old['word_count']:
+            word_ratio.append(new['word_count'] / old['word_count'])
+        heading_diff.append(len(new['headings']) - len(old['headings']))
+        link_diff.append(len(new['links']) - len(old['links']))
+    return {
+        "word_count_ratio": statistics.mean(word_ratio) if word_ratio else 0.0,
+        "heading_difference": statistics.mean(heading_diff) if heading_diff else 0.0,
+        "link_difference": statistics.mean(link_diff) if link_diff else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction on saved pages")
+    parser.add_argument("fixture_dir", help="Directory of saved .html pages")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--no-pool", action="store_true", help="Skip the process pool measurement")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixture_dir)
+    if not fixtures:
+        print(f"No .html fixtures found in {args.fixture_dir}")
+        return
+    total_kb = sum(len(content) for _, content in fixtures) / 1024
+    print(f"{len(fixtures)} pages, {total_kb:.0f} KB, {args.rounds} rounds\n")
+
+    results = {
+        "beautifulsoup (previous)": time_sync(extract_page_bs4, fixtures, args.rounds),
+        "lxml single parse": time_sync(extract_page, fixtures, args.rounds),
+    }
+    if not args.no_pool:
+        results["lxml in process pool"] = time_pool(fixtures, args.rounds)
+
+    baseline = statistics.median(results["beautifulsoup (previous)"])
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        per_page = median / len(fixtures) * 1000
+        print(f"{name:<28} {median:8.3f}s/round  {per_page:7.2f}ms/page  {baseline / median:5.1f}x")
+
+    print("\nOutput differences (lxml vs beautifulsoup, per page):")
+    for name, value in compare_outputs(fixtures).items():
+        print(f"  {name}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()